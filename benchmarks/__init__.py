@@ -0,0 +1,10 @@
+"""
+ORBIT offline benchmarks.
+
+Measures ORBIT's own overhead apart from model latency, with no network:
+queries go through the real runtime, orchestrator and ``IntentAgent`` to the
+shipped agents (``agents``) or to synthetic benchmark agents, and the model
+is a fake Ollama server with a set latency and token rate. ``ModelAdapter`` runs over stub Copilot/OpenAI/Claude
+clients, MCP calls go to a fake stdio server, and repositories are ingested
+from a generated local git repository. See ``python -m benchmarks --help``.
+"""
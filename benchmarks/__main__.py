@@ -0,0 +1,132 @@
+"""
+Run the ORBIT benchmarks.
+
+Usage:
+    python -m benchmarks                                  # everything, default settings
+    python -m benchmarks --scenarios agents,hops --queries 100 --concurrency 1,8,32
+    python -m benchmarks --json results.json              # save the rows
+    python -m benchmarks --compare baseline.json          # exit 1 if a p95 regressed
+"""
+
+import argparse
+import json
+import sys
+from loguru import logger
+
+SCENARIOS = ("agents", "synthetic", "stream", "hops", "models", "mcp", "repo")
+SUMMARY_KEYS = ("count", "errors", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms", "throughput_qps")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline ORBIT benchmarks")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--queries", type=int, default=40, help="Queries (or calls) per scenario and concurrency")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--warmup", type=int, default=2, help="Queries before measuring")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake model first-token latency (s)")
+    parser.add_argument("--tokens", type=int, default=64, help="Fake model answer length")
+    parser.add_argument("--tokens-per-second", type=float, default=1000, help="Fake model token rate")
+    parser.add_argument("--repo-files", type=int, default=200, help="Files in the generated repository")
+    parser.add_argument("--admin-port", type=int, default=3917, help="Admin port of the benchmark actor system")
+    parser.add_argument("--log-level", default="WARNING", help="Log level of ORBIT during the run")
+    parser.add_argument("--json", dest="json_path", help="Write the result rows to this file")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 increase over the baseline")
+    parser.add_argument("--keep", action="store_true", help="Keep the working directory")
+    return parser.parse_args(argv)
+
+
+def print_report(rows: list) -> None:
+    print(f"\n{'scenario':<18}{'conc':>5}{'n':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'qps':>9}  details")
+    for row in rows:
+        details = ", ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                            for key, value in row.items()
+                            if key not in SUMMARY_KEYS and key not in ("scenario", "concurrency"))
+        if "count" in row:
+            print(f"{row['scenario']:<18}{row['concurrency']:>5}{row['count']:>6}{row['errors']:>5}"
+                  f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['throughput_qps']:>9.1f}  {details}")
+        else:
+            print(f"{row['scenario']:<18}{row['concurrency']:>5}{'':>50}  {details}")
+
+
+def compare(rows: list, baseline_path: str, tolerance: float) -> list:
+    """Rows whose p95 is more than ``tolerance`` above the baseline row of the same scenario and concurrency."""
+    with open(baseline_path) as f:
+        baseline = {(row["scenario"], row["concurrency"]): row for row in json.load(f)}
+    regressions = []
+    for row in rows:
+        before = baseline.get((row["scenario"], row["concurrency"]))
+        if before is None or "p95_ms" not in row or not before.get("p95_ms"):
+            continue
+        change = row["p95_ms"] / before["p95_ms"] - 1
+        if change > tolerance:
+            regressions.append(f"{row['scenario']} x{row['concurrency']}: p95 {before['p95_ms']:.1f} -> "
+                               f"{row['p95_ms']:.1f} ms (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    selected = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(selected) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        return 2
+    concurrencies = [int(level) for level in args.concurrency.split(",")]
+
+    from benchmarks.fixtures import BenchEnvironment
+    with BenchEnvironment(args.latency, args.tokens, args.tokens_per_second, args.admin_port,
+                          max(concurrencies), args.repo_files, args.keep) as env:
+        # Imported once the environment is set: the services read it when they are first built.
+        from benchmarks import scenarios
+        from benchmarks.agents import register_bench_agents
+        from src.agent_registry import register_agents
+        from src.actor_system import OrbitRuntime
+        # After the imports (gitingest installs its own handler) and before the actor system
+        # forks, so the agents log at this level too.
+        logger.remove()
+        logger.add(sys.stderr, level=args.log_level)
+        rows = []
+        if "agents" in selected:
+            # Runs and shuts down its own runtime first, before this process starts threads of its own.
+            register_agents()
+            rows.extend(scenarios.agents(env, args.queries, concurrencies, args.warmup))
+        actor_scenarios = [name for name in ("synthetic", "stream", "hops") if name in selected]
+        if actor_scenarios:
+            # A second runtime, so the synthetic agents fork with the router, caches and retrieval off.
+            register_bench_agents()
+            try:
+                rows.append(scenarios.warm_up(env, args.warmup))
+                if "synthetic" in selected:
+                    rows.extend(scenarios.synthetic_pipeline(env, args.queries, concurrencies))
+                if "stream" in selected:
+                    rows.extend(scenarios.streaming(env, args.queries, concurrencies))
+                if "hops" in selected:
+                    rows.extend(scenarios.actor_hops(env, args.queries))
+            finally:
+                OrbitRuntime().shutdown()
+        if "repo" in selected:
+            rows.extend(scenarios.repo(env, args.queries))
+        if "models" in selected:
+            rows.extend(scenarios.models(env, args.queries, concurrencies))
+        if "mcp" in selected:
+            rows.extend(scenarios.mcp(env, args.queries, concurrencies))
+        if args.keep:
+            print(f"Working directory kept at {env.workdir}")
+
+    print_report(rows)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2, default=str)
+    if args.compare:
+        regressions = compare(rows, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
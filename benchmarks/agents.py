@@ -0,0 +1,69 @@
+"""
+Agents the benchmarks route to.
+
+``BenchRepoAgent`` does what ``OrbitAgent`` does for a query (ingest the
+repository through ``Repo2TextService``, compact it, prompt the model through
+``ModelAdapter``, stream when asked) against the local benchmark repository.
+Retrieval is left out because it needs an embedding model. ``BenchEchoAgent``
+answers with the query at once, so a round trip through it measures the
+orchestrator and actor hops alone.
+"""
+
+import os
+from loguru import logger
+from thespian.actors import Actor, WakeupMessage
+from src.agent_registry.register import AgentRegistry
+from src.messages.intent_agent_message import IntentAgentMessage
+from src.messages.llm_message import LLMMessage
+from src.model.llama_model import LlamaModel
+from src.model.model_adapter import ModelAdapter
+from src.services.context_compaction import ContextCompactor
+from src.services.repo2Text import Repo2TextService
+from src.services.streaming import StreamingActorMixin
+
+INSTRUCTION = "Answer the question about the repository below."
+
+
+def load_encoding():
+    """tiktoken's cl100k_base if it is available offline, else None (token counts are then estimated)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"[BenchRepoAgent] tiktoken unavailable, estimating tokens from length: {e}")
+        return None
+
+
+class BenchRepoAgent(StreamingActorMixin, Actor):
+    def __init__(self):
+        super().__init__()
+        self.model = ModelAdapter(LlamaModel())
+        self.compactor = ContextCompactor(load_encoding())
+        self.repo_path = os.environ["BENCH_REPO_PATH"]
+
+    def receiveMessage(self, message, sender):
+        if isinstance(message, IntentAgentMessage):
+            repo_data = self.compactor.compact(Repo2TextService().call_service(self.repo_path, {}))
+            context = self.compactor.render(repo_data).text
+            prompt = "\nHere are the details of the repository:\n" + context + "\nUser Query: " + message.query
+            if message.stream:
+                self.stream_response(self.model, prompt, INSTRUCTION, message.request_id, sender)
+                return
+            self.send(sender, LLMMessage(self.model.generate(prompt=prompt, instruction=INSTRUCTION), message.request_id))
+        elif isinstance(message, WakeupMessage):
+            self.on_stream_tick(message)
+
+
+class BenchEchoAgent(Actor):
+    def receiveMessage(self, message, sender):
+        if isinstance(message, IntentAgentMessage):
+            self.send(sender, LLMMessage(message.query, message.request_id))
+
+
+def register_bench_agents():
+    """Register the benchmark agents; call before the runtime starts so the actor processes inherit them."""
+    registry = AgentRegistry()
+    registry.register_agent("BenchRepoAgent", BenchRepoAgent,
+                            description="Benchmark agent answering questions about the local benchmark repository.")
+    registry.register_agent("BenchEchoAgent", BenchEchoAgent,
+                            description="Benchmark agent that echoes the query without calling a model.")
@@ -0,0 +1,39 @@
+"""
+Fake MCP stdio server for the benchmarks.
+
+Serves a read-only ``search`` tool (cacheable), an ``echo`` tool and a
+``work`` tool that takes a given time, so pool, timeout and cache overheads
+can be measured without npx or the network.
+
+Usage:
+    python -m benchmarks.fake_mcp_server
+"""
+
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+server = FastMCP("orbit-bench", log_level="WARNING")
+
+
+@server.tool()
+def echo(text: str) -> str:
+    """Return ``text`` unchanged."""
+    return text
+
+
+@server.tool(annotations=ToolAnnotations(readOnlyHint=True))
+def search(query: str, limit: int = 5) -> str:
+    """Pretend to search and return ``limit`` hits."""
+    return "\n".join(f"{query} result {index}" for index in range(limit))
+
+
+@server.tool()
+async def work(seconds: float) -> str:
+    """Finish after ``seconds``."""
+    await asyncio.sleep(seconds)
+    return f"worked {seconds}s"
+
+
+if __name__ == "__main__":
+    server.run()
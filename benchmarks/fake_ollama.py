@@ -0,0 +1,191 @@
+"""
+Fake Ollama HTTP server for the benchmarks.
+
+Answers ``/api/generate`` and ``/api/chat`` (streaming or not) after a
+configurable first-token latency, then produces ``tokens`` tokens at
+``tokens_per_second``. Intent prompts from ``IntentAgent`` are answered with
+the registered agent whose name appears in the user query (or ``route`` if
+none does), so the real routing code runs unchanged.
+
+Bookkeeping endpoints used by the benchmark runner:
+
+    GET  /bench/stats    requests served and seconds spent producing answers
+    POST /bench/reset    zero the counters
+    POST /bench/config   change latency, tokens, tokens_per_second or route
+
+Usage:
+    python -m benchmarks.fake_ollama --port 11500 --latency 0.2 --tokens 64 --tokens-per-second 200
+"""
+
+import argparse
+import json
+import socket
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+
+# The intent instruction comes first and may quote the same phrases, so the last occurrence counts.
+AGENTS_MARKER = "Agent Names and descriptions: "
+QUERY_MARKER = " Query from User: "
+
+
+class FakeOllamaState:
+    def __init__(self, latency: float, tokens: int, tokens_per_second: float, route: str = None):
+        self.config = {"latency": latency, "tokens": tokens, "tokens_per_second": tokens_per_second, "route": route}
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {"requests": 0, "intent_requests": 0, "busy_seconds": 0.0}
+
+    def record(self, started: float, intent: bool):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["intent_requests"] += int(intent)
+            self.stats["busy_seconds"] += time.perf_counter() - started
+
+    def route(self, prompt: str):
+        """The agent an intent prompt should be routed to, or None if ``prompt`` is not one."""
+        # Plain string search: agent prompts carry whole repositories, where a regex would backtrack for minutes.
+        start = prompt.rfind(AGENTS_MARKER)
+        if start < 0:
+            return None
+        agents_text, found, query = prompt[start + len(AGENTS_MARKER):].partition(QUERY_MARKER)
+        if not found:
+            return None
+        try:
+            agents = list(json.loads(agents_text))
+        except ValueError:
+            agents = []
+        for name in agents:
+            if name in query:
+                return name
+        return self.config["route"] or (agents[0] if agents else "OrbitAgent")
+
+    def pieces(self, prompt: str):
+        """Yield the answer token by token, paced like a model: first-token latency, then a token rate."""
+        config = dict(self.config)
+        agent = self.route(prompt)
+        if agent is not None:
+            # Routing answers are a handful of tokens.
+            time.sleep(config["latency"])
+            yield json.dumps({"response": agent})
+            return
+        time.sleep(config["latency"])
+        interval = 1.0 / config["tokens_per_second"] if config["tokens_per_second"] > 0 else 0.0
+        deadline = time.perf_counter()
+        for index in range(config["tokens"]):
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield f"tok{index} "
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: FakeOllamaState = None
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle's algorithm holds the body back.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: dict):
+        line = json.dumps(payload).encode() + b"\n"
+        self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/version":
+            self._send_json({"version": "0.0.0-bench"})
+        elif self.path == "/api/tags":
+            self._send_json({"models": [{"name": "llama3:latest", "model": "llama3:latest"}]})
+        elif self.path == "/bench/stats":
+            with self.state.lock:
+                self._send_json({**self.state.stats, "config": self.state.config})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        payload = self._read_json()
+        if self.path == "/bench/reset":
+            self.state.reset()
+            self._send_json({"ok": True})
+        elif self.path == "/bench/config":
+            with self.state.lock:
+                self.state.config.update({key: value for key, value in payload.items() if key in self.state.config})
+            self._send_json(self.state.config)
+        elif self.path in ("/api/generate", "/api/chat"):
+            self._answer(payload, chat=self.path == "/api/chat")
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _answer(self, payload: dict, chat: bool):
+        started = time.perf_counter()
+        if chat:
+            prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+        else:
+            prompt = payload.get("prompt", "")
+        model = payload.get("model", "llama3")
+        pieces = self.state.pieces(prompt)
+
+        def frame(text: str, done: bool) -> dict:
+            frame = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"), "done": done}
+            if chat:
+                frame["message"] = {"role": "assistant", "content": text}
+            else:
+                frame["response"] = text
+            return frame
+
+        if payload.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            count = 0
+            for piece in pieces:
+                self._write_chunk(frame(piece, False))
+                count += 1
+            self._write_chunk({**frame("", True), "eval_count": count})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        else:
+            text = "".join(pieces)
+            self._send_json({**frame(text, True), "eval_count": len(text.split())})
+        self.state.record(started, self.state.route(prompt) is not None)
+
+
+def serve(port: int, latency: float, tokens: int, tokens_per_second: float, route: str = None):
+    FakeOllamaHandler.state = FakeOllamaState(latency, tokens, tokens_per_second, route)
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeOllamaHandler)
+    server.daemon_threads = True
+    print(f"fake ollama listening on {server.server_address[1]}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server for ORBIT benchmarks")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens", type=int, default=64, help="Tokens per answer")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Token rate (0 = instant)")
+    parser.add_argument("--route", default=None, help="Agent for intent prompts that name none")
+    args = parser.parse_args()
+    serve(args.port, args.latency, args.tokens, args.tokens_per_second, args.route)
@@ -0,0 +1,189 @@
+"""
+Offline environment for the benchmarks.
+
+``BenchEnvironment`` gives a run its own working directory, points every
+cache and the Ollama URL there, writes a capabilities file with a separate
+admin port (so a running ORBIT is left alone), builds a local git repository
+for ``Repo2TextService`` and starts the fake Ollama server. It must be entered
+before the runtime starts: the actor processes inherit the environment.
+
+By default the router, caches and retrieval are off, so every query takes the
+full path. ``shipped_settings`` turns them back on as ORBIT ships them and
+serves the agents' GitHub repositories from the local one.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).parent.parent
+# Switches whose shipped default is on; the benchmark agents run with them off.
+FAST_PATHS = ("INTENT_ROUTER_ENABLED", "INTENT_CACHE_ENABLED", "RESPONSE_CACHE_ENABLED", "RETRIEVAL_ENABLED")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def port_in_use(port: int) -> bool:
+    with socket.socket() as s:
+        return s.connect_ex(("127.0.0.1", port)) == 0
+
+
+def make_git_repo(path: Path, files: int = 200, lines: int = 60) -> Path:
+    """A committed repository of ``files`` Python modules, with comments and a few duplicated files like real code."""
+    path.mkdir(parents=True, exist_ok=True)
+    for index in range(files):
+        package = path / "src" / f"package_{index % 10}"
+        package.mkdir(parents=True, exist_ok=True)
+        # Every tenth module repeats another, so compaction has duplicates to find.
+        seed = index - index % 10 if index % 10 == 9 else index
+        body = [f"# Module {seed} of the benchmark repository", "import os", ""]
+        for line in range(lines):
+            if line % 6 == 0:
+                body.append(f"# step {line}: explain what happens next")
+            body.append(f"def function_{seed}_{line}(value):\n    return value * {line} + {seed}\n")
+        (package / f"module_{index}.py").write_text("\n".join(body))
+    (path / "README.md").write_text("# Benchmark repository\n\nGenerated for ORBIT benchmarks.\n")
+    git = ["git", "-C", str(path), "-c", "user.name=bench", "-c", "user.email=bench@localhost", "-c", "commit.gpgsign=false"]
+    subprocess.run([*git, "init", "-q"], check=True)
+    subprocess.run([*git, "add", "-A"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "benchmark fixture"], check=True)
+    return path
+
+
+class BenchEnvironment:
+    def __init__(self, latency: float, tokens: int, tokens_per_second: float, admin_port: int,
+                 concurrency: int, repo_files: int = 200, keep: bool = False):
+        self.latency = latency
+        self.tokens = tokens
+        self.tokens_per_second = tokens_per_second
+        self.admin_port = admin_port
+        self.concurrency = concurrency
+        self.repo_files = repo_files
+        self.keep = keep
+        self.workdir = None
+        self.repo_path = None
+        self.capabilities_path = None
+        self.ollama_url = None
+        self._ollama = None
+
+    def __enter__(self) -> "BenchEnvironment":
+        # OrbitRuntime attaches to whatever listens there, and those actors would not see this environment.
+        if port_in_use(self.admin_port):
+            raise RuntimeError(f"Admin port {self.admin_port} is in use; stop that actor system or pass --admin-port")
+        self.workdir = Path(tempfile.mkdtemp(prefix="orbit-bench-"))
+        self.repo_path = make_git_repo(self.workdir / "repo", self.repo_files)
+        self.capabilities_path = self.workdir / "capabilities.json"
+        with open(ROOT / "capabilities.json") as f:
+            capabilities = json.load(f)
+        capabilities["Admin Port"] = self.admin_port
+        self.capabilities_path.write_text(json.dumps(capabilities))
+        port = free_port()
+        self.ollama_url = f"http://127.0.0.1:{port}"
+        self._ollama = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_ollama", "--port", str(port), "--latency", str(self.latency),
+             "--tokens", str(self.tokens), "--tokens-per-second", str(self.tokens_per_second)],
+            cwd=ROOT, stdout=subprocess.DEVNULL)
+        self._wait_for_ollama()
+        os.environ.update({
+            "OLLAMA_HOST": self.ollama_url,
+            "BENCH_REPO_PATH": str(self.repo_path),
+            # Every query takes the full path: no embedding downloads, no cached decisions or answers.
+            **{name: "false" for name in FAST_PATHS},
+            "INTENT_CACHE_PATH": str(self.workdir / "intent_cache.json"),
+            "RESPONSE_CACHE_PATH": str(self.workdir / "response_cache.db"),
+            "REPO_CACHE_DIR": str(self.workdir / "repo_cache"),
+            "RETRIEVAL_DIR": str(self.workdir / "retrieval"),
+            "SINGLE_FLIGHT_DIR": str(self.workdir / "single_flight"),
+            "MCP_CATALOG_DIR": str(self.workdir / "mcp_catalog"),
+            "ORBIT_CLIENT_WORKERS": str(self.concurrency),
+            "ORBIT_ORCHESTRATOR_WORKERS": str(max(self.concurrency, 10)),
+        })
+        # Embedding models load from the local cache or not at all, rather than after a minute of retries.
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        # The SDK clients refuse to construct without a key; the stubs never send it.
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("CLAUDE_API_KEY", "bench")
+        return self
+
+    def _wait_for_ollama(self, timeout: float = 15):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._ollama.poll() is not None:
+                raise RuntimeError("Fake Ollama server exited during start-up")
+            try:
+                urllib.request.urlopen(f"{self.ollama_url}/api/version", timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"Fake Ollama server did not start on {self.ollama_url}")
+
+    def mirror_remotes(self, repo_urls: List[str]) -> dict:
+        """
+        Git config, for the environment, that rewrites each of ``repo_urls`` to a
+        link to the local repository, so ``git ls-remote`` resolves them offline.
+        """
+        mirrors = self.workdir / "mirrors"
+        remotes = sorted({url.rstrip("/").rpartition("/")[0] + "/" for url in repo_urls})
+        config = {"GIT_CONFIG_COUNT": str(len(remotes))}
+        for index, remote in enumerate(remotes):
+            base = mirrors / str(index)
+            base.mkdir(parents=True, exist_ok=True)
+            for url in repo_urls:
+                link = base / url.rstrip("/")[len(remote):]
+                if url.startswith(remote) and not link.exists():
+                    link.symlink_to(self.repo_path)
+            config[f"GIT_CONFIG_KEY_{index}"] = f"url.{base}/.insteadOf"
+            config[f"GIT_CONFIG_VALUE_{index}"] = remote
+        return config
+
+    @contextmanager
+    def shipped_settings(self, repo_urls: List[str]):
+        """
+        Router, caches and retrieval back at ORBIT's defaults, and ``repo_urls``
+        served from the local repository, until the block exits. Start the
+        runtime inside the block: the actor processes read these when they fork.
+        """
+        # No token: RepoSnapshotCache would send its own GIT_CONFIG_* header and drop the rewrite.
+        overrides = {**{name: None for name in FAST_PATHS}, **self.mirror_remotes(repo_urls), "PAT_TOKEN": ""}
+        saved = {name: os.environ.get(name) for name in overrides}
+
+        def apply(values: dict):
+            for name, value in values.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+        apply(overrides)
+        try:
+            yield self
+        finally:
+            apply(saved)
+
+    def ollama(self, path: str, payload: dict = None) -> dict:
+        """Call a /bench endpoint of the fake Ollama server (POST when ``payload`` is given)."""
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(f"{self.ollama_url}{path}", data=data,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._ollama is not None:
+            self._ollama.terminate()
+            self._ollama.wait(10)
+        if self.workdir is not None and not self.keep:
+            shutil.rmtree(self.workdir, ignore_errors=True)
@@ -0,0 +1,279 @@
+"""
+Benchmark scenarios. Each returns a list of result rows: a ``scenario`` name,
+the ``concurrency`` it ran at, the ``summarize`` latency figures and any
+scenario-specific measurements.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+from src.actor_system import OrbitRuntime, start_actor_system
+from src.model.llama_model import LlamaModel
+from src.model.model_adapter import ModelAdapter
+from src.services.context_compaction import ContextCompactor
+from src.services.mcp_client import MCPClientService
+from src.services.file import FileService
+from src.services.repo2Text import Repo2TextService
+from benchmarks.fixtures import ROOT, BenchEnvironment
+from benchmarks.stats import memory_snapshot, run_concurrently, summarize
+from benchmarks.stub_clients import STUB_MODELS, SimulatedLLM
+
+# Client -> orchestrator -> IntentAgent -> orchestrator -> agent -> orchestrator -> client
+ACTOR_HOPS = 6
+START_FAILED = "Error initializing Actor System."
+INSTRUCTION = "Answer briefly."
+# OrbitAgent's repository is hard-coded; TroubleshootingAgent reads its list from repo_details.json.
+ORBIT_AGENT_REPO = "https://github.com/R2D2-fwks/orbit"
+TROUBLESHOOTING_REPOS = ROOT / "src" / "agents" / "troubleshootingAgent" / "repo_details.json"
+# Both agents ingest with a 5 MB file limit, which is part of the snapshot key.
+AGENT_REPO_OPTIONS = {"max_file_size": 5 * 1024 * 1024}
+AGENT_QUERIES = {
+    "TroubleshootingAgent": "Why does module {index} crash on startup with a stack trace?",
+    "OrbitAgent": "How do I build a custom agent like module {index} with ORBIT?",
+}
+
+
+def _queries(agent: str, count: int, offset: int = 0) -> List[str]:
+    # Distinct queries, so no cache or shared in-flight call can answer one from another.
+    return [f"How is module {offset + index} wired into the pipeline? ({agent})" for index in range(count)]
+
+
+def _agent_queries(count: int, offset: int = 0) -> List[str]:
+    # Alternate the two agents; the fake model routes on the agent named in the query.
+    names = list(AGENT_QUERIES)
+    return [AGENT_QUERIES[names[index % len(names)]].format(index=offset + index) + f" ({names[index % len(names)]})"
+            for index in range(count)]
+
+
+def _failed(response: str) -> bool:
+    return not response or response == START_FAILED or response.startswith("Error processing query")
+
+
+def _model_seconds_per_query(env: BenchEnvironment, queries: int) -> float:
+    stats = env.ollama("/bench/stats")
+    return stats["busy_seconds"] / queries if queries else 0.0
+
+
+def warm_up(env: BenchEnvironment, count: int) -> dict:
+    """Boot the runtime and create the agents; the first query pays for actor creation and ingestion."""
+    started = time.perf_counter()
+    OrbitRuntime(env.capabilities_path).start()
+    boot = time.perf_counter() - started
+    first = None
+    for query in _queries("BenchRepoAgent", max(count, 1), offset=10_000):
+        started = time.perf_counter()
+        start_actor_system(query)
+        first = first if first is not None else time.perf_counter() - started
+    start_actor_system(_queries("BenchEchoAgent", 1, offset=10_000)[0])
+    return {"scenario": "cold_start", "concurrency": 1, "runtime_boot_ms": boot * 1000,
+            "first_query_ms": first * 1000, **memory_snapshot()}
+
+
+def agents(env: BenchEnvironment, queries: int, concurrencies: List[int], warmup: int) -> List[dict]:
+    """
+    The pipeline as shipped: ``IntentAgent`` with its router and decision cache,
+    the orchestrator, and ``TroubleshootingAgent`` / ``OrbitAgent`` with the
+    response cache and retrieval on, in a runtime of their own. Their GitHub
+    repositories are served from the local benchmark repository. A last pass
+    repeats the first round's queries, so the caches answer them.
+    """
+    try:
+        import tiktoken
+        # Both agents load it when they are created; without it every query would fail.
+        tiktoken.encoding_for_model("gpt-4o")
+    except Exception as e:
+        return [{"scenario": "agents", "concurrency": 1,
+                 "skipped": f"tiktoken's gpt-4o encoding is not available offline ({type(e).__name__})"}]
+    repo_urls = [*FileService().read_json_file(TROUBLESHOOTING_REPOS).get("repos", []), ORBIT_AGENT_REPO]
+    rows = []
+    with env.shipped_settings(repo_urls):
+        _seed_snapshots(env, repo_urls)
+        runtime = OrbitRuntime(env.capabilities_path)
+        try:
+            started = time.perf_counter()
+            runtime.start()
+            boot = time.perf_counter() - started
+            first = None
+            for query in _agent_queries(max(warmup, len(AGENT_QUERIES)), offset=10_000):
+                started = time.perf_counter()
+                start_actor_system(query)
+                first = first if first is not None else time.perf_counter() - started
+            rows.append({"scenario": "agents_cold_start", "concurrency": 1, "runtime_boot_ms": boot * 1000,
+                         "first_query_ms": first * 1000, **memory_snapshot()})
+            for round_index, concurrency in enumerate(concurrencies):
+                rows.append(_agents_round(env, "agents", _agent_queries(queries, offset=round_index * queries),
+                                          concurrency))
+            rows.append(_agents_round(env, "agents_cached", _agent_queries(queries), 1))
+        finally:
+            runtime.shutdown()
+    return rows
+
+
+def _seed_snapshots(env: BenchEnvironment, repo_urls: List[str]) -> None:
+    """
+    Store the local repository's snapshot under each URL, as a first clone would:
+    gitingest asks GitHub's API whether a repository exists before cloning it.
+    """
+    service = Repo2TextService()
+    snapshot = service.call_service(str(env.repo_path), AGENT_REPO_OPTIONS)
+    for url in repo_urls:
+        key, cached = service.cache.lookup(url, AGENT_REPO_OPTIONS)
+        if key is None:
+            raise RuntimeError(f"{url} does not resolve to the local repository")
+        if cached is None:
+            service.cache.store(key, url, snapshot)
+
+
+def _agents_round(env: BenchEnvironment, scenario: str, queries: List[str], concurrency: int) -> dict:
+    env.ollama("/bench/reset", {})
+    latencies, errors, wall = run_concurrently(start_actor_system, queries, concurrency, is_error=_failed)
+    summary = summarize(latencies, wall, errors)
+    stats = env.ollama("/bench/stats")
+    # Model calls per query show what the decision and response caches saved. TroubleshootingAgent maps
+    # its chunks over concurrent calls, so model time is a sum, not a share of the latency.
+    return {"scenario": scenario, "concurrency": concurrency, **summary,
+            "intent_calls_per_query": stats["intent_requests"] / len(queries),
+            "answer_calls_per_query": (stats["requests"] - stats["intent_requests"]) / len(queries),
+            "model_busy_ms_per_query": stats["busy_seconds"] / len(queries) * 1000, **memory_snapshot()}
+
+
+def synthetic_pipeline(env: BenchEnvironment, queries: int, concurrencies: List[int]) -> List[dict]:
+    """
+    Full queries through ``start_actor_system`` to ``BenchRepoAgent``, with the
+    router, caches and retrieval off: the runtime and orchestrator path and the
+    ingest-compact-prompt steps, with none of the shipped agents.
+    """
+    rows = []
+    for round_index, concurrency in enumerate(concurrencies):
+        env.ollama("/bench/reset", {})
+        latencies, errors, wall = run_concurrently(
+            start_actor_system, _queries("BenchRepoAgent", queries, offset=round_index * queries), concurrency,
+            is_error=lambda response: response == START_FAILED)
+        summary = summarize(latencies, wall, errors)
+        model_ms = _model_seconds_per_query(env, len(latencies)) * 1000
+        rows.append({"scenario": "synthetic_pipeline", "concurrency": concurrency, **summary,
+                     "model_ms_per_query": model_ms,
+                     "orbit_overhead_ms": summary["mean_ms"] - model_ms, **memory_snapshot()})
+    return rows
+
+
+def streaming(env: BenchEnvironment, queries: int, concurrencies: List[int]) -> List[dict]:
+    """Streamed queries; adds time to first chunk."""
+    runtime = OrbitRuntime()
+    rows = []
+    for round_index, concurrency in enumerate(concurrencies):
+        first_chunk = []
+
+        def ask(query: str) -> str:
+            started = time.perf_counter()
+            pieces = []
+            for piece in runtime.stream(query):
+                if not pieces:
+                    first_chunk.append(time.perf_counter() - started)
+                pieces.append(piece)
+            return "".join(pieces)
+
+        latencies, errors, wall = run_concurrently(
+            ask, _queries("BenchRepoAgent", queries, offset=50_000 + round_index * queries), concurrency)
+        summary = summarize(latencies, wall, errors)
+        ttft = summarize(first_chunk, wall)
+        rows.append({"scenario": "stream", "concurrency": concurrency, **summary,
+                     "first_chunk_p50_ms": ttft["p50_ms"], "first_chunk_p95_ms": ttft["p95_ms"]})
+    return rows
+
+
+def actor_hops(env: BenchEnvironment, queries: int) -> List[dict]:
+    """Queries to ``BenchEchoAgent`` with an instant model: what is left is ORBIT's own per-query cost."""
+    config = env.ollama("/bench/stats")["config"]
+    env.ollama("/bench/config", {"latency": 0, "tokens_per_second": 0})
+    try:
+        env.ollama("/bench/reset", {})
+        latencies, errors, wall = run_concurrently(
+            start_actor_system, _queries("BenchEchoAgent", queries, offset=90_000), 1,
+            is_error=lambda response: response == START_FAILED)
+        summary = summarize(latencies, wall, errors)
+        overhead_ms = summary["mean_ms"] - _model_seconds_per_query(env, len(latencies)) * 1000
+    finally:
+        env.ollama("/bench/config", {"latency": config["latency"], "tokens_per_second": config["tokens_per_second"]})
+    return [{"scenario": "actor_hops", "concurrency": 1, **summary, "orbit_overhead_ms": overhead_ms,
+             "per_hop_ms": overhead_ms / ACTOR_HOPS}]
+
+
+def models(env: BenchEnvironment, calls: int, concurrencies: List[int]) -> List[dict]:
+    """``ModelAdapter.generate`` over the stub SDK clients and over HTTP to the fake Ollama."""
+    llm = SimulatedLLM(env.latency, env.tokens, env.tokens_per_second)
+    adapters = {name: ModelAdapter(model(llm)) for name, model in STUB_MODELS.items()}
+    adapters["ollama"] = ModelAdapter(LlamaModel())
+    rows = []
+    try:
+        for name, adapter in adapters.items():
+            for round_index, concurrency in enumerate(concurrencies):
+                prompts = [f"prompt {round_index}-{index}" for index in range(calls)]
+                latencies, errors, wall = run_concurrently(
+                    lambda prompt: adapter.generate(prompt, INSTRUCTION), prompts, concurrency,
+                    is_error=lambda response: response is None)
+                summary = summarize(latencies, wall, errors)
+                rows.append({"scenario": f"model_{name}", "concurrency": concurrency, **summary,
+                             "adapter_overhead_ms": summary["mean_ms"] - llm.expected_seconds * 1000})
+    finally:
+        close = getattr(adapters["copilot"].model, "close", None)
+        if close is not None:
+            close()
+    return rows
+
+
+def mcp(env: BenchEnvironment, calls: int, concurrencies: List[int]) -> List[dict]:
+    """Pooled MCP tool calls against the fake stdio server: cold start, warm calls, cached calls, catalog reuse."""
+    service = MCPClientService()
+    server = str(Path(__file__).parent / "fake_mcp_server.py")
+
+    def call(tool: str, arguments: dict, use_cache: bool = True) -> str:
+        return asyncio.run(service.call_tool("bench", tool, arguments, use_cache=use_cache))
+
+    rows = []
+    service.register_stdio_server("bench", sys.executable, [server])
+    started = time.perf_counter()
+    call("echo", {"text": "cold"})
+    cold = time.perf_counter() - started
+    asyncio.run(service.disconnect("bench"))
+    service.register_stdio_server("bench", sys.executable, [server])
+    started = time.perf_counter()
+    call("echo", {"text": "catalog"})
+    with_catalog = time.perf_counter() - started
+    rows.append({"scenario": "mcp_connect", "concurrency": 1, "cold_connect_ms": cold * 1000,
+                 "catalog_connect_ms": with_catalog * 1000})
+    for concurrency in concurrencies:
+        latencies, errors, wall = run_concurrently(
+            lambda index: call("echo", {"text": f"warm {index}"}, use_cache=False), range(calls), concurrency)
+        rows.append({"scenario": "mcp_call", "concurrency": concurrency, **summarize(latencies, wall, errors)})
+    call("search", {"query": "orbit"})
+    latencies, errors, wall = run_concurrently(lambda index: call("search", {"query": "orbit"}), range(calls), 1)
+    rows.append({"scenario": "mcp_cached_call", "concurrency": 1, **summarize(latencies, wall, errors),
+                 "cache_hit_rate": service.result_cache.stats()["hit_rate"]})
+    service.shutdown()
+    return rows
+
+
+def repo(env: BenchEnvironment, calls: int) -> List[dict]:
+    """Ingesting the local repository: a cold clone and ingest, then snapshot-cache hits; plus compaction."""
+    service = Repo2TextService()
+    repo_path = str(env.repo_path)
+    # RepoSnapshotCache is a singleton the other scenarios have filled (this repository included, with
+    # these options); empty it so the first call clones and ingests.
+    service.cache.clear()
+    before = service.cache_stats()
+    started = time.perf_counter()
+    repo_data = service.call_service(repo_path, AGENT_REPO_OPTIONS)
+    cold = time.perf_counter() - started
+    latencies, errors, wall = run_concurrently(
+        lambda _: service.call_service(repo_path, AGENT_REPO_OPTIONS), range(calls), 1)
+    after = service.cache_stats()
+    compactor = ContextCompactor()
+    started = time.perf_counter()
+    rendered = compactor.render(compactor.compact(repo_data))
+    compaction = time.perf_counter() - started
+    return [{"scenario": "repo_ingest", "concurrency": 1, **summarize(latencies, wall, errors),
+             "cold_ingest_ms": cold * 1000, "compaction_ms": compaction * 1000, "context_ratio": rendered.ratio,
+             "cache_hits": after["hits"] - before["hits"], "cache_misses": after["misses"] - before["misses"]}]
@@ -0,0 +1,118 @@
+"""Latency summaries and process memory for the benchmark report."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; /proc is read directly without it
+    psutil = None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """The ``q``-th percentile (0-100) of ``values``, interpolated between the closest ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(latencies: List[float], wall_seconds: float, errors: int = 0) -> dict:
+    """p50/p95/p99/mean/max in milliseconds, plus completed queries per second."""
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+        "max_ms": max(latencies) * 1000 if latencies else 0.0,
+        "throughput_qps": len(latencies) / wall_seconds if wall_seconds > 0 else 0.0,
+    }
+
+
+def run_concurrently(operation: Callable, items: Iterable, concurrency: int,
+                     is_error: Optional[Callable] = None) -> tuple:
+    """
+    Call ``operation(item)`` for every item with ``concurrency`` threads.
+
+    Returns:
+        (latencies in seconds of the successful calls, number of failed calls, wall-clock seconds)
+    """
+    def timed(item):
+        started = time.perf_counter()
+        try:
+            result = operation(item)
+        except Exception:
+            return None
+        if is_error is not None and is_error(result):
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        results = list(pool.map(timed, items))
+    wall = time.perf_counter() - started
+    latencies = [result for result in results if result is not None]
+    return latencies, len(results) - len(latencies), wall
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _proc_children(pid: int) -> List[int]:
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; the parent pid follows its closing parenthesis.
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    children, frontier = [], [pid]
+    while frontier:
+        parent = frontier.pop()
+        for child, ppid in parents.items():
+            if ppid == parent:
+                children.append(child)
+                frontier.append(child)
+    return children
+
+
+def memory_snapshot(pid: int = None) -> dict:
+    """Resident memory (MB) of this process and of its descendants (the actor system and fake servers)."""
+    pid = pid or os.getpid()
+    if psutil is not None:
+        process = psutil.Process(pid)
+        children = process.children(recursive=True)
+        own = process.memory_info().rss
+        descendants = 0
+        for child in children:
+            try:
+                descendants += child.memory_info().rss
+            except psutil.Error:
+                continue
+        count = len(children)
+    elif os.path.isdir("/proc"):
+        own = _proc_rss(pid)
+        children = _proc_children(pid)
+        descendants = sum(_proc_rss(child) for child in children)
+        count = len(children)
+    else:
+        return {}
+    return {"rss_mb": own / 2**20, "children_rss_mb": descendants / 2**20, "child_processes": count}
@@ -0,0 +1,144 @@
+"""
+In-process stand-ins for the Copilot, OpenAI and Claude SDK clients.
+
+Each stub answers the calls the ORBIT model classes make after a
+``SimulatedLLM`` delay (first-token latency plus a token rate), so the real
+``CopilotModel``/``OpenAi``/``Claude`` code and ``ModelAdapter`` run on top of
+them without credentials or network. The ``Stub*`` model classes only swap
+the client; everything else is inherited.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Iterator
+from src.model.claude import Claude
+from src.model.copilot_model import CopilotModel
+from src.model.open_ai import OpenAi
+
+
+class SimulatedLLM:
+    def __init__(self, latency: float = 0.0, tokens: int = 64, tokens_per_second: float = 0.0):
+        self.latency = latency
+        self.tokens = tokens
+        self.tokens_per_second = tokens_per_second
+
+    @property
+    def expected_seconds(self) -> float:
+        """How long an answer takes by design; anything above it is overhead."""
+        rate = self.tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        return self.latency + rate
+
+    def pieces(self) -> Iterator[str]:
+        time.sleep(self.latency)
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        deadline = time.perf_counter()
+        for index in range(self.tokens):
+            deadline += interval
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield f"tok{index} "
+
+    def text(self) -> str:
+        return "".join(self.pieces())
+
+    async def atext(self) -> str:
+        await asyncio.sleep(self.expected_seconds)
+        return "".join(f"tok{index} " for index in range(self.tokens))
+
+
+class StubCopilotClient:
+    """The subset of ``ghcopilot.GithubCopilotClient`` that ``CopilotModel`` uses."""
+
+    def __init__(self, llm: SimulatedLLM):
+        self.llm = llm
+        self._threads = 0
+
+    def get_models(self) -> list:
+        return [{"id": "gpt-4o-bench"}]
+
+    def create_new_thread(self) -> str:
+        self._threads += 1
+        return f"thread-{self._threads}"
+
+    def get_latest_thread(self) -> str:
+        return f"thread-{self._threads}"
+
+    def delete_thread(self, thread_id: str) -> bool:
+        return True
+
+    def send_message(self, prompt: str, model_id: str = None, thread_id: str = None):
+        for piece in self.llm.pieces():
+            yield {"type": "content", "text": piece}
+
+
+class StubOpenAIClient:
+    """``client.responses.create`` of the OpenAI SDK, sync or async."""
+
+    def __init__(self, llm: SimulatedLLM, asynchronous: bool = False):
+        self.llm = llm
+        self.responses = SimpleNamespace(create=self._acreate if asynchronous else self._create)
+
+    def _create(self, model: str, instructions: str, input: str, stream: bool = False):
+        if stream:
+            return (SimpleNamespace(type="response.output_text.delta", delta=piece) for piece in self.llm.pieces())
+        return SimpleNamespace(output_text=self.llm.text(), model=model)
+
+    async def _acreate(self, model: str, instructions: str, input: str, stream: bool = False):
+        return SimpleNamespace(output_text=await self.llm.atext(), model=model)
+
+
+class StubAnthropicClient:
+    """``client.messages.create``/``stream`` of the Anthropic SDK, sync or async."""
+
+    def __init__(self, llm: SimulatedLLM, asynchronous: bool = False):
+        self.llm = llm
+        self.messages = SimpleNamespace(create=self._acreate if asynchronous else self._create, stream=self._stream)
+
+    def _create(self, model: str, messages: list, max_tokens: int, **kwargs):
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=self.llm.text())], model=model)
+
+    async def _acreate(self, model: str, messages: list, max_tokens: int, **kwargs):
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=await self.llm.atext())], model=model)
+
+    @contextmanager
+    def _stream(self, model: str, messages: list, max_tokens: int, **kwargs):
+        yield SimpleNamespace(text_stream=self.llm.pieces())
+
+
+class StubCopilotModel(CopilotModel):
+    def __init__(self, llm: SimulatedLLM, model_id: str = None):
+        self.llm = llm
+        super().__init__(model_id)
+
+    def _CopilotModel__initialize_client(self):
+        return StubCopilotClient(self.llm)
+
+
+class StubOpenAi(OpenAi):
+    def __init__(self, llm: SimulatedLLM):
+        self.llm = llm
+        super().__init__()
+        self.async_client = StubOpenAIClient(llm, asynchronous=True)
+
+    def initialize_client(self):
+        return StubOpenAIClient(self.llm)
+
+
+class StubClaude(Claude):
+    def __init__(self, llm: SimulatedLLM):
+        self.llm = llm
+        super().__init__()
+        self.async_client = StubAnthropicClient(llm, asynchronous=True)
+
+    def initialize_client(self):
+        return StubAnthropicClient(self.llm)
+
+
+STUB_MODELS = {
+    "copilot": StubCopilotModel,
+    "openai": StubOpenAi,
+    "claude": StubClaude,
+}
@@ -0,0 +1,36 @@
+"""
+ORBIT runtime control.
+
+Usage:
+    python -m src.actor_system start    # boot the admin and warm the orchestrator
+    python -m src.actor_system status   # check whether an admin is running
+    python -m src.actor_system stop     # shut the admin and all agents down
+"""
+
+import sys
+from src.actor_system.runtime import OrbitRuntime
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "status"
+    runtime = OrbitRuntime()
+    if command == "start":
+        runtime.start()
+        runtime.detach()
+        print(f"ORBIT runtime running on port {runtime.admin_port}")
+    elif command == "status":
+        running = runtime.admin_is_listening()
+        print(f"ORBIT runtime is {'running' if running else 'stopped'} (port {runtime.admin_port})")
+        return 0 if running else 1
+    elif command == "stop":
+        runtime.shutdown()
+        print("ORBIT runtime stopped")
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import asyncio
+import inspect
+import os
+import queue
+import threading
+from typing import Awaitable, Callable, Optional, Union
+from dotenv import load_dotenv
+from src.actor_system.runtime import OrbitRuntime
+from src.messages.query import QueryMessage
+from src.messages.query_response import QueryResponse
+from src.messages.stream_chunk import StreamChunk
+from thespian.actors import PoisonMessage
+from loguru import logger
+
+_END_OF_STREAM = object()
+
+
+class AsyncOrbitClient:
+    """
+    asyncio bridge into the ORBIT runtime.
+
+    A single dispatcher thread owns one private actor-system endpoint: it
+    ``tell``s queued queries to the orchestrator and ``listen``s for
+    ``QueryResponse`` messages, resolving the awaiting futures by request id.
+    Any number of coroutines can therefore be in flight at once without a
+    thread per request; ``max_concurrency`` bounds how many are outstanding.
+    """
+
+    def __init__(self, runtime: OrbitRuntime = None, max_concurrency: int = None, timeout: float = None):
+        load_dotenv()
+        self.runtime = runtime or OrbitRuntime()
+        self.max_concurrency = max_concurrency or int(os.getenv("ORBIT_MAX_CONCURRENT_QUERIES") or 8)
+        self.timeout = timeout or self.runtime.query_timeout
+        self.poll_interval = float(os.getenv("ORBIT_CLIENT_POLL_INTERVAL") or 0.05)
+        self._semaphore = None
+        self._outbox = queue.Queue()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._dispatcher = None
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> "AsyncOrbitClient":
+        async with self._start_lock:
+            if self._dispatcher is None:
+                # Booting the admin is a one-off blocking call; keep it off the event loop.
+                await asyncio.to_thread(self.runtime.start)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._stopped.clear()
+                self._dispatcher = threading.Thread(target=self._dispatch, name="orbit-async-dispatcher", daemon=True)
+                self._dispatcher.start()
+                logger.info("[AsyncOrbitClient] Dispatcher started (max concurrency {})", self.max_concurrency)
+        return self
+
+    async def query(self, query: str, timeout: float = None,
+                    on_chunk: Optional[Callable[[str], Union[None, Awaitable[None]]]] = None) -> str:
+        """
+        Send a query to the orchestrator and await its response.
+
+        Args:
+            query: The user query
+            timeout: Seconds to wait for the complete response
+            on_chunk: Called (or awaited) with each piece of the answer, in
+                      order, while it is generated; asks agents to stream
+        """
+        await self.start()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            chunks = asyncio.Queue() if on_chunk is not None else None
+            message = QueryMessage(query, stream=on_chunk is not None)
+            with self._pending_lock:
+                self._pending[message.request_id] = (loop, future, chunks)
+            self._outbox.put(message)
+            pump = loop.create_task(self._pump(chunks, on_chunk)) if chunks is not None else None
+            try:
+                result = await asyncio.wait_for(future, timeout or self.timeout)
+                if pump is not None:
+                    # Every chunk was queued before the response, so this lets on_chunk see them all.
+                    chunks.put_nowait(_END_OF_STREAM)
+                    await pump
+                return result
+            finally:
+                if pump is not None and not pump.done():
+                    pump.cancel()
+                with self._pending_lock:
+                    self._pending.pop(message.request_id, None)
+
+    @staticmethod
+    async def _pump(chunks: asyncio.Queue, on_chunk):
+        while True:
+            text = await chunks.get()
+            if text is _END_OF_STREAM:
+                return
+            result = on_chunk(text)
+            if inspect.isawaitable(result):
+                await result
+
+    def _dispatch(self):
+        with self.runtime.actor_system.private() as endpoint:
+            while not self._stopped.is_set():
+                while True:
+                    try:
+                        message = self._outbox.get_nowait()
+                    except queue.Empty:
+                        break
+                    endpoint.tell(self.runtime.orchestrator_address, message)
+                reply = endpoint.listen(self.poll_interval)
+                if reply is not None:
+                    self._resolve(reply)
+
+    def _resolve(self, reply):
+        if isinstance(reply, StreamChunk):
+            with self._pending_lock:
+                entry = self._pending.get(reply.request_id)
+            if entry is not None and entry[2] is not None:
+                loop, _, chunks = entry
+                loop.call_soon_threadsafe(chunks.put_nowait, reply.text)
+            return
+        if isinstance(reply, QueryResponse):
+            request_id, result, error = reply.request_id, reply.message, None
+        elif isinstance(reply, PoisonMessage):
+            request_id = getattr(reply.poisonMessage, "request_id", None)
+            result, error = None, RuntimeError(f"Orchestrator failed to process query: {reply.details}")
+        else:
+            logger.warning("[AsyncOrbitClient] Ignoring unexpected reply: {}", reply)
+            return
+        with self._pending_lock:
+            entry = self._pending.get(request_id)
+        if entry is None:
+            logger.warning("[AsyncOrbitClient] No pending request for id: {}", request_id)
+            return
+        loop, future, _ = entry
+        loop.call_soon_threadsafe(self._set_future, future, result, error)
+
+    @staticmethod
+    def _set_future(future, result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def close(self):
+        """Stop the dispatcher; the runtime itself keeps running."""
+        if self._dispatcher is not None:
+            self._stopped.set()
+            await asyncio.to_thread(self._dispatcher.join)
+            self._dispatcher = None
+            logger.info("[AsyncOrbitClient] Dispatcher stopped")
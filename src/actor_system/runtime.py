@@ -0,0 +1,190 @@
+import json
+import os
+import socket
+import concurrent.futures
+from pathlib import Path
+import time
+from threading import Lock
+from typing import Iterator
+from dotenv import load_dotenv
+from src.agent_registry import register_agents
+from src.messages.query import QueryMessage
+from src.messages.query_response import QueryResponse
+from src.messages.stream_chunk import StreamChunk
+from src.orchestrator import OrchestratorAgent
+from src.services.singleton import Singleton
+from thespian.actors import ActorSystem
+from thespian.troupe import UpdateTroupeSettings
+from loguru import logger
+
+CAPABILITIES_PATH = Path(__file__).parent.parent.parent / "capabilities.json"
+ORCHESTRATOR_NAME = "OrchestratorAgent"
+TROUPE_SETTINGS_TIMEOUT = 5.0
+
+
+class OrbitRuntime(metaclass=Singleton):
+    """
+    Long-lived ORBIT runtime.
+
+    Boots the Thespian admin (or reattaches to one already listening on the
+    configured admin port) once, keeps the orchestrator alive under a global
+    name and serves any number of queries through ``submit``/``ask``.
+    """
+
+    def __init__(self, capabilities_path: Path = CAPABILITIES_PATH):
+        load_dotenv()
+        self.capabilities_path = Path(capabilities_path)
+        self.capabilities = None
+        self.actor_system = None
+        self.orchestrator_address = None
+        self.attached = False
+        self.query_timeout = float(os.getenv("ORBIT_QUERY_TIMEOUT") or 50000.0)
+        self.max_workers = int(os.getenv("ORBIT_CLIENT_WORKERS") or 4)
+        # Each orchestrator troupe worker owns the queries it is waiting on, so
+        # this bounds how many queries the runtime processes at once.
+        self.orchestrator_workers = int(os.getenv("ORBIT_ORCHESTRATOR_WORKERS") or 0)
+        self._executor = None
+        self._lock = Lock()
+
+    def _load_capabilities(self) -> dict:
+        logger.info("[OrbitRuntime] Loading capabilities from: {}", self.capabilities_path)
+        with open(self.capabilities_path, 'r') as f:
+            return json.load(f)
+
+    @property
+    def admin_port(self) -> int:
+        return int(self.capabilities.get("Admin Port", 3000))
+
+    @property
+    def is_running(self) -> bool:
+        return self.actor_system is not None
+
+    def admin_is_listening(self) -> bool:
+        """Cheap probe for an ORBIT admin already running on the admin port."""
+        if self.capabilities is None:
+            self.capabilities = self._load_capabilities()
+        try:
+            with socket.create_connection(("127.0.0.1", self.admin_port), timeout=1.0):
+                return True
+        except OSError:
+            return False
+
+    def start(self) -> "OrbitRuntime":
+        """Boot the actor system, or reattach to a running admin, exactly once."""
+        with self._lock:
+            if self.actor_system is not None:
+                return self
+            self.capabilities = self._load_capabilities()
+            self.attached = self.admin_is_listening()
+            register_agents()
+            system_base = self.capabilities.get("Thespian ActorSystem Name", "multiprocTCPBase")
+            if self.attached:
+                logger.info("[OrbitRuntime] Reattaching to running admin on port {}", self.admin_port)
+            else:
+                logger.info("[OrbitRuntime] Starting Agent System on port {}", self.admin_port)
+            self.actor_system = ActorSystem(system_base, capabilities=self.capabilities)
+            # A global name makes createActor return the already running orchestrator on reattach.
+            self.orchestrator_address = self.actor_system.createActor(OrchestratorAgent, globalName=ORCHESTRATOR_NAME)
+            if self.orchestrator_workers:
+                self._resize_orchestrator_troupe()
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="orbit-client")
+            logger.info("[OrbitRuntime] Orchestrator ready at {}", self.orchestrator_address)
+            return self
+
+    def _resize_orchestrator_troupe(self):
+        # The troupe manager answers with the settings it now uses; ask() consumes that reply.
+        # It also passes the message on to a worker, whose dispatcher ignores it.
+        reply = self.actor_system.ask(self.orchestrator_address, UpdateTroupeSettings(max_count=self.orchestrator_workers),
+                                      timeout=TROUPE_SETTINGS_TIMEOUT)
+        max_count = getattr(reply, "max_count", None)
+        if max_count != self.orchestrator_workers:
+            logger.warning("[OrbitRuntime] Orchestrator troupe max_count is {} instead of {} (reply: {})",
+                           max_count, self.orchestrator_workers, reply)
+        else:
+            logger.info("[OrbitRuntime] Orchestrator troupe max_count set to {}", max_count)
+
+    def attach(self) -> "OrbitRuntime":
+        """Reattach to an admin started by another process; fails if none is running."""
+        if not self.admin_is_listening():
+            raise RuntimeError(f"No ORBIT admin is listening on port {self.admin_port}")
+        return self.start()
+
+    def _ask(self, query: str, timeout: float) -> str:
+        # Each worker thread gets its own endpoint so replies are never mixed up.
+        with self.actor_system.private() as private_system:
+            response = private_system.ask(self.orchestrator_address, QueryMessage(query), timeout=timeout)
+        if isinstance(response, QueryResponse):
+            return response.message
+        return response
+
+    def submit(self, query: str, timeout: float = None) -> concurrent.futures.Future:
+        """Send a query to the orchestrator and return a future for its response."""
+        self.start()
+        return self._executor.submit(self._ask, query, timeout or self.query_timeout)
+
+    def ask(self, query: str, timeout: float = None) -> str:
+        """Send a query and block until the orchestrator answers."""
+        return self.submit(query, timeout).result()
+
+    def stream(self, query: str, timeout: float = None) -> Iterator[str]:
+        """
+        Send a query and yield the answer in pieces as the agent generates it.
+
+        Agents that cannot stream answer in one piece, which is yielded as is.
+        """
+        self.start()
+        message = QueryMessage(query, stream=True)
+        deadline = time.monotonic() + (timeout or self.query_timeout)
+        pieces = []
+        with self.actor_system.private() as private_system:
+            private_system.tell(self.orchestrator_address, message)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No response to query {message.request_id} within the timeout")
+                reply = private_system.listen(remaining)
+                if isinstance(reply, StreamChunk) and reply.request_id == message.request_id:
+                    pieces.append(reply.text)
+                    yield reply.text
+                elif isinstance(reply, QueryResponse) and reply.request_id == message.request_id:
+                    # The final response normally repeats the streamed text. It differs when
+                    # nothing was streamed or the agent failed part way and answered with an error.
+                    text = "".join(pieces)
+                    if reply.message is not None and reply.message != text:
+                        yield f"\n{reply.message}" if text else reply.message
+                    return
+
+    def detach(self) -> None:
+        """Release the local client resources and leave the admin running."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self.actor_system = None
+            self.orchestrator_address = None
+            logger.info("[OrbitRuntime] Detached from Agent System")
+
+    def shutdown(self) -> None:
+        """Stop the admin and every actor it owns."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            if self.actor_system is None:
+                if not self.admin_is_listening():
+                    logger.info("[OrbitRuntime] No Agent System running")
+                    return
+                system_base = self.capabilities.get("Thespian ActorSystem Name", "multiprocTCPBase")
+                self.actor_system = ActorSystem(system_base, capabilities=self.capabilities)
+            self.actor_system.shutdown()
+            self.actor_system = None
+            self.orchestrator_address = None
+            logger.info("[OrbitRuntime] Agent System shut down")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.detach()
@@ -8,9 +8,15 @@ def register_agents():
     agent_registry=AgentRegistry()
 
     agent_registry.register_agent("TroubleshootingAgent", TroubleshootingAgent,description="""Agent 
-                                  specialized in troubleshooting technical issues.""")
+                                  specialized in troubleshooting technical issues.""",
+                                  examples=["Why is my build failing?",
+                                            "I get a 500 error when calling the API, how do I debug it?",
+                                            "The service crashes on startup with a stack trace"])
     agent_registry.register_agent("OrbitAgent", OrbitAgent,description="""Agent 
                                   specialized in handling framework related queries 
                                   and tasks. 
                                   Any questions related to framework/toolkit on how 
-                                  to use it.""")
\ No newline at end of file
+                                  to use it.""",
+                                  examples=["How can I use ORBIT framework ?",
+                                            "How do I build a custom agent?",
+                                            "How do I register a new model adapter in ORBIT?"])
\ No newline at end of file
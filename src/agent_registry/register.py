@@ -1,3 +1,5 @@
+import hashlib
+import json
 from src.services.singleton import Singleton
 from thespian.actors import Actor
 
@@ -5,14 +7,27 @@ from thespian.actors import Actor
 class AgentRegistry(metaclass=Singleton):
     def __init__(self):
         self.agents={}
-    def register_agent(self,agentName:str,agent:Actor,description:str=""):
+        # Bumped whenever the agent set changes so derived state (router embeddings, caches) can refresh.
+        self.version=0
+        self._fingerprint=None
+    def register_agent(self,agentName:str,agent:Actor,description:str="",examples:list=None):
         if agentName in self.agents:
             return
         self.agents[agentName] = {
             "agent": agent,
-            "description": description
+            "description": description,
+            "examples": list(examples or [])
         }
+        self.version += 1
+    def fingerprint(self):
+        """Stable hash of the agent set; unlike ``version`` it is comparable across restarts."""
+        if self._fingerprint is None or self._fingerprint[0] != self.version:
+            canonical = json.dumps(
+                {name: [entry["description"], entry["examples"]] for name, entry in self.agents.items()},
+                sort_keys=True)
+            self._fingerprint = (self.version, hashlib.sha256(canonical.encode()).hexdigest())
+        return self._fingerprint[1]
     def get_agents(self):
         return self.agents
     def get_agent(self,agentName:str):
-        return self.agents.get(agentName,None)
\ No newline at end of file
+        return self.agents.get(agentName,None)
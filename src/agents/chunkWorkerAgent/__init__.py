@@ -0,0 +1,32 @@
+from src.messages.chunk_message import ChunkAnalysisRequest, ChunkAnalysisResult
+from src.model.llama_model import LlamaModel
+from src.model.model_adapter import ModelAdapter
+from thespian.actors import Actor
+from thespian.troupe import troupe
+from loguru import logger
+
+
+@troupe(max_count=8, idle_count=2)
+class ChunkWorkerAgent(Actor):
+    """
+    Stateless worker that runs one LLM call per ChunkAnalysisRequest.
+
+    Agents fan the map and reduce steps of a map-reduce job out to this
+    troupe, so chunks of a large prompt are analysed in parallel.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.model = ModelAdapter(LlamaModel())
+        # self.model = ModelAdapter(CopilotModel("gpt-4o"))
+
+    def receiveMessage(self, message, sender):
+        if isinstance(message, ChunkAnalysisRequest):
+            logger.info("[ChunkWorkerAgent] Job {} level {} chunk {}", message.job_id, message.level, message.index)
+            try:
+                response = self.model.generate(message.prompt, message.instruction)
+                result = ChunkAnalysisResult(message.job_id, message.level, message.index, response=response)
+            except Exception as e:
+                logger.error("[ChunkWorkerAgent] Chunk {} of job {} failed: {}", message.index, message.job_id, e)
+                result = ChunkAnalysisResult(message.job_id, message.level, message.index, error=str(e))
+            self.send(sender, result)
@@ -0,0 +1,94 @@
+from typing import Callable, Dict, List
+from src.messages.chunk_message import ChunkAnalysisRequest, ChunkAnalysisResult
+
+REDUCE_PREAMBLE = (
+    "Below are partial analyses of the same user query, each produced from a different part of the "
+    "repositories. Merge them into a single, consistent answer: keep every relevant finding, drop "
+    "duplicates and anything another part shows to be irrelevant.\n"
+)
+PARTIAL_HEADER_TOKENS = 8
+
+
+class MapReduceJob:
+    """
+    Book-keeping for one map-reduce run driven by an agent.
+
+    Level 0 maps every chunk; each following level merges the partial answers
+    of the previous one in groups that fit the token budget, until a single
+    answer is left. At most ``max_in_flight`` requests are outstanding.
+    """
+
+    def __init__(self, request_id: str, sender, query_text: str, instruction: str,
+                 budget: int, count_tokens: Callable[[str], int], max_in_flight: int = 4):
+        self.request_id = request_id
+        self.sender = sender
+        self.query_text = query_text
+        self.instruction = instruction
+        self.budget = budget
+        self.count_tokens = count_tokens
+        self.max_in_flight = max_in_flight
+        self.level = -1
+        self._queue: List[ChunkAnalysisRequest] = []
+        self._results: Dict[int, ChunkAnalysisResult] = {}
+        self._expected = 0
+        self.in_flight = 0
+
+    def start_level(self, prompts: List[str]) -> None:
+        self.level += 1
+        self._queue = [
+            ChunkAnalysisRequest(self.request_id, self.level, index, prompt, self.instruction)
+            for index, prompt in enumerate(prompts)
+        ]
+        self._results = {}
+        self._expected = len(prompts)
+        self.in_flight = 0
+
+    def map(self, chunks: List[str]) -> None:
+        total = len(chunks)
+        self.start_level([f"[Part {i+1} of {total}]\n" + chunk + self.query_text for i, chunk in enumerate(chunks)])
+
+    def next_requests(self) -> List[ChunkAnalysisRequest]:
+        """Requests that can be sent now without exceeding ``max_in_flight``."""
+        count = max(0, self.max_in_flight - self.in_flight)
+        ready, self._queue = self._queue[:count], self._queue[count:]
+        self.in_flight += len(ready)
+        return ready
+
+    def record(self, result: ChunkAnalysisResult) -> bool:
+        """Store a result; returns True once every request of the level has answered."""
+        if result.level != self.level or result.index in self._results:
+            return False
+        self._results[result.index] = result
+        self.in_flight -= 1
+        return len(self._results) == self._expected
+
+    def partials(self) -> List[str]:
+        """Successful answers of the current level, in chunk order."""
+        return [
+            self._results[index].response
+            for index in sorted(self._results)
+            if self._results[index].error is None and self._results[index].response
+        ]
+
+    def errors(self) -> List[str]:
+        return [result.error for result in self._results.values() if result.error]
+
+    def reduce_prompts(self, partials: List[str]) -> List[str]:
+        """Group partial answers into merge prompts that fit the budget."""
+        budget = self.budget - self.count_tokens(REDUCE_PREAMBLE)
+        groups, current, current_tokens = [], [], 0
+        for partial in partials:
+            tokens = self.count_tokens(partial) + PARTIAL_HEADER_TOKENS
+            if current and current_tokens + tokens > budget:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(partial)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return [
+            REDUCE_PREAMBLE
+            + "".join(f"\n### Partial analysis {i+1}\n{partial}\n" for i, partial in enumerate(group))
+            + self.query_text
+            for group in groups
+        ]
@@ -4,6 +4,8 @@ from src.messages.intent_agent_message import IntentAgentMessage
 from src.messages.query import QueryMessage
 from src.model.copilot_model import CopilotModel
 from src.services.file import FileService
+from src.agents.intentAgent.intentRouter import IntentRouter
+from src.services.intent_cache import IntentDecisionCache
 from thespian.actors import Actor
 from src.model.llama_model import LlamaModel
 from src.model.model_adapter import ModelAdapter
@@ -17,29 +19,63 @@ class IntentAgent(Actor):
         self.model = ModelAdapter(LlamaModel())
         # self.model = ModelAdapter(CopilotModel("gpt-4o"))
         self.agent_name = "IntentAgent"
+        self.router = IntentRouter()
+        self.decision_cache = IntentDecisionCache()
+        self.agent_instructions = FileService().read_file(Path(__file__).parent/ "intentAgentGuidelines.md")
+        self._agent_descriptions = (None, None)
+        try:
+            # Embed the registered agents now rather than on the first query.
+            self.router.sync()
+        except Exception as e:
+            logger.warning(f"[IntentAgent] Intent router unavailable, using LLM routing: {e}")
+            self.router.enabled = False
         
     def receiveMessage(self, msg, sender):
         if isinstance(msg, QueryMessage):
             message = msg.message
-            agent_registry=AgentRegistry()
-            agents = agent_registry.get_agents()
-            agent_info ={}
-            agent_names = agents.keys()
-            for agent_name in agent_names:
-                agent_info[agent_name] = agents[agent_name]["description"]
-            agent_names_description_string = json.dumps(agent_info)
-            logger.info("[IntentAgent] agent_names_description_string: {}", agent_names_description_string)
-            file_path = Path(__file__).parent/ "intentAgentGuidelines.md"
-            agent_instructions = FileService().read_file(file_path)
-            complete_message = "Agent Names and descriptions: " +agent_names_description_string  +" Query from User: " + message
-            llm_response = self.model.generate(prompt=complete_message, instruction=agent_instructions)
-            logger.info("[IntentAgent] llm_response: {}", llm_response)
-            intent_response = IntentAgentMessage(self.parse_response(llm_response),message)
+            cached = self.decision_cache.get(message)
+            if cached is not None:
+                intent = {"response": cached["agent"], "router": {**cached, "path": "cache"}}
+                logger.info(f"[IntentAgent] Routed to {cached['agent']} via cache (stats={self.decision_cache.stats()})")
+                self.send(sender, IntentAgentMessage(intent,message,msg.request_id,msg.stream))
+                return
+            decision = self.router.route(message)
+            if decision.path == "embedding":
+                intent = {"response": decision.agent}
+            else:
+                intent = self.detect_with_llm(message) or {}
+                decision.agent = intent.get("response")
+            intent["router"] = decision.as_dict()
+            if AgentRegistry().get_agent(decision.agent) is not None:
+                self.decision_cache.put(message, intent["router"])
+            logger.info(f"[IntentAgent] Routed to {decision.agent} via {decision.path} "
+                        f"(score={decision.score:.3f}, margin={decision.margin:.3f}, stats={self.router.stats})")
+            intent_response = IntentAgentMessage(intent,message,msg.request_id,msg.stream)
             logger.info("[IntentAgent] intent_response: {}", intent_response)
             self.send(sender, intent_response)
         else:
             self.send(sender, "Unknown command. Please send a QueryMessage to identify intent.")
 
+    def agent_descriptions(self) -> str:
+        """Agent name -> description JSON, rebuilt only when the registry changes."""
+        agent_registry=AgentRegistry()
+        version, descriptions = self._agent_descriptions
+        if version != agent_registry.version:
+            agents = agent_registry.get_agents()
+            agent_info ={}
+            for agent_name in agents.keys():
+                agent_info[agent_name] = agents[agent_name]["description"]
+            descriptions = json.dumps(agent_info)
+            self._agent_descriptions = (agent_registry.version, descriptions)
+            logger.info("[IntentAgent] agent_names_description_string: {}", descriptions)
+        return descriptions
+
+    def detect_with_llm(self, message: str):
+        complete_message = "Agent Names and descriptions: " +self.agent_descriptions()  +" Query from User: " + message
+        llm_response = self.model.generate(prompt=complete_message, instruction=self.agent_instructions, query=message)
+        logger.info("[IntentAgent] llm_response: {}", llm_response)
+        return self.parse_response(llm_response)
+
     def parse_response(self, response: str) -> str:
         text_response = None
         if hasattr(response, 'text'):
@@ -0,0 +1,94 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+from loguru import logger
+from src.agent_registry.register import AgentRegistry
+from src.services.embedding import EmbeddingService
+
+
+@dataclass
+class RoutingDecision:
+    agent: Optional[str]
+    score: float
+    margin: float
+    path: str  # "embedding" or "llm"; cached decisions are reported as "cache"
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "agent": self.agent,
+            "score": round(self.score, 4),
+            "margin": round(self.margin, 4),
+            "path": self.path,
+            "scores": {name: round(score, 4) for name, score in self.scores.items()},
+        }
+
+
+class IntentRouter:
+    """
+    Embedding fast path for intent detection.
+
+    Each registered agent is represented by the embeddings of its description
+    and example queries; a query goes to the agent with the most similar
+    text. When the best two agents are closer than ``margin_threshold`` (or
+    the best match is weak) the decision is left to the LLM prompt.
+    """
+
+    def __init__(self, registry: AgentRegistry = None):
+        load_dotenv()
+        self.registry = registry or AgentRegistry()
+        self.embedding_service = EmbeddingService()
+        self.enabled = (os.getenv("INTENT_ROUTER_ENABLED") or "true").lower() != "false"
+        self.margin_threshold = float(os.getenv("INTENT_ROUTER_MARGIN") or 0.05)
+        self.min_score = float(os.getenv("INTENT_ROUTER_MIN_SCORE") or 0.3)
+        self._version = None
+        self._agent_names: List[str] = []
+        self._owners: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._vectors: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self.stats = {"embedding": 0, "llm": 0}
+
+    def sync(self) -> None:
+        """Embed agent descriptions and examples if the registry changed since the last sync."""
+        if not self.enabled or self._version == self.registry.version:
+            return
+        agents = self.registry.get_agents()
+        names, owners, texts = list(agents.keys()), [], []
+        for index, name in enumerate(names):
+            entry = agents[name]
+            for text in [" ".join(entry["description"].split())] + entry.get("examples", []):
+                owners.append(index)
+                texts.append(text)
+        self._vectors = self.embedding_service.embed_documents(texts)
+        self._owners = np.asarray(owners, dtype=np.int64)
+        self._agent_names = names
+        self._version = self.registry.version
+        logger.info(f"[IntentRouter] Embedded {len(texts)} descriptions/examples for {len(names)} agents")
+
+    def route(self, query: str) -> RoutingDecision:
+        """Score the query against every agent; ``path`` is "llm" when the LLM must decide."""
+        if not self.enabled:
+            return RoutingDecision(None, 0.0, 0.0, "llm")
+        try:
+            self.sync()
+            query_vector = self.embedding_service.embed_queries([query])[0]
+        except Exception as e:
+            logger.warning(f"[IntentRouter] Embedding unavailable, disabling fast path: {e}")
+            self.enabled = False
+            self.stats["llm"] += 1
+            return RoutingDecision(None, 0.0, 0.0, "llm")
+        similarities = self._vectors @ query_vector
+        scores = {}
+        for owner, similarity in zip(self._owners, similarities):
+            name = self._agent_names[owner]
+            scores[name] = max(scores.get(name, -1.0), float(similarity))
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return RoutingDecision(None, 0.0, 0.0, "llm", scores)
+        best_name, best_score = ranked[0]
+        margin = best_score - ranked[1][1] if len(ranked) > 1 else best_score
+        confident = margin >= self.margin_threshold and best_score >= self.min_score
+        path = "embedding" if confident else "llm"
+        self.stats[path] += 1
+        return RoutingDecision(best_name if confident else None, best_score, margin, path, scores)
@@ -11,15 +11,19 @@ The agent uses async/await patterns bridged with Thespian's actor model.
 from pathlib import Path
 import asyncio
 import json
+import os
+import re
+import time
 from typing import Dict, Any, List, Optional
-from thespian.actors import Actor
+from thespian.actors import Actor, WakeupMessage
 from loguru import logger
 
-from messages.intent_agent_message import IntentAgentMessage
-from messages.llm_message import LLMMessage
-from model.llama_model import LlamaModel
-from model.model_adapter import ModelAdapter
-from services.file import FileService
+from src.messages.intent_agent_message import IntentAgentMessage
+from src.messages.llm_message import LLMMessage
+from src.model.llama_model import LlamaModel
+from src.model.model_adapter import ModelAdapter
+from src.services.file import FileService
+from src.services.streaming import StreamingActorMixin
 
 
 class MCPToolRequest:
@@ -43,7 +47,7 @@ class MCPToolResponse:
         self.error = error
 
 
-class MCPToolsAgent(Actor):
+class MCPToolsAgent(StreamingActorMixin, Actor):
     """
     An ORBIT agent with MCP tool capabilities.
     
@@ -66,6 +70,10 @@ class MCPToolsAgent(Actor):
         self.agent_name = "MCPToolsAgent"
         self.mcp_service = None
         self._loop = None
+        # Suggested tools run concurrently, at most this many at a time...
+        self.max_parallel_tools = int(os.getenv("MCP_MAX_PARALLEL_TOOLS") or 4)
+        # ...and the answer is built from whatever arrived within this many seconds.
+        self.tools_deadline = float(os.getenv("MCP_TOOLS_DEADLINE") or 45)
         
         # MCP servers this agent can use
         self.available_servers = {
@@ -102,46 +110,33 @@ class MCPToolsAgent(Actor):
         loop = self._get_event_loop()
         return loop.run_until_complete(coro)
     
-    async def _initialize_mcp_service(self):
-        """Initialize MCP client service with configured servers."""
-        from services.mcp_client import MCPClientService
+    def _initialize_mcp_service(self):
+        """Register the configured MCP servers with the shared pool; they connect on first use."""
+        from src.services.mcp_client import MCPClientService
         import os
         
         if self.mcp_service is None:
             self.mcp_service = MCPClientService()
         
-        # Connect to available MCP servers based on environment
-        connected_servers = []
-        
         # GitHub server (requires token)
         github_token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN") or \
                        os.environ.get("PAT_TOKEN")
         if github_token:
-            try:
-                await self.mcp_service.connect_stdio_server(
-                    name="github",
-                    command="npx",
-                    args=["-y", "@modelcontextprotocol/server-github"],
-                    env={"GITHUB_PERSONAL_ACCESS_TOKEN": github_token}
-                )
-                connected_servers.append("github")
-                logger.info("[MCPToolsAgent] Connected to GitHub MCP server")
-            except Exception as e:
-                logger.warning(f"[MCPToolsAgent] Could not connect to GitHub: {e}")
-        
-        # Fetch server (no auth required)
-        try:
-            await self.mcp_service.connect_stdio_server(
-                name="fetch",
+            self.mcp_service.register_stdio_server(
+                name="github",
                 command="npx",
-                args=["-y", "@modelcontextprotocol/server-fetch"]
+                args=["-y", "@modelcontextprotocol/server-github"],
+                env={"GITHUB_PERSONAL_ACCESS_TOKEN": github_token}
             )
-            connected_servers.append("fetch")
-            logger.info("[MCPToolsAgent] Connected to Fetch MCP server")
-        except Exception as e:
-            logger.warning(f"[MCPToolsAgent] Could not connect to Fetch: {e}")
         
-        return connected_servers
+        # Fetch server (no auth required)
+        self.mcp_service.register_stdio_server(
+            name="fetch",
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-fetch"]
+        )
+        
+        return list(self.mcp_service.configs)
     
     async def _call_mcp_tool(
         self,
@@ -149,17 +144,19 @@ class MCPToolsAgent(Actor):
         tool_name: str,
         arguments: Dict[str, Any]
     ) -> str:
-        """Call an MCP tool and return the result."""
+        """Call an MCP tool and return the result (errors come back as text; timeouts raise)."""
         if self.mcp_service is None:
-            await self._initialize_mcp_service()
+            self._initialize_mcp_service()
         
-        connection = self.mcp_service.get_connection(server_name)
-        if not connection:
+        if server_name not in self.mcp_service.configs:
             return f"Error: MCP server '{server_name}' is not connected"
         
         try:
-            result = await connection.call_tool(tool_name, arguments)
+            result = await self.mcp_service.call_tool(server_name, tool_name, arguments)
             return result
+        except asyncio.TimeoutError:
+            logger.warning(f"[MCPToolsAgent] {server_name}.{tool_name} timed out")
+            raise
         except Exception as e:
             logger.error(f"[MCPToolsAgent] Error calling {server_name}.{tool_name}: {e}")
             return f"Error calling tool: {str(e)}"
@@ -206,6 +203,49 @@ class MCPToolsAgent(Actor):
         
         return tool_suggestions
     
+    async def _run_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> tuple:
+        """
+        Run the tool calls concurrently within ``tools_deadline``.
+        
+        Returns:
+            (results by "server.tool", one metadata entry per call with its status and latency)
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        metadata = [{"server": call["server"], "tool": call["tool"], "status": "pending", "latency_ms": None}
+                    for call in tool_calls]
+        results = {}
+        
+        async def run(call, entry):
+            async with semaphore:
+                logger.info(f"[MCPToolsAgent] Calling {call['server']}.{call['tool']}")
+                started = time.monotonic()
+                try:
+                    result = await self._call_mcp_tool(call["server"], call["tool"], call["arguments"])
+                    entry["status"] = "error" if result.startswith("Error") else "ok"
+                except asyncio.TimeoutError:
+                    timeout = self.mcp_service.timeout_for(call["server"], call["tool"])
+                    result = f"(no result: timed out after {timeout:g}s)"
+                    entry["status"] = "timeout"
+                finally:
+                    entry["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+                results[f"{call['server']}.{call['tool']}"] = result
+        
+        tasks = [asyncio.create_task(run(call, entry)) for call, entry in zip(tool_calls, metadata)]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.tools_deadline)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for call, entry in zip(tool_calls, metadata):
+            if entry["status"] == "pending":
+                # Cut off by the overall deadline (possibly while waiting for a slot).
+                entry["status"] = "deadline"
+                results[f"{call['server']}.{call['tool']}"] = f"(no result: not finished within {self.tools_deadline:g}s)"
+        # Present results in the order the tools were suggested.
+        ordered = {f"{call['server']}.{call['tool']}": results[f"{call['server']}.{call['tool']}"] for call in tool_calls}
+        logger.info(f"[MCPToolsAgent] Tool calls: {metadata}")
+        return ordered, metadata
+    
     def _build_tool_context(self, tool_results: Dict[str, str]) -> str:
         """Build context string from MCP tool results."""
         if not tool_results:
@@ -217,24 +257,20 @@ class MCPToolsAgent(Actor):
         
         return "\n".join(context_parts)
     
-    async def _process_query_async(self, query: str) -> str:
-        """Process query asynchronously with MCP tools."""
-        # Initialize MCP connections
-        connected = await self._initialize_mcp_service()
-        logger.info(f"[MCPToolsAgent] Connected MCP servers: {connected}")
+    async def _build_prompt_async(self, query: str) -> tuple:
+        """Call the MCP tools the query needs and build the final (prompt, instructions)."""
+        # Servers are connected by the shared pool the first time a tool needs them
+        connected = self._initialize_mcp_service()
+        logger.info(f"[MCPToolsAgent] Available MCP servers: {connected}")
         
         # Analyze query for potential tool usage
         tool_suggestions = self._analyze_query_for_tools(query)
-        tool_results = {}
-        
-        # Execute suggested tools
+        tool_calls = []
         for suggestion in tool_suggestions:
             server = suggestion["server"]
             tool = suggestion["tool"]
             
             if server in connected:
-                logger.info(f"[MCPToolsAgent] Calling {server}.{tool}")
-                
                 # Build arguments based on tool type
                 arguments = {}
                 if tool == "search_repositories":
@@ -242,14 +278,14 @@ class MCPToolsAgent(Actor):
                     arguments = {"query": query, "max_results": 5}
                 elif tool == "fetch":
                     # Try to extract URL from query
-                    import re
                     urls = re.findall(r'https?://[^\s]+', query)
                     if urls:
                         arguments = {"url": urls[0]}
                 
                 if arguments:
-                    result = await self._call_mcp_tool(server, tool, arguments)
-                    tool_results[f"{server}.{tool}"] = result
+                    tool_calls.append({"server": server, "tool": tool, "arguments": arguments})
+        
+        tool_results, tool_metadata = await self._run_tool_calls(tool_calls)
         
         # Build context from tool results
         tool_context = self._build_tool_context(tool_results)
@@ -266,14 +302,14 @@ class MCPToolsAgent(Actor):
 Based on the user's query and any MCP tool results above, provide a helpful response.
 """
         
-        # Generate response using LLM
-        response = self.model.generate(prompt=complete_prompt, instruction=instructions)
-        
-        # Cleanup MCP connections
-        if self.mcp_service:
-            await self.mcp_service.disconnect_all()
-        
-        return response
+        return complete_prompt, instructions, {"tools": tool_metadata}
+    
+    async def _process_query_async(self, query: str) -> tuple:
+        """Process query asynchronously with MCP tools; returns (response, metadata)."""
+        complete_prompt, instructions, metadata = await self._build_prompt_async(query)
+        # Generate response using LLM without blocking the agent's event loop
+        response = await self.model.agenerate(prompt=complete_prompt, instruction=instructions)
+        return response, metadata
     
     def receiveMessage(self, message, sender):
         """Handle incoming messages."""
@@ -282,13 +318,20 @@ Based on the user's query and any MCP tool results above, provide a helpful resp
             logger.info(f"[{self.agent_name}] Received query: {query}")
             
             try:
+                if message.stream:
+                    complete_prompt, instructions, metadata = self._run_async(self._build_prompt_async(query))
+                    self.stream_response(self.model, complete_prompt, instructions, message.request_id, sender, metadata)
+                    return
                 # Run async processing
-                response_text = self._run_async(self._process_query_async(query))
-                response = LLMMessage(response_text)
+                response_text, metadata = self._run_async(self._process_query_async(query))
+                response = LLMMessage(response_text, message.request_id, metadata)
                 self.send(sender, response)
             except Exception as e:
                 logger.error(f"[{self.agent_name}] Error processing query: {e}")
-                self.send(sender, LLMMessage(f"Error processing query: {str(e)}"))
+                self.send(sender, LLMMessage(f"Error processing query: {str(e)}", message.request_id))
+        
+        elif isinstance(message, WakeupMessage):
+            self.on_stream_tick(message)
         
         elif isinstance(message, MCPToolRequest):
             # Direct MCP tool call
@@ -308,7 +351,7 @@ Based on the user's query and any MCP tool results above, provide a helpful resp
                 self.send(sender, MCPToolResponse(
                     result="",
                     success=False,
-                    error=str(e)
+                    error=str(e) or type(e).__name__
                 ))
         
         else:
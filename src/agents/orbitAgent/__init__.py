@@ -4,19 +4,27 @@ from src.messages.llm_message import LLMMessage
 from src.model.copilot_model import CopilotModel
 from src.services.file import FileService
 from src.services.repo2Text import Repo2TextService
-from thespian.actors import Actor
+from src.services.retrieval import RepoIndexService
+from src.services.chunking import TokenChunker
+from src.services.context_compaction import ContextCompactor
+from src.services.streaming import StreamingActorMixin
+from thespian.actors import Actor, WakeupMessage
 from src.model.llama_model import LlamaModel
 from src.model.model_adapter import ModelAdapter
 from thespian.troupe import troupe
 from loguru import logger
-from toon import encode
+import tiktoken
 
-class OrbitAgent(Actor):
+class OrbitAgent(StreamingActorMixin, Actor):
 
     def __init__(self):
         super().__init__()
         self.model = ModelAdapter(LlamaModel())
         # self.model = ModelAdapter(CopilotModel("gpt-4o"))
+        self.encoding = tiktoken.encoding_for_model("gpt-4o")
+        self.retriever = RepoIndexService("OrbitAgent", self.encoding)
+        self.compactor = ContextCompactor(self.encoding)
+        self.prompt_overhead_tokens = 64
 
     def receiveMessage(self, message, sender):
         if (isinstance(message, IntentAgentMessage)):
@@ -26,10 +34,24 @@ class OrbitAgent(Actor):
             read_instruction = FileService().read_file(file_path / "orbitAgentInstructions.md")
             repo_url = "https://github.com/R2D2-fwks/orbit"
             options={"max_file_size": 5 * 1024 * 1024}  # 5 MB
-            repo_data = Repo2TextService().call_service(repo_url, options)
-            llm_input_data = encode(repo_data)
+            repo_data = self.compactor.compact(Repo2TextService().call_service(repo_url, options))
+            context_budget = TokenChunker.chunk_budget(
+                self.model.context_window,
+                len(self.encoding.encode(read_instruction)),
+                len(self.encoding.encode(query)),
+                self.model.max_output_tokens,
+                self.prompt_overhead_tokens)
+            # Only the sections relevant to the query; the whole repository when retrieval is not confident.
+            llm_input_data = self.retriever.build_context(query, {repo_url: repo_data.repo}, context_budget)
+            if llm_input_data is None:
+                llm_input_data = self.compactor.render(repo_data).text
             complete_query = "\nHere are the details of the Orbit repository:\n" + llm_input_data + "\n" + "User Query: "+ query
-            response = LLMMessage(self.model.generate(prompt=complete_query, instruction=read_instruction))
+            if message.stream:
+                self.stream_response(self.model, complete_query, read_instruction, message.request_id, sender)
+                return
+            response = LLMMessage(self.model.generate(prompt=complete_query, instruction=read_instruction), message.request_id)
             self.send(sender, response)
+        elif isinstance(message, WakeupMessage):
+            self.on_stream_tick(message)
         else:
             self.send(sender, "Unknown command. Please send 'orbitAgent' to receive more assistance.")
\ No newline at end of file
@@ -2,20 +2,27 @@ from asyncio.log import logger
 from pathlib import Path
 from src.messages.intent_agent_message import IntentAgentMessage
 from src.messages.llm_message import LLMMessage
+from src.messages.chunk_message import ChunkAnalysisRequest, ChunkAnalysisResult
+from src.agents.chunkWorkerAgent import ChunkWorkerAgent
+from src.agents.chunkWorkerAgent.mapReduceJob import MapReduceJob
 from src.model.copilot_model import CopilotModel
 from src.services.file import FileService
 from src.services.repo2Text import Repo2TextService
-from thespian.actors import Actor
+from src.services.chunking import TokenChunker
+from src.services.context_compaction import ContextCompactor
+from src.services.retrieval import RepoIndexService
+from src.services.streaming import StreamingActorMixin
+from thespian.actors import Actor, PoisonMessage, WakeupMessage
 from src.model.llama_model import LlamaModel
 from src.model.model_adapter import ModelAdapter
-from toon import encode
 import tiktoken
+import asyncio
 import os
 from dotenv import load_dotenv
 
 
 
-class TroubleshootingAgent(Actor):
+class TroubleshootingAgent(StreamingActorMixin, Actor):
     
     def __init__(self):
         load_dotenv()
@@ -23,53 +30,143 @@ class TroubleshootingAgent(Actor):
         self.model = ModelAdapter(LlamaModel())
         # self.model = ModelAdapter(CopilotModel("gpt-4o"))
         self.override_flag = False
-        self.max_chunk_tokens= 100000
         self.encoding = tiktoken.encoding_for_model("gpt-4o")
+        self.chunker = TokenChunker(self.encoding)
+        self.retriever = RepoIndexService("TroubleshootingAgent", self.encoding)
+        self.compactor = ContextCompactor(self.encoding)
+        # Room for the "[Part i of n]" header and chat framing around each chunk.
+        self.prompt_overhead_tokens = 64
+        self.max_parallel_chunks = int(os.getenv("TROUBLESHOOTING_MAX_PARALLEL_CHUNKS") or 4)
+        self.jobs = {}
+        self.chunk_worker = None
         self.agent_name = "TroubleshootingAgent"
         self.MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+        self.max_parallel_repos = int(os.getenv("TROUBLESHOOTING_MAX_PARALLEL_REPOS") or 4)
+        self.repo_timeout = float(os.getenv("TROUBLESHOOTING_REPO_TIMEOUT") or 300)
         
 
-    def chunk_content(self, content: str, max_tokens: int):
-        return [content[i:i + max_tokens] for i in range(0, len(content), max_tokens)]
+    async def _ingest_repo(self, repo2text_service, repo_url: str, semaphore: asyncio.Semaphore) -> tuple:
+        """Returns (repo_url, repo_data, None) or (repo_url, None, note explaining the failure)."""
+        async with semaphore:
+            try:
+                repo_data = await asyncio.wait_for(
+                    repo2text_service.call_service_async(repo_url, {"max_file_size": self.MAX_FILE_SIZE}),
+                    timeout=self.repo_timeout)
+                return repo_url, repo_data, None
+            except asyncio.TimeoutError:
+                logger.warning(f"[TroubleshootingAgent] Ingesting {repo_url} timed out after {self.repo_timeout}s")
+                return repo_url, None, f"\n[Repository {repo_url} could not be ingested: timed out]\n"
+            except Exception as e:
+                logger.warning(f"[TroubleshootingAgent] Ingesting {repo_url} failed: {e}")
+                return repo_url, None, f"\n[Repository {repo_url} could not be ingested: {e}]\n"
+
+    async def _ingest_repos(self, repo_urls: list) -> list:
+        repo2text_service = Repo2TextService()
+        semaphore = asyncio.Semaphore(self.max_parallel_repos)
+        # gather keeps the configured order regardless of which repo finishes first.
+        return await asyncio.gather(*(self._ingest_repo(repo2text_service, url, semaphore) for url in repo_urls))
+
+    def ingest_repos(self, repo_urls: list) -> list:
+        """Ingest all repos concurrently, returned in the order given."""
+        logger.info(f"[TroubleshootingAgent] Ingesting {len(repo_urls)} repos ({self.max_parallel_repos} at a time)")
+        return asyncio.run(self._ingest_repos(repo_urls))
+
+    def chunk_content(self, content: str, max_tokens: int, tokens=None):
+        return self.chunker.chunk(content, max_tokens, tokens)
     
-    def process_chunks(self, chunks, instruction):
-        aggregate_response = ""
-        for i, chunk in enumerate(chunks):
-            logger.info(f"[TroubleshootingAgent] Processing chunk {i+1}/{len(chunks)}")
-            response = self.model.chat(chunk, instruction)
-            if response is not None:
-                aggregate_response += response + "\n"
-        return aggregate_response
+    def process_chunks(self, chunks, instruction, query_text, chunk_budget, request_id, sender):
+        """Fan the chunks out to the ChunkWorkerAgent troupe; the answer is sent once the reduce finishes."""
+        if self.chunk_worker is None:
+            self.chunk_worker = self.createActor(ChunkWorkerAgent, globalName="ChunkWorkerAgent")
+        job = MapReduceJob(request_id, sender, query_text, instruction, chunk_budget,
+                           self.chunker.count_tokens, self.max_parallel_chunks)
+        job.map(chunks)
+        self.jobs[request_id] = job
+        logger.info(f"[TroubleshootingAgent] Mapping {len(chunks)} chunks ({self.max_parallel_chunks} in parallel)")
+        self.dispatch(job)
+
+    def dispatch(self, job: MapReduceJob):
+        for request in job.next_requests():
+            self.send(self.chunk_worker, request)
+
+    def on_chunk_result(self, result: ChunkAnalysisResult):
+        job = self.jobs.get(result.job_id)
+        if job is None:
+            return
+        if not job.record(result):
+            self.dispatch(job)
+            return
+        partials = job.partials()
+        if not partials:
+            self.finish(job, "Error processing query: " + "; ".join(job.errors() or ["no chunk produced an answer"]))
+        elif job.level > 0 and len(partials) == 1:
+            self.finish(job, partials[0])
+        else:
+            prompts = job.reduce_prompts(partials)
+            if job.level > 0 and len(prompts) >= len(partials):
+                # Partials no longer shrink when merged; return them rather than loop.
+                self.finish(job, "\n".join(partials))
+                return
+            logger.info(f"[TroubleshootingAgent] Reducing {len(partials)} partial answers in {len(prompts)} group(s)")
+            job.start_level(prompts)
+            self.dispatch(job)
+
+    def finish(self, job: MapReduceJob, response_text: str):
+        del self.jobs[job.request_id]
+        logger.info(f"[TroubleshootingAgent] Map-reduce for {job.request_id} finished after {job.level} reduce level(s)")
+        self.send(job.sender, LLMMessage(response_text, job.request_id))
 
     def receiveMessage(self, message, sender):
         if (isinstance(message, IntentAgentMessage)):
             query = message.query
             folder_path = Path(__file__).parent
             file_service = FileService()
-            repo2text_service = Repo2TextService()
             
             read_instruction = file_service.read_file(folder_path / "troubleshootingGuidelines.md")
             repo_urls = file_service.read_json_file(folder_path / "repo_details.json")
-            repo_text = ["BEGIN: \n Here are the details of the repositories:\n"]
-            for repo_url in repo_urls.get("repos", []):
-                repo_data = repo2text_service.call_service(repo_url, {"max_file_size": self.MAX_FILE_SIZE})
-                llm_input_data = encode(repo_data)
-                repo_text.append(llm_input_data)
-            repo_text.append("User Query: " + query)
-            repo_text.append("\n END.")
-            complete_prompt = "".join(repo_text)
-            complete_repo_tokens = self.encoding.encode(complete_prompt)
+            ingested = [(repo_url, self.compactor.compact(repo_data) if repo_data is not None else None, note)
+                        for repo_url, repo_data, note in self.ingest_repos(repo_urls.get("repos", []))]
+            query_text = "User Query: " + query + "\n END."
             instruction_tokens = self.encoding.encode(read_instruction)
-            logger.info(f"[TroubleshootingAgent] Total tokens in prompt: {len(complete_repo_tokens)}")
+            query_tokens = self.encoding.encode(query_text)
+            chunk_budget = self.chunker.chunk_budget(
+                self.model.context_window,
+                len(instruction_tokens),
+                len(query_tokens),
+                self.model.max_output_tokens,
+                self.prompt_overhead_tokens)
+            notes = [note for _, repo_data, note in ingested if repo_data is None]
+            repos = {repo_url: repo_data.repo for repo_url, repo_data, _ in ingested if repo_data is not None}
+            repo_text = ["BEGIN: \n Here are the details of the repositories:\n"]
+            retrieved = self.retriever.build_context(query, repos, chunk_budget - self.prompt_overhead_tokens)
+            if retrieved is not None:
+                repo_text.append(retrieved)
+                repo_text.extend(notes)
+            else:
+                # Retrieval not confident: fall back to the full repositories (map-reduced below if too large).
+                repo_text.extend(self.compactor.render(repo_data).text if repo_data is not None else note
+                                 for _, repo_data, note in ingested)
+            repo_context = "".join(repo_text)
+            repo_tokens = self.encoding.encode(repo_context)
+            logger.info(f"[TroubleshootingAgent] Repository tokens: {len(repo_tokens)}, chunk budget: {chunk_budget}")
             logger.info(f"[TroubleshootingAgent] Instruction tokens length: {len(instruction_tokens)}")
-            if len(complete_repo_tokens) > self.max_chunk_tokens and self.override_flag == False:
-                logger.info(f"[TroubleshootingAgent] Content too large ({len(complete_repo_tokens)} tokens), using chunking")
-                chunks = self.chunk_content(complete_prompt, self.max_chunk_tokens)
-                response_text = self.process_chunks(chunks, read_instruction)
-                response = LLMMessage(response_text)
+            if len(repo_tokens) > chunk_budget and self.override_flag == False:
+                logger.info(f"[TroubleshootingAgent] Content too large ({len(repo_tokens)} tokens), using chunking")
+                chunks = self.chunk_content(repo_context, chunk_budget, repo_tokens)
+                self.process_chunks(chunks, read_instruction, query_text, chunk_budget, message.request_id, sender)
             else:
-                logger.info(f"[TroubleshootingAgent] Content within limit ({len(complete_repo_tokens)} tokens), processing directly")
-                response = LLMMessage(self.model.generate(complete_prompt, read_instruction))
-            self.send(sender, response)
+                logger.info(f"[TroubleshootingAgent] Content within limit ({len(repo_tokens)} tokens), processing directly")
+                if message.stream:
+                    self.stream_response(self.model, repo_context + query_text, read_instruction, message.request_id, sender)
+                    return
+                response = LLMMessage(self.model.generate(repo_context + query_text, read_instruction), message.request_id)
+                self.send(sender, response)
+        elif isinstance(message, WakeupMessage):
+            self.on_stream_tick(message)
+        elif isinstance(message, ChunkAnalysisResult):
+            self.on_chunk_result(message)
+        elif isinstance(message, PoisonMessage) and isinstance(message.poisonMessage, ChunkAnalysisRequest):
+            request = message.poisonMessage
+            self.on_chunk_result(ChunkAnalysisResult(request.job_id, request.level, request.index, error=str(message.details)))
         else:
             self.send(sender, "Unknown command. Please send 'troubleshoot' to receive troubleshooting assistance.")
\ No newline at end of file
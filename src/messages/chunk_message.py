@@ -0,0 +1,16 @@
+class ChunkAnalysisRequest:
+    def __init__(self, job_id: str, level: int, index: int, prompt: str, instruction: str):
+        self.job_id = job_id
+        self.level = level
+        self.index = index
+        self.prompt = prompt
+        self.instruction = instruction
+
+
+class ChunkAnalysisResult:
+    def __init__(self, job_id: str, level: int, index: int, response: str = None, error: str = None):
+        self.job_id = job_id
+        self.level = level
+        self.index = index
+        self.response = response
+        self.error = error
@@ -1,4 +1,6 @@
 class IntentAgentMessage:
-    def __init__(self, message: str,query: str):
+    def __init__(self, message: str,query: str,request_id: str=None,stream: bool=False):
         self.message = message
-        self.query = query
\ No newline at end of file
+        self.query = query
+        self.request_id = request_id
+        self.stream = stream
@@ -1,3 +1,6 @@
 class LLMMessage:
-    def __init__(self,message):
-        self.message=message
\ No newline at end of file
+    def __init__(self,message,request_id:str=None,metadata:dict=None):
+        self.message=message
+        self.request_id=request_id
+        # Optional details about how the answer was produced (e.g. tool latencies).
+        self.metadata=metadata
@@ -1,4 +1,9 @@
+import uuid
+
 class QueryMessage:
-    def __init__(self,query:str):
+    def __init__(self,query:str,request_id:str=None,stream:bool=False):
         self.message = query
-        
\ No newline at end of file
+        self.request_id = request_id or uuid.uuid4().hex
+        # When set, agents send StreamChunk messages while the answer is generated.
+        self.stream = stream
+        
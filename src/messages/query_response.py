@@ -0,0 +1,5 @@
+class QueryResponse:
+    def __init__(self,request_id:str,message,metadata:dict=None):
+        self.request_id=request_id
+        self.message=message
+        self.metadata=metadata
@@ -0,0 +1,11 @@
+class StreamChunk:
+    def __init__(self,request_id:str,text:str,index:int=0):
+        self.request_id=request_id
+        self.text=text
+        self.index=index
+
+
+class StreamTick:
+    """Wakeup payload telling an agent to forward the new text of a stream."""
+    def __init__(self,request_id:str):
+        self.request_id=request_id
@@ -1,16 +1,22 @@
 from src.model.model_interface import ModelInterface
+from src.services.event_loop import BackgroundLoop
 import requests
 import os
 from dotenv import load_dotenv
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
 class Claude(ModelInterface):
+    context_window = 200000
+    max_output_tokens = 5000
+
     def __init__(self):
         super().__init__()
         load_dotenv()
         self.model_name = "claude-sonnet-4-5"
         self.api_key = os.getenv("CLAUDE_API_KEY")
         self.client = self.initialize_client()
+        # Awaited on the BackgroundLoop only, so its connection pool outlives each caller's event loop.
+        self.async_client = AsyncAnthropic(api_key=self.api_key)
     def initialize_client(self):
         return Anthropic(api_key=self.api_key)
     def generate(self, prompt: str,instruction: str) -> str:
@@ -21,5 +27,18 @@ class Claude(ModelInterface):
         max_tokens=5000,
         stream=False)   
         return response
+    async def agenerate(self, prompt: str, instruction: str) -> str:
+        response = await BackgroundLoop().run(self.async_client.messages.create(
+        model=self.model_name,
+        messages=[{"role": "user", "content": instruction+" "+prompt}],
+        max_tokens=5000))
+        return response
+    def stream_generate(self, prompt: str, instruction: str):
+        with self.client.messages.stream(
+            model=self.model_name,
+            messages=[{"role": "user", "content": instruction+" "+prompt}],
+            max_tokens=5000) as stream:
+            for text in stream.text_stream:
+                yield text
     def chat(self, prompt: str, instruction: str) -> str:
         pass
\ No newline at end of file
@@ -1,4 +1,10 @@
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import atexit
+import os
+import queue
+import time
 from ghcopilot import GithubCopilotClient as GhCopilotClient
 from dotenv import load_dotenv
 from src.model.model_interface import ModelInterface
@@ -6,12 +12,33 @@ from loguru import logger
 
 
 class CopilotModel(ModelInterface):
+    context_window = 128000
+    max_output_tokens = 4096
+
     def __init__(self, model_id: str = None):
         super().__init__()
         load_dotenv()
         self.client = self.__initialize_client()
         self.model_id = model_id
         self.thread_id = None
+        self.models_ttl = float(os.getenv("COPILOT_MODELS_TTL") or 3600)
+        self._models = None
+        self._models_fetched_at = 0.0
+        self._resolved_model_id = None
+        self._models_lock = Lock()
+        # Threads are created ahead of time and deleted after use on a
+        # background worker, so generate() makes no thread round trips itself
+        # while the pool keeps up. Each pooled thread serves one generate()
+        # call: a reused thread would carry the previous conversation into the
+        # next prompt. A burst that drains the pool creates threads inline.
+        self.thread_pool_size = int(os.getenv("COPILOT_THREAD_POOL_SIZE") or 2)
+        self._warm_threads = queue.Queue()
+        self._closed = False
+        self._maintenance_lock = Lock()
+        self._maintenance = ThreadPoolExecutor(max_workers=1, thread_name_prefix="copilot-threads")
+        for _ in range(self.thread_pool_size):
+            self._maintenance.submit(self.__prepare_thread)
+        atexit.register(self.close)
 
     def __initialize_client(self):
         file_path = Path(__file__).parent.parent.parent / "temp/copilot_token.txt"
@@ -23,15 +50,21 @@ class CopilotModel(ModelInterface):
         logger.info("[CopilotModel] Authentication successful!")
         return client
     
+    def get_models(self) -> list:
+        """Model catalog, fetched at most once per ``models_ttl`` seconds."""
+        with self._models_lock:
+            if self._models is None or time.monotonic() - self._models_fetched_at > self.models_ttl:
+                self._models = self.client.get_models()
+                self._models_fetched_at = time.monotonic()
+                logger.info(f"[CopilotModel] Available models: {self._models}")
+            return self._models
+
     def __get_model(self) -> str:
-        models = self.client.get_models()
-        logger.info(f"[CopilotModel] Available models: {models}")
-        if self.model_id is not None:
-            model_id = self.model_id
-        else:
-            model_id = models[0]["id"]
-        logger.info(f"[CopilotModel] Using model: {model_id}")
-        return model_id
+        if self._resolved_model_id is None:
+            # An explicit model id needs no catalog lookup at all.
+            self._resolved_model_id = self.model_id or self.get_models()[0]["id"]
+            logger.info(f"[CopilotModel] Using model: {self._resolved_model_id}")
+        return self._resolved_model_id
     
     def __create_thread(self):
         self.thread_id = self.client.create_new_thread()
@@ -43,10 +76,15 @@ class CopilotModel(ModelInterface):
         logger.info(f"[CopilotModel] Using existing thread with ID: {self.thread_id}")
         return self.thread_id
     
+    def __prepare_thread(self) -> None:
+        try:
+            self._warm_threads.put(self.client.create_new_thread())
+        except Exception as e:
+            logger.warning(f"[CopilotModel] Could not pre-create thread: {e}")
+
     def __delete_thread(self, thread_id: str) -> bool:
         try:
             success = self.client.delete_thread(thread_id)
-            self.thread_id = None
             if success:
                 logger.info(f"[CopilotModel] Deleted thread with ID: {thread_id}")
             else:
@@ -56,11 +94,51 @@ class CopilotModel(ModelInterface):
             logger.error(f"[CopilotModel] Error deleting thread {thread_id}: {e}")
             return False
 
+    def __acquire_thread(self) -> str:
+        """A fresh thread from the warm pool (created on the spot if the pool is empty)."""
+        try:
+            thread_id = self._warm_threads.get_nowait()
+        except queue.Empty:
+            thread_id = self.client.create_new_thread()
+            logger.info(f"[CopilotModel] Thread pool empty, created thread {thread_id}")
+        self.__schedule(self.__prepare_thread)
+        return thread_id
+
+    def __release_thread(self, thread_id: str) -> None:
+        if not self.__schedule(self.__delete_thread, thread_id):
+            self.__delete_thread(thread_id)
+
+    def __schedule(self, fn, *args) -> bool:
+        """Run ``fn`` on the background worker; ``False`` once it is shut down."""
+        with self._maintenance_lock:
+            if self._closed:
+                return False
+            try:
+                self._maintenance.submit(fn, *args)
+            except RuntimeError:
+                # The interpreter is exiting and concurrent.futures no longer takes work.
+                return False
+            return True
+
+    def close(self) -> None:
+        """Delete the pre-created threads and stop the background worker."""
+        with self._maintenance_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._maintenance.shutdown(wait=True)
+        while True:
+            try:
+                self.__delete_thread(self._warm_threads.get_nowait())
+            except queue.Empty:
+                break
+
     def generate(self, prompt: str,instruction: str) -> str:
-        thread_id = self.__create_thread()
-        response = self.__send_message(prompt, instruction, thread_id)
-        self.__delete_thread(thread_id)
-        return response
+        thread_id = self.__acquire_thread()
+        try:
+            return self.__send_message(prompt, instruction, thread_id)
+        finally:
+            self.__release_thread(thread_id)
         
     def chat(self, prompt: str, instruction: str) -> str:
         self.thread_id = self.__get_latest_thread()
@@ -69,16 +147,25 @@ class CopilotModel(ModelInterface):
         response = self.__send_message(prompt, instruction, self.thread_id)
         return response
         
+    def stream_generate(self, prompt: str, instruction: str):
+        thread_id = self.__acquire_thread()
+        try:
+            yield from self.__stream_message(prompt, instruction, thread_id)
+        finally:
+            self.__release_thread(thread_id)
+
+    def __stream_message(self, prompt: str, instruction: str, thread_id: str=None):
+        model_id = self.__get_model()
+        complete_prompt = instruction + " " + prompt
+        for message in self.client.send_message(complete_prompt, model_id=model_id, thread_id=thread_id):
+            if message["type"] == "content":
+                yield message["text"]
+            else:
+                logger.debug(f"[CopilotModel] Received non-content message: {message}")
+
     def __send_message(self, prompt: str, instruction: str, thread_id: str=None) -> str:
         try:
-            model_id = self.__get_model()
-            complete_prompt = instruction + " " + prompt
-            response = ""
-            for message in self.client.send_message(complete_prompt, model_id=model_id, thread_id=thread_id):
-                if message["type"] == "content":
-                    response += message["text"]
-                else:
-                    logger.debug(f"[CopilotModel] Received non-content message: {message}")
+            response = "".join(self.__stream_message(prompt, instruction, thread_id))
             if response.strip() == "":
                 logger.warning("[CopilotModel] Received empty response from model.")
                 return None
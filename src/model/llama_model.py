@@ -1,46 +1,177 @@
 from src.model.model_interface import ModelInterface
+from src.services.conversation_memory import ConversationStore, estimate_tokens
+from src.services.event_loop import BackgroundLoop
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from threading import Lock
+from typing import Iterator
+import asyncio
+import uuid
+import httpx
 import requests
-import json
+import orjson
+import os
+
+# Native context lengths of common Ollama models; anything else falls back to ModelInterface.context_window.
+CONTEXT_WINDOWS = {
+    "llama3": 8192,
+    "llama3.1": 131072,
+    "llama3.2": 131072,
+    "llama3.3": 131072,
+    "codellama": 16384,
+    "mistral": 32768,
+    "qwen2.5-coder": 32768,
+}
+
+_sessions = {}
+_sessions_lock = Lock()
+
+def get_session(pool_size: int) -> requests.Session:
+    """Keep-alive session shared by every LlamaModel of this process (sessions must not cross a fork)."""
+    key = (os.getpid(), pool_size)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({'Content-Type': 'application/json'})
+            _sessions[key] = session
+        return session
+
+_async_clients = {}
+
+def get_async_client(pool_size: int, timeout: tuple) -> httpx.AsyncClient:
+    """Keep-alive async client shared by every LlamaModel of this process; use it on the BackgroundLoop only."""
+    key = (os.getpid(), pool_size, timeout)
+    with _sessions_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers={'Content-Type': 'application/json'},
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(timeout[1], connect=timeout[0]))
+            _async_clients[key] = client
+            BackgroundLoop().on_shutdown(client.aclose)
+        return client
+
 class LlamaModel(ModelInterface):
-    def __init__(self,model_name: str = "llama3",model_url: str = "http://127.0.0.1:11434"):
+    def __init__(self,model_name: str = "llama3",model_url: str = None,context_window: int = None,keep_alive: str = None):
         super().__init__()
         self.model_name = model_name
-        self.model_url = model_url
-        self.prev_chunk=[]
-        self.headers = {'Content-Type': 'application/json'}
-    def generate(self, prompt: str, instruction: str) -> str:
-        # Generate a response using the LLaMA model
-        payload = {
+        # OLLAMA_HOST is the variable Ollama itself reads; like there, the scheme may be left out.
+        model_url = model_url or os.getenv("OLLAMA_HOST") or "http://127.0.0.1:11434"
+        self.model_url = model_url if "://" in model_url else f"http://{model_url}"
+        # Ollama only uses the window it is told about (num_ctx), so send it explicitly.
+        self.context_window = context_window or int(os.getenv("OLLAMA_NUM_CTX") or 0) or CONTEXT_WINDOWS.get(model_name.split(":")[0], self.context_window)
+        self.max_output_tokens = int(os.getenv("OLLAMA_NUM_PREDICT") or 1024)
+        # Chat history lives in the process-wide store, keyed by session id. Calls
+        # that name no session share this instance's own, never another model's.
+        self.conversations = ConversationStore()
+        self.session_id = uuid.uuid4().hex
+        # How long Ollama keeps the model loaded after a request ("30m", "-1" for ever, "0" to unload).
+        self.keep_alive = keep_alive or os.getenv("OLLAMA_KEEP_ALIVE") or "30m"
+        self.timeout = (float(os.getenv("OLLAMA_CONNECT_TIMEOUT") or 5), float(os.getenv("OLLAMA_READ_TIMEOUT") or 60))
+        self.pool_size = int(os.getenv("OLLAMA_POOL_SIZE") or 10)
+        self.session = get_session(self.pool_size)
+
+    def _post(self, path: str, payload: dict) -> dict:
+        payload["keep_alive"] = self.keep_alive
+        response = self.session.post(f"{self.model_url}{path}", data=orjson.dumps(payload), timeout=self.timeout)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def _apost(self, path: str, payload: dict) -> dict:
+        payload["keep_alive"] = self.keep_alive
+        # On the process-wide loop, the pool outlives the caller's loop (e.g. an asyncio.run per query).
+        return await BackgroundLoop().run(self._asend(path, payload))
+
+    async def _asend(self, path: str, payload: dict) -> dict:
+        client = get_async_client(self.pool_size, self.timeout)
+        response = await client.post(f"{self.model_url}{path}", content=orjson.dumps(payload))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    def _generate_payload(self, prompt: str, instruction: str, stream: bool = False) -> dict:
+        return {
             "model": self.model_name,
             "prompt":instruction + " " + prompt,
-            "stream": False,
+            "stream": stream,
             "think":False,
+            "options":{"num_ctx":self.context_window},
             # "system":instruction
-            
         }
-        url = f"{self.model_url}/api/generate"
-        response = requests.post(url, 
-        headers=self.headers, 
-        json=payload,
-        timeout=60)
-        response_json= json.loads(response.text)
+
+    def generate(self, prompt: str, instruction: str) -> str:
+        # Generate a response using the LLaMA model
+        response_json = self._post("/api/generate", self._generate_payload(prompt, instruction))
+        return response_json["response"]
+
+    async def agenerate(self, prompt: str, instruction: str) -> str:
+        response_json = await self._apost("/api/generate", self._generate_payload(prompt, instruction))
         return response_json["response"]
     
-    def chat(self, prompt: str, instruction: str) -> str:
-        payload = {
+    def stream_generate(self, prompt: str, instruction: str) -> Iterator[str]:
+        payload = self._generate_payload(prompt, instruction, stream=True)
+        payload["keep_alive"] = self.keep_alive
+        # Ollama streams one JSON object per line until "done".
+        with self.session.post(f"{self.model_url}/api/generate", data=orjson.dumps(payload),
+                               timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                part = orjson.loads(line)
+                if part.get("error"):
+                    raise RuntimeError(f"Ollama error: {part['error']}")
+                if part.get("response"):
+                    yield part["response"]
+                if part.get("done"):
+                    break
+
+    def _chat_payload(self, prompt: str, instruction: str, history: list) -> dict:
+        # /api/chat reads only "messages": the instruction goes in as the system message.
+        return {
             "model": self.model_name,
-            "prompt": prompt,
             "stream": False,
             "think":False,
-            "messages":self.prev_chunk,
-            "system":instruction
+            "options":{"num_ctx":self.context_window},
+            "messages":[{"role":"system","content":instruction}, *history, {"role":"user","content":prompt}],
         }
-        url = f"{self.model_url}/api/chat"
-        response = requests.post(url, 
-        headers=self.headers, 
-        json=payload,
-        timeout=60)
-        response_json= json.loads(response.text)
-        self.prev_chunk.append({"role":"user","content":prompt})
-        print(f"[LlamaModel] Chat response: {response_json}")
-        return response_json["message"]["content"]
\ No newline at end of file
+
+    def _chat_context(self, prompt: str, instruction: str, session_id: str):
+        memory = self.conversations.get(session_id)
+        # This call can only send the history that fits next to its own instruction and prompt.
+        budget = self.conversations.history_budget(
+            self.context_window, estimate_tokens(instruction), estimate_tokens(prompt), self.max_output_tokens)
+        with memory.lock:
+            history = memory.context(budget)
+        return memory, history
+
+    def _remember(self, memory, prompt: str, reply: str) -> None:
+        budget = self.conversations.history_budget(self.context_window, self.max_output_tokens)
+        with memory.lock:
+            # Half the budget per message, so one oversized chunk still leaves room for its reply.
+            memory.add("user", prompt, budget // 2)
+            memory.add("assistant", reply, budget // 2)
+        # Takes the lock itself and summarizes without it.
+        self.conversations.compact(memory, budget, self.generate)
+
+    def chat(self, prompt: str, instruction: str, session_id: str = None) -> str:
+        session_id = session_id or self.session_id
+        memory, history = self._chat_context(prompt, instruction, session_id)
+        response_json = self._post("/api/chat", self._chat_payload(prompt, instruction, history))
+        reply = response_json["message"]["content"]
+        logger.debug(f"[LlamaModel] Chat response for session {session_id}: {reply[:200]}")
+        self._remember(memory, prompt, reply)
+        return reply
+
+    async def achat(self, prompt: str, instruction: str, session_id: str = None) -> str:
+        session_id = session_id or self.session_id
+        memory, history = self._chat_context(prompt, instruction, session_id)
+        response_json = await self._apost("/api/chat", self._chat_payload(prompt, instruction, history))
+        reply = response_json["message"]["content"]
+        # Compaction may call the model to summarize; keep it off the loop.
+        await asyncio.to_thread(self._remember, memory, prompt, reply)
+        return reply
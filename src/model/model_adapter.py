@@ -1,13 +1,101 @@
+import asyncio
+import os
+from typing import Iterator, Optional
+from dotenv import load_dotenv
+from loguru import logger
 from src.model.model_interface import ModelInterface
+from src.services.response_cache import DiskResponseCache, ResponseCache
+from src.services.single_flight import SingleFlight
 
 
 class ModelAdapter(ModelInterface):
-    def __init__(self, model: ModelInterface):
+    def __init__(self, model: ModelInterface, cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            model: The model to call
+            cache: Cache consulted by ``generate``; defaults to the shared
+                   ``DiskResponseCache`` unless RESPONSE_CACHE_ENABLED=false
+        """
         super().__init__()
+        load_dotenv()
         self.model = model
+        if cache is None and (os.getenv("RESPONSE_CACHE_ENABLED") or "true").lower() != "false":
+            cache = DiskResponseCache()
+        self.cache = cache
+        # Identical calls in flight at the same time (in any actor process) share one upstream call.
+        self.single_flight = SingleFlight()
 
-    def generate(self, prompt: str,instruction: str) -> str:
-        return self.model.generate(prompt, instruction)
+    @property
+    def context_window(self) -> int:
+        return self.model.context_window
+
+    @property
+    def max_output_tokens(self) -> int:
+        return self.model.max_output_tokens
+
+    @property
+    def cache_key(self) -> str:
+        model_name = getattr(self.model, "model_name", None) or getattr(self.model, "model_id", None) or ""
+        return f"{type(self.model).__name__}:{model_name}"
+
+    def flight_key(self, prompt: str, instruction: str, query: str = None) -> str:
+        # The fields the response cache stores an answer under: callers that share a flight share its entry.
+        return SingleFlight.make_key("generate", self.cache_key, instruction, prompt, query or "")
+
+    # ``query`` is the user's question inside ``prompt``; naming it lets the
+    # cache match near-identical questions (RESPONSE_CACHE_SEMANTIC).
+    def generate(self, prompt: str,instruction: str, query: str = None) -> str:
+        if self.cache is not None:
+            response = self.cache.get(self.cache_key, instruction, prompt, query)
+            if response is not None:
+                logger.info(f"[ModelAdapter] Cache hit for {self.cache_key}")
+                return response
+        return self.single_flight.do(self.flight_key(prompt, instruction, query), lambda: self._generate(prompt, instruction, query))
+
+    def _generate(self, prompt: str, instruction: str, query: str = None) -> str:
+        response = self.model.generate(prompt, instruction)
+        if self.cache is not None:
+            self.cache.put(self.cache_key, instruction, prompt, response, query)
+        return response
+
+    async def agenerate(self, prompt: str, instruction: str, query: str = None) -> str:
+        if self.cache is not None:
+            # Cache lookups touch SQLite (and maybe the embedding model), so keep them off the loop.
+            response = await asyncio.to_thread(self.cache.get, self.cache_key, instruction, prompt, query)
+            if response is not None:
+                logger.info(f"[ModelAdapter] Cache hit for {self.cache_key}")
+                return response
+        return await self.single_flight.ado(self.flight_key(prompt, instruction, query),
+                                            lambda: self._agenerate(prompt, instruction, query))
+
+    async def _agenerate(self, prompt: str, instruction: str, query: str = None) -> str:
+        response = await self.model.agenerate(prompt, instruction)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, self.cache_key, instruction, prompt, response, query)
+        return response
+
+    def stream_generate(self, prompt: str, instruction: str, query: str = None) -> Iterator[str]:
+        if self.cache is not None:
+            response = self.cache.get(self.cache_key, instruction, prompt, query)
+            if response is not None:
+                logger.info(f"[ModelAdapter] Cache hit for {self.cache_key}")
+                yield response
+                return
+        pieces = []
+        for piece in self.model.stream_generate(prompt, instruction):
+            if piece:
+                pieces.append(piece)
+                yield piece
+        if self.cache is not None:
+            self.cache.put(self.cache_key, instruction, prompt, "".join(pieces), query)
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {}
     
-    def chat(self, prompt: str, instruction: str) -> str:
-        return self.model.chat(prompt, instruction)
\ No newline at end of file
+    # Chat depends on the conversation so far, so it is never cached. Extra
+    # arguments (such as LlamaModel's session_id) go straight to the model.
+    def chat(self, prompt: str, instruction: str, **kwargs) -> str:
+        return self.model.chat(prompt, instruction, **kwargs)
+
+    async def achat(self, prompt: str, instruction: str, **kwargs) -> str:
+        return await self.model.achat(prompt, instruction, **kwargs)
@@ -1,10 +1,29 @@
+import asyncio
 from abc import abstractmethod
+from typing import Iterator
 
 
 class ModelInterface:
+    # Prompt + completion tokens the model accepts, and how many of them to
+    # keep free for the completion. Adapters override these per model.
+    context_window: int = 8192
+    max_output_tokens: int = 1024
+
     @abstractmethod
     def generate(self, prompt: str,instruction: str) -> str:
         pass
     @abstractmethod
     def chat(self, prompt: str,instruction: str) -> str:
-        pass
\ No newline at end of file
+        pass
+
+    def stream_generate(self, prompt: str, instruction: str) -> Iterator[str]:
+        """Yield the response in pieces as the model produces it; adapters without streaming yield it whole."""
+        yield self.generate(prompt, instruction)
+
+    # Async counterparts. Adapters with an async client override these; the
+    # defaults run the blocking call on a worker thread so the loop stays free.
+    async def agenerate(self, prompt: str, instruction: str) -> str:
+        return await asyncio.to_thread(self.generate, prompt, instruction)
+
+    async def achat(self, prompt: str, instruction: str) -> str:
+        return await asyncio.to_thread(self.chat, prompt, instruction)
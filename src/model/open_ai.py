@@ -1,16 +1,22 @@
 from src.model.model_interface import ModelInterface
+from src.services.event_loop import BackgroundLoop
 import requests
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 class OpenAi(ModelInterface):
+    context_window = 128000
+    max_output_tokens = 4096
+
     def __init__(self):
         super().__init__()
         load_dotenv()
         self.model_name = "gpt-40"
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.client = self.initialize_client()
+        # Used on the BackgroundLoop only; see agenerate.
+        self.async_client = AsyncOpenAI(api_key=self.api_key)
     def initialize_client(self):
         return OpenAI(api_key=self.api_key)
     def generate(self, prompt: str,instruction: str) -> str:
@@ -20,5 +26,21 @@ class OpenAi(ModelInterface):
         input=prompt,
         stream=False)   
         return response
+    async def agenerate(self, prompt: str, instruction: str) -> str:
+        response =await BackgroundLoop().run(self.async_client.responses.create(
+        model=self.model_name,
+        instructions=instruction,
+        input=prompt,
+        stream=False))
+        return response
+    def stream_generate(self, prompt: str, instruction: str):
+        stream =self.client.responses.create(
+        model=self.model_name,
+        instructions=instruction,
+        input=prompt,
+        stream=True)
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                yield event.delta
     def chat(self, prompt: str, instruction: str) -> str:
         pass
\ No newline at end of file
@@ -1,5 +1,9 @@
 
+import os
+import time
+from datetime import timedelta
 from src.messages.query import QueryMessage
+from src.messages.query_response import QueryResponse
 from src.orchestrator import messageTypeResolver
 from thespian.actors import Actor
 from thespian.troupe import troupe
@@ -10,15 +14,73 @@ from colorama import Fore
 class OrchestratorAgent(Actor):
     def __init__(self):
         super().__init__()
-        self.original_sender = None
+        # request_id -> (original sender, received at); one troupe worker can
+        # have many queries in flight, so callers are never tracked in a single slot.
+        self.pending_requests = {}
+        self.request_ttl = float(os.getenv("ORBIT_QUERY_TIMEOUT") or 50000.0)
+        self.expiry_scheduled = False
+        # Message type -> handler, built once per worker instead of per message.
+        self.dispatcher = messageTypeResolver.build_dispatcher()
+        # Log the per-handler counts and timings every this many messages (0 = never).
+        self.dispatch_stats_every = int(os.getenv("ORBIT_DISPATCH_STATS_EVERY") or 100)
+        self.dispatched = 0
+
     def receiveMessage(self, message, sender):
         logger.info("[Orchestrator] Sender Address: {}", sender)
         orchestrator= self
         context=(message,orchestrator,sender)
         if(isinstance(message,QueryMessage)):
-            self.original_sender= sender
-        response= messageTypeResolver.checkMessage(context)
+            self.track_request(message.request_id, sender)
+        try:
+            response= self.dispatcher.dispatch(context)
+        except Exception as e:
+            # Answer the caller; an unanswered request would keep this worker in progress for good.
+            logger.exception("[Orchestrator] Failed to handle {}", type(message).__name__)
+            response = f"Error processing query: {e}"
+        self.dispatched += 1
+        if self.dispatch_stats_every and self.dispatched % self.dispatch_stats_every == 0:
+            logger.info("[Orchestrator] Dispatch stats after {} messages: {}", self.dispatched, self.dispatcher.stats())
         if(isinstance(response,str)):
-            self.send(self.original_sender, response)
+            self.reply(getattr(message, "request_id", None), response, getattr(message, "metadata", None))
+        # Keep the troupe manager from dismissing this worker (and dropping the
+        # replies it is waiting for) while any of its requests are in flight.
+        self.troupe_work_in_progress = bool(self.pending_requests)
+
+    def track_request(self, request_id: str, sender):
+        self.pending_requests[request_id] = (sender, time.monotonic())
+        logger.info("[Orchestrator] Tracking request {} ({} in flight)", request_id, len(self.pending_requests))
+        # Expire on a timer: the troupe gives a worker in progress no new queries to prune on.
+        self.schedule_expiry(self.request_ttl)
+
+    def schedule_expiry(self, seconds: float):
+        if not self.expiry_scheduled:
+            self.expiry_scheduled = True
+            self.wakeupAfter(timedelta(seconds=seconds))
+
+    def expire_requests(self):
+        """Answer requests older than ``request_ttl`` with an error, then wait for the next one to come due."""
+        self.expiry_scheduled = False
+        now = time.monotonic()
+        expired = [rid for rid, (_, received_at) in self.pending_requests.items() if now - received_at >= self.request_ttl]
+        for rid in expired:
+            logger.warning("[Orchestrator] Expiring request: {}", rid)
+            self.reply(rid, f"Error processing query: no answer within {self.request_ttl:g} seconds")
+        if self.pending_requests:
+            oldest = min(received_at for _, received_at in self.pending_requests.values())
+            self.schedule_expiry(max(self.request_ttl - (now - oldest), 0.01))
+
+    def forward_chunk(self, chunk):
+        entry = self.pending_requests.get(chunk.request_id)
+        if entry is None:
+            logger.warning("[Orchestrator] No pending request for chunk of: {}", chunk.request_id)
+            return
+        original_sender, _ = entry
+        self.send(original_sender, chunk)
 
-        
\ No newline at end of file
+    def reply(self, request_id: str, response, metadata: dict = None):
+        entry = self.pending_requests.pop(request_id, None)
+        if entry is None:
+            logger.warning("[Orchestrator] No pending request for id: {}", request_id)
+            return
+        original_sender, _ = entry
+        self.send(original_sender, QueryResponse(request_id, response, metadata))
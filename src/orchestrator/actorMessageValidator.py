@@ -2,10 +2,19 @@ from src.chain.baseHandler import BaseHandler
 from thespian.actors import ActorExitRequest,ChildActorExited, PoisonMessage,WakeupMessage,DeadEnvelope,ActorSystemConventionUpdate
 from loguru import logger
 class ActorMessageValidator(BaseHandler):
+    message_types = (ActorExitRequest, ChildActorExited, PoisonMessage, WakeupMessage, DeadEnvelope, ActorSystemConventionUpdate)
+
     def handle(self, context):
         message, orchestrator_self,sender = context
-        if(isinstance(message,(ActorExitRequest, ChildActorExited, PoisonMessage, WakeupMessage, DeadEnvelope, ActorSystemConventionUpdate))):
+        if(isinstance(message,self.message_types)):
             # do action when the message is recived from the actor
             logger.info("[ActorMessageValidator] Received system message: {}", message)
+            if isinstance(message, PoisonMessage):
+                # An agent failed on one of our messages; answer its caller instead of leaving it waiting.
+                request_id = getattr(message.poisonMessage, "request_id", None)
+                if request_id is not None:
+                    orchestrator_self.reply(request_id, f"Error processing query: {message.details}")
+            elif isinstance(message, WakeupMessage):
+                orchestrator_self.expire_requests()
             return context
-        return super().handle(context)
\ No newline at end of file
+        return super().handle(context)
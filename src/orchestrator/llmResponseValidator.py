@@ -4,6 +4,8 @@ from src.chain.baseHandler import BaseHandler
 from src.messages.llm_message import LLMMessage
 
 class LLMResponseValidator(BaseHandler):
+    message_types = (LLMMessage,)
+
     def handle(self, context):
         message,orchestrator_self,sender = context
         if isinstance(message,LLMMessage):
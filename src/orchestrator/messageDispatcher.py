@@ -0,0 +1,59 @@
+import time
+from loguru import logger
+from src.chain.baseHandler import BaseHandler
+
+
+class MessageDispatcher:
+    """
+    Routes each orchestrator message to the handler registered for its type.
+
+    The table is built once per actor; a lookup is a dict hit on ``type(message)``.
+    A subclass of a registered type is resolved through its MRO on first sight and
+    then cached, so it costs the same as an exact match afterwards.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self._resolved = {}
+        self._stats = {}
+
+    def register(self, handler: BaseHandler, *message_types: type):
+        """Handle ``message_types`` (default: ``handler.message_types``) with ``handler``; the last registration wins."""
+        message_types = message_types or getattr(handler, "message_types", ())
+        if not message_types:
+            raise ValueError(f"{type(handler).__name__} does not declare any message types")
+        for message_type in message_types:
+            self.handlers[message_type] = handler
+        self._resolved.clear()
+        self._stats.setdefault(type(handler).__name__, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        return handler
+
+    def resolve(self, message_type: type):
+        if message_type not in self._resolved:
+            self._resolved[message_type] = next(
+                (self.handlers[base] for base in message_type.__mro__ if base in self.handlers), None)
+        return self._resolved[message_type]
+
+    def dispatch(self, context):
+        """Run the handler of ``context``'s message; unknown messages are returned unchanged."""
+        message = context[0]
+        handler = self.resolve(type(message))
+        if handler is None:
+            logger.debug("[MessageDispatcher] No handler for message type: {}", type(message).__name__)
+            return context
+        started = time.perf_counter()
+        try:
+            return handler.handle(context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats = self._stats[type(handler).__name__]
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def stats(self) -> dict:
+        """Invocation count and timing per handler."""
+        return {
+            name: {**stats, "avg_ms": stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0}
+            for name, stats in self._stats.items()
+        }
@@ -1,13 +1,38 @@
 from src.orchestrator.actorMessageValidator import ActorMessageValidator
 from src.orchestrator.intentAgentMessageValidator import IntentAgentMessageValidator
 from src.orchestrator.llmResponseValidator import LLMResponseValidator
+from src.orchestrator.messageDispatcher import MessageDispatcher
 from src.orchestrator.queryMessageValidator import QueryMessageValidator
+from src.orchestrator.streamChunkValidator import StreamChunkValidator
+
+# (handler, message types) in registration order; a later entry overrides an earlier one for the same type.
+# Register before the actor system starts so the orchestrator workers inherit the entry.
+_handlers = [
+    (StreamChunkValidator(), ()),
+    (LLMResponseValidator(), ()),
+    (QueryMessageValidator(), ()),
+    (ActorMessageValidator(), ()),
+    (IntentAgentMessageValidator(), ()),
+]
+_default_dispatcher = None
+
+
+def register_handler(handler, *message_types):
+    """Route ``message_types`` (default: ``handler.message_types``) to ``handler`` in every new dispatcher."""
+    global _default_dispatcher
+    _handlers.append((handler, message_types))
+    _default_dispatcher = None
+
+
+def build_dispatcher() -> MessageDispatcher:
+    dispatcher = MessageDispatcher()
+    for handler, message_types in _handlers:
+        dispatcher.register(handler, *message_types)
+    return dispatcher
 
 
 def checkMessage(context):
-    llm_response_validator = LLMResponseValidator()
-    query_message_validator = QueryMessageValidator()
-    actor_message_validator = ActorMessageValidator()
-    intent_agent_message_validator = IntentAgentMessageValidator()
-    llm_response_validator.set_next(query_message_validator).set_next(actor_message_validator).set_next(intent_agent_message_validator)
-    return llm_response_validator.handle(context)
\ No newline at end of file
+    global _default_dispatcher
+    if _default_dispatcher is None:
+        _default_dispatcher = build_dispatcher()
+    return _default_dispatcher.dispatch(context)
@@ -4,6 +4,8 @@ from src.messages.query import QueryMessage
 from loguru import logger
 
 class QueryMessageValidator(BaseHandler):
+    message_types = (QueryMessage,)
+
     def handle(self, context):
         message,orchestrator_self,sender = context
         if(isinstance(message,QueryMessage)):
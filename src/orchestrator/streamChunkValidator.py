@@ -0,0 +1,13 @@
+from src.chain.baseHandler import BaseHandler
+from src.messages.stream_chunk import StreamChunk
+
+class StreamChunkValidator(BaseHandler):
+    message_types = (StreamChunk,)
+
+    def handle(self, context):
+        message,orchestrator_self,sender = context
+        if isinstance(message,StreamChunk):
+            # Partial answer: pass it on to the caller and keep the request pending.
+            orchestrator_self.forward_chunk(message)
+            return context
+        return super().handle(context)
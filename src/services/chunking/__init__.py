@@ -0,0 +1,86 @@
+"""
+Token-accurate prompt chunking.
+
+The content is encoded once; chunks are cut by slicing the token array and
+mapping the cut points back to character offsets, so no chunk is re-encoded.
+Cut points snap back to the nearest gitingest file boundary
+(``====\\nFILE: path``) when one lies in the tail of the chunk, so files are
+only split when a single file is larger than the budget.
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Sequence
+from loguru import logger
+
+# gitingest separates files with a ruler line followed by "FILE: <path>". The
+# newline may be literal or escaped, depending on whether the text went
+# through toon.encode.
+FILE_BOUNDARY_PATTERN = re.compile(r"={16,}(?:\\n|\n)FILE: ")
+
+
+class TokenChunker:
+    def __init__(self, encoding, min_fill: float = 0.5):
+        """
+        Args:
+            encoding: A tiktoken-compatible encoding (encode/decode_with_offsets)
+            min_fill: Fraction of the budget a chunk must reach before it may
+                      be cut early at a file boundary
+        """
+        self.encoding = encoding
+        self.min_fill = min_fill
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.encoding.encode(text))
+
+    @staticmethod
+    def chunk_budget(context_window: int, *reserved: int) -> int:
+        """Tokens left for content once instructions, query and output are reserved."""
+        budget = context_window - sum(reserved)
+        if budget <= 0:
+            raise ValueError(f"Reserved tokens ({sum(reserved)}) exceed the context window ({context_window})")
+        return budget
+
+    def file_boundaries(self, content: str) -> List[int]:
+        return [match.start() for match in FILE_BOUNDARY_PATTERN.finditer(content)]
+
+    def chunk(self, content: str, max_tokens: int, tokens: Sequence[int] = None) -> List[str]:
+        """
+        Split ``content`` into chunks of at most ``max_tokens`` tokens.
+
+        Args:
+            content: The text to split
+            max_tokens: Token budget per chunk
+            tokens: ``encoding.encode(content)`` if the caller already has it
+
+        Returns:
+            The chunks, in order; joined they reproduce ``content``
+        """
+        if tokens is None:
+            tokens = self.encoding.encode(content)
+        if len(tokens) <= max_tokens:
+            return [content]
+        _, offsets = self.encoding.decode_with_offsets(tokens)
+        # The token holding each ruler's first character. A token can straddle the ruler, so the cut
+        # is made at the ruler itself and that token counts towards both chunks.
+        boundaries = {}
+        for pos in self.file_boundaries(content):
+            boundaries.setdefault(bisect_right(offsets, pos) - 1, pos)
+        boundary_tokens = sorted(boundaries)
+        min_tokens = max(1, int(max_tokens * self.min_fill))
+
+        chunks = []
+        start = char_start = 0
+        while start < len(tokens):
+            end = min(start + max_tokens, len(tokens))
+            char_end = offsets[end] if end < len(tokens) else len(content)
+            if end < len(tokens):
+                # Prefer the last file boundary in [start + min_tokens, end).
+                index = bisect_right(boundary_tokens, end - 1) - 1
+                if index >= 0 and boundary_tokens[index] >= start + min_tokens:
+                    end = boundary_tokens[index]
+                    char_end = boundaries[end]
+            chunks.append(content[char_start:char_end])
+            start, char_start = end, char_end
+        logger.info(f"[TokenChunker] Split {len(tokens)} tokens into {len(chunks)} chunks of <= {max_tokens} tokens")
+        return chunks
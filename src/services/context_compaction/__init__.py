@@ -0,0 +1,588 @@
+"""
+ORBIT context compaction.
+
+Sits between ``Repo2TextService`` and prompt assembly. ``compact`` rewrites
+the gitingest ``content`` of a repository snapshot file by file:
+
+* files that cost tokens without helping an answer (lockfiles, licenses,
+  minified or generated code, source maps) are left out; the directory
+  structure still lists them;
+* full-line comments and trailing whitespace are stripped and runs of blank
+  lines collapsed. Only real comments go: Python is tokenized, C-family
+  sources are scanned along with their string, template and raw-string
+  literals, and YAML block scalars and shell heredocs are left intact, so
+  docstrings and embedded text stay as they are. Formats with other
+  multi-line strings keep their comments;
+* files that are identical or near-identical to a file already kept are
+  replaced by a one-line reference to it.
+
+``render`` then serializes the compacted snapshot as plain text, TOON or
+JSON, whichever measures the fewest tokens, and reports the token count
+against what ``toon.encode`` of the raw snapshot would have cost.
+"""
+
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import re
+import tokenize
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from loguru import logger
+from toon import encode
+from src.services.retrieval import FILE_HEADER_PATTERN
+
+# Lockfiles, licenses and generated or minified artifacts.
+EXCLUDED_FILES = [
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock", "uv.lock",
+    "Cargo.lock", "Gemfile.lock", "composer.lock", "go.sum", "*.lock",
+    "LICENSE*", "LICENCE*", "COPYING*", "NOTICE*",
+    "*.min.js", "*.min.css", "*.map", "*.bundle.js", "*_pb2.py", "*_pb2_grpc.py", "*.pb.go", "*.generated.*",
+    "*.svg", "*.ipynb",
+]
+GENERATED_MARKERS = ("@generated", "DO NOT EDIT", "autogenerated", "auto-generated", "Generated by")
+# Average line length above which a file is treated as minified.
+MINIFIED_LINE_LENGTH = 300
+
+# Line-based formats without multi-line strings: a line starting with # is always a comment.
+HASH_COMMENT_EXTENSIONS = {".cfg", ".ini", ".conf", ".properties", ".env", ".mk"}
+HASH_COMMENT_FILES = {"Makefile", "Procfile", ".gitignore", ".dockerignore", "requirements.txt"}
+SHELL_EXTENSIONS = {".sh", ".bash"}
+SHELL_FILES = {"Dockerfile"}
+YAML_EXTENSIONS = {".yaml", ".yml"}
+# C-family languages and the literals their scanner skips besides "..." strings: char ('x'), quote ('...'
+# strings), template (JS `...${}...`), backtick (Go raw strings), regex (JS /.../), text_block ("""..."""),
+# raw_blocks (text blocks without escapes), verbatim (C# @"..." and """ raw strings), rust_raw (r#"..."#),
+# cpp_raw (R"x(...)x"), swift_raw (#"..."#) and dart_raw (r'...'). multiline: "..." may span lines;
+# nested: block comments nest; continuation: a // comment ending in a backslash goes on.
+# PHP (HTML outside <?php) and Groovy (/slashy/ strings) keep their comments.
+JS_SYNTAX = frozenset({"quote", "template", "regex"})
+SLASH_COMMENT_SYNTAX = {
+    **dict.fromkeys((".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"), JS_SYNTAX),
+    ".go": frozenset({"char", "backtick"}),
+    ".java": frozenset({"char", "text_block"}),
+    **dict.fromkeys((".kt", ".kts", ".scala"), frozenset({"char", "text_block", "raw_blocks", "nested"})),
+    **dict.fromkeys((".c", ".h"), frozenset({"char", "continuation"})),
+    **dict.fromkeys((".cc", ".cpp", ".hpp"), frozenset({"char", "continuation", "cpp_raw"})),
+    ".cs": frozenset({"char", "text_block", "raw_blocks", "verbatim"}),
+    ".rs": frozenset({"char", "rust_raw", "multiline", "nested"}),
+    ".swift": frozenset({"text_block", "swift_raw", "nested"}),
+    ".dart": frozenset({"quote", "text_block", "dart_raw", "nested"}),
+}
+CODE_TOKEN_PATTERN = re.compile(r"[/\"'`]")
+# Inside a JS template substitution braces are counted, to find the } that resumes the template.
+TEMPLATE_CODE_PATTERN = re.compile(r"[/\"'`{}]")
+TEMPLATE_PATTERN = re.compile(r"\\.|`|\$\{", re.S)
+STRING_END_PATTERNS = {'"': re.compile(r'\\.|"|\n', re.S), "'": re.compile(r"\\.|'|\n", re.S)}
+RAW_STRING_END_PATTERNS = {'"': re.compile(r'"|\n'), "'": re.compile(r"'|\n")}
+QUOTE_RUN_PATTERN = re.compile(r"\"+|'+")
+BLOCK_COMMENT_PATTERN = re.compile(r"/\*|\*/")
+CHAR_LITERAL_PATTERN = re.compile(r"'(?:[^'\\\n]|\\[^\n][^'\n]{0,9})'")
+REGEX_LITERAL_PATTERN = re.compile(r"/(?![*/])(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\[\n])+/[A-Za-z]*")
+# A / after one of these (or a keyword) starts a JS regex literal; after anything else it divides.
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw",
+                  "instanceof", "yield", "await"}
+# Pragmas that change behaviour and have to survive comment stripping.
+KEPT_HASH_COMMENTS = re.compile(r"#!|#\s*(type:|noqa|pragma|pylint:|fmt:|-\*-)")
+KEPT_SLASH_COMMENTS = re.compile(r"///\s*<|//go:|/[/*]\s*(\+build|eslint|@ts-|nolint|NOLINT)|/\*!")
+BLANK_RUN_PATTERN = re.compile(r"\n{3,}")
+# A YAML value that opens a literal (|) or folded (>) block scalar, e.g. "run: |" or "- >-".
+YAML_BLOCK_SCALAR_PATTERN = re.compile(r"(?:^|[\s:-])[|>][-+0-9]*(?:\s+#.*)?$")
+HEREDOC_PATTERN = re.compile(r"<<-?\s*(['\"]?)([A-Za-z_][A-Za-z0-9_]*)\1")
+
+ENCODINGS = ("plain", "toon", "json")
+
+
+@dataclass
+class CompactedRepo:
+    repo: Dict[str, str]
+    source: Dict[str, str]
+    dropped: List[Tuple[str, str]] = field(default_factory=list)
+    duplicates: List[Tuple[str, str]] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "chars_before": len(self.source.get("content", "")),
+            "chars_after": len(self.repo.get("content", "")),
+            "dropped": len(self.dropped),
+            "duplicates": len(self.duplicates),
+        }
+
+
+@dataclass
+class RenderedContext:
+    text: str
+    encoding: str
+    tokens: int
+    tokens_before: int
+    candidates: Dict[str, int]
+
+    @property
+    def ratio(self) -> float:
+        return self.tokens_before / self.tokens if self.tokens else 1.0
+
+    def as_dict(self) -> dict:
+        return {
+            "encoding": self.encoding,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens,
+            "ratio": round(self.ratio, 2),
+            "candidates": self.candidates,
+        }
+
+
+class ContextCompactor:
+    def __init__(self, encoding=None):
+        """
+        Args:
+            encoding: tiktoken-compatible encoding used to measure token counts
+        """
+        load_dotenv()
+        self.encoding = encoding
+        self.enabled = (os.getenv("CONTEXT_COMPACTION_ENABLED") or "true").lower() != "false"
+        self.strip_comments = (os.getenv("CONTEXT_COMPACTION_STRIP_COMMENTS") or "true").lower() != "false"
+        # Share of distinct lines two files must have in common to count as near-duplicates (1 = identical only).
+        self.dedup_threshold = float(os.getenv("CONTEXT_COMPACTION_DEDUP_THRESHOLD") or 0.9)
+        extra = os.getenv("CONTEXT_COMPACTION_EXCLUDE") or ""
+        self.excluded = EXCLUDED_FILES + [pattern.strip() for pattern in extra.split(",") if pattern.strip()]
+        self.encodings = [name.strip() for name in (os.getenv("CONTEXT_COMPACTION_ENCODINGS") or ",".join(ENCODINGS)).split(",")
+                          if name.strip() in ENCODINGS] or ["toon"]
+        # Snapshots are compacted once per revision; agents see the same repository on every query.
+        self._compacted: "OrderedDict[str, CompactedRepo]" = OrderedDict()
+        self._rendered: "OrderedDict[str, RenderedContext]" = OrderedDict()
+        self._lock = Lock()
+        self._stats = {"tokens_before": 0, "tokens_after": 0, "renders": 0}
+
+    def count_tokens(self, text: str) -> int:
+        if self.encoding is None:
+            return len(text) // 4
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    @staticmethod
+    def _revision(repo_data: Dict[str, str]) -> str:
+        digest = hashlib.sha256()
+        for key in ("summary", "structure", "content"):
+            digest.update(repo_data.get(key, "").encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: str, value, limit: int = 8):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+        return value
+
+    # ------------------------------------------------------------------
+    # Per-file filtering and stripping
+    # ------------------------------------------------------------------
+
+    def exclusion_reason(self, path: str, body: str) -> Optional[str]:
+        """Why ``path`` should be left out of the prompt, or None to keep it."""
+        name = os.path.basename(path)
+        for pattern in self.excluded:
+            if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(path, pattern):
+                return f"matches {pattern}"
+        head = "\n".join(body.lstrip("\n").split("\n", 5)[:5])
+        if any(marker in head for marker in GENERATED_MARKERS):
+            return "generated"
+        lines = body.count("\n") + 1
+        if len(body) > 2000 and len(body) / lines > MINIFIED_LINE_LENGTH:
+            return "minified"
+        return None
+
+    def strip(self, path: str, body: str) -> str:
+        """Drop full-line comments (when the file type is known), trailing whitespace and extra blank lines."""
+        name = os.path.basename(path)
+        extension = os.path.splitext(name)[1].lower()
+        lines = [line.rstrip() for line in body.split("\n")]
+        if self.strip_comments:
+            comments = None
+            if extension == ".py":
+                comments = self._python_comment_lines(body, lines)
+            elif extension in YAML_EXTENSIONS:
+                comments = self._yaml_comment_lines(lines)
+            elif extension in SHELL_EXTENSIONS or name in SHELL_FILES:
+                comments = self._shell_comment_lines(lines)
+            elif extension in HASH_COMMENT_EXTENSIONS or name in HASH_COMMENT_FILES:
+                comments = {i for i, line in enumerate(lines) if line.lstrip().startswith("#")}
+            elif extension in SLASH_COMMENT_SYNTAX:
+                lines = self._strip_slash_comments("\n".join(lines), SLASH_COMMENT_SYNTAX[extension]).split("\n")
+            if comments:
+                lines = [line for i, line in enumerate(lines)
+                         if i not in comments or KEPT_HASH_COMMENTS.match(line.lstrip())]
+        text = "\n".join(lines)
+        return BLANK_RUN_PATTERN.sub("\n\n", text).strip("\n") + "\n"
+
+    @staticmethod
+    def _python_comment_lines(body: str, lines: List[str]) -> set:
+        """Lines holding nothing but a comment token; # inside strings and docstrings is not one."""
+        comments = {i for i, line in enumerate(lines) if line.lstrip().startswith("#")}
+        # Only a triple-quoted string can put a # at the start of a line; tokenizing is the slow path.
+        if not comments or ('"""' not in body and "'''" not in body):
+            return comments
+        try:
+            return {token.start[0] - 1 for token in tokenize.generate_tokens(io.StringIO(body).readline)
+                    if token.type == tokenize.COMMENT and not token.line[:token.start[1]].strip()}
+        except (tokenize.TokenError, SyntaxError):
+            # Not valid Python 3 (or cut off): keep every line rather than guess.
+            return set()
+
+    @staticmethod
+    def _yaml_comment_lines(lines: List[str]) -> set:
+        """Comment lines outside block scalars, whose indented bodies are text, not YAML."""
+        comments, parent_indent, content_indent = set(), None, None
+        for i, line in enumerate(lines):
+            stripped = line.lstrip()
+            indent = len(line) - len(stripped)
+            if parent_indent is not None:
+                if not stripped:
+                    continue
+                # The first line of the body sets its indentation; a less indented line ends it.
+                if content_indent is None and indent > parent_indent:
+                    content_indent = indent
+                if content_indent is not None and indent >= content_indent:
+                    continue
+                parent_indent = content_indent = None
+            if stripped.startswith("#"):
+                comments.add(i)
+            elif YAML_BLOCK_SCALAR_PATTERN.search(line):
+                parent_indent = indent
+        return comments
+
+    @staticmethod
+    def _shell_comment_lines(lines: List[str]) -> set:
+        """Comment lines outside heredocs, whose bodies are input to another program."""
+        comments, terminators = set(), []
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if terminators:
+                if stripped == terminators[0]:
+                    terminators.pop(0)
+                continue
+            if stripped.startswith("#"):
+                comments.add(i)
+            else:
+                terminators = [match.group(2) for match in HEREDOC_PATTERN.finditer(line)]
+        return comments
+
+    @staticmethod
+    def _strip_slash_comments(text: str, syntax: frozenset) -> str:
+        """
+        Remove ``//`` and ``/* */`` comments that start a line; a comment after
+        code stays. Code after the end of a removed block comment keeps its line.
+        """
+        if ("//" not in text and "/*" not in text) or "\0" in text:
+            return text
+        spans = ContextCompactor._slash_comment_spans(text, syntax)
+        if not spans:
+            # None: a string or comment never closes, so the scan went wrong somewhere; keep every line.
+            return text
+        parts, pos = [], 0
+        for start, end in spans:
+            line_start = text.rfind("\n", 0, start) + 1
+            if text[max(line_start, pos):start].strip() or KEPT_SLASH_COMMENTS.match(text, start):
+                continue
+            # A marker where the comment was: lines left with nothing else are dropped below.
+            parts.append(text[pos:start])
+            parts.append("\0")
+            pos = end
+            while pos < len(text) and text[pos] in " \t":
+                pos += 1
+        parts.append(text[pos:])
+        lines = "".join(parts).split("\n")
+        return "\n".join(line.replace("\0", "") for line in lines
+                         if "\0" not in line or line.replace("\0", "").strip())
+
+    @staticmethod
+    def _slash_comment_spans(text: str, syntax: frozenset) -> Optional[List[Tuple[int, int]]]:
+        """``(start, end)`` of every comment, or None if a string or comment runs off the end of the text."""
+        spans, frames, i = [], [], 0
+        while True:
+            match = (TEMPLATE_CODE_PATTERN if frames else CODE_TOKEN_PATTERN).search(text, i)
+            if match is None:
+                return None if frames else spans
+            i = match.start()
+            char = match.group()
+            if text.startswith("//", i):
+                end = text.find("\n", i)
+                while "continuation" in syntax and end > 0 and text[end - 1] == "\\":
+                    end = text.find("\n", end + 1)
+                end = len(text) if end < 0 else end
+                spans.append((i, end))
+                i = end
+            elif text.startswith("/*", i):
+                end = ContextCompactor._block_comment_end(text, i + 2, "nested" in syntax)
+                if end is None:
+                    return None
+                spans.append((i, end))
+                i = end
+            elif char == "/":
+                i = ContextCompactor._regex_end(text, i, spans) if "regex" in syntax else i + 1
+            elif char == "{":
+                frames[-1] += 1
+                i += 1
+            elif char == "}":
+                if frames[-1]:
+                    frames[-1] -= 1
+                    i += 1
+                    continue
+                # The substitution closes: back into the template it came from.
+                frames.pop()
+                i = ContextCompactor._template_end(text, i + 1, frames)
+            elif char == "`" and "template" in syntax:
+                i = ContextCompactor._template_end(text, i + 1, frames)
+            elif char == "`" and "backtick" in syntax:
+                end = text.find("`", i + 1)
+                i = None if end < 0 else end + 1
+            elif char == "'" and "char" in syntax:
+                # Not every quote opens one: Rust lifetimes, C++ digit separators, Scala symbols.
+                literal = CHAR_LITERAL_PATTERN.match(text, i)
+                i = literal.end() if literal else i + 1
+            elif char == '"' or (char == "'" and "quote" in syntax):
+                i = ContextCompactor._string_end(text, i, syntax)
+            else:
+                i += 1
+            if i is None:
+                return None
+
+    @staticmethod
+    def _block_comment_end(text: str, i: int, nested: bool) -> Optional[int]:
+        if not nested:
+            end = text.find("*/", i)
+            return None if end < 0 else end + 2
+        depth = 1
+        for match in BLOCK_COMMENT_PATTERN.finditer(text, i):
+            depth += 1 if match.group() == "/*" else -1
+            if depth == 0:
+                return match.end()
+        return None
+
+    @staticmethod
+    def _template_end(text: str, i: int, frames: list) -> Optional[int]:
+        """Scan a JS template literal from ``i``; a ``${`` opens a substitution frame and returns to code."""
+        match = TEMPLATE_PATTERN.search(text, i)
+        while match is not None and match.group().startswith("\\"):
+            match = TEMPLATE_PATTERN.search(text, match.end())
+        if match is None:
+            return None
+        if match.group() == "${":
+            frames.append(0)
+        return match.end()
+
+    @staticmethod
+    def _regex_end(text: str, i: int, spans: list) -> int:
+        """End of the JS regex literal at ``i``, or ``i + 1`` if the slash divides."""
+        # The previous token, looking past whitespace and comments.
+        j, s = i - 1, len(spans) - 1
+        while j >= 0:
+            if text[j].isspace():
+                j -= 1
+                continue
+            while s >= 0 and spans[s][0] > j:
+                s -= 1
+            if s >= 0 and j < spans[s][1]:
+                j = spans[s][0] - 1
+                continue
+            break
+        if j >= 0 and text[j] not in REGEX_PRECEDERS:
+            k = j
+            while k >= 0 and (text[k].isalnum() or text[k] in "_$"):
+                k -= 1
+            if text[k + 1:j + 1] not in REGEX_KEYWORDS:
+                return i + 1
+        literal = REGEX_LITERAL_PATTERN.match(text, i)
+        return literal.end() if literal else i + 1
+
+    @staticmethod
+    def _string_end(text: str, i: int, syntax: frozenset) -> Optional[int]:
+        """End of the string literal whose quote is at ``i``, judged by the prefix before it (r#, R, @, ...)."""
+        quote = text[i]
+        j = i
+        while j > 0 and text[j - 1] == "#":
+            j -= 1
+        hashes = "#" * (i - j)
+        k = j
+        while k > 0 and (text[k - 1].isalnum() or text[k - 1] in "_@$"):
+            k -= 1
+        prefix = text[k:j]
+        if quote == '"' and "rust_raw" in syntax and prefix in ("r", "br", "cr"):
+            end = text.find('"' + hashes, i + 1)
+            return None if end < 0 else end + 1 + len(hashes)
+        if quote == '"' and "cpp_raw" in syntax and prefix in ("R", "u8R", "uR", "UR", "LR"):
+            paren = text.find("(", i + 1, i + 18)
+            if paren >= 0:
+                closing = ")" + text[i + 1:paren] + '"'
+                end = text.find(closing, paren)
+                return None if end < 0 else end + len(closing)
+        if quote == '"' and "verbatim" in syntax and prefix in ("@", "$@", "@$"):
+            # "" is an escaped quote; there are no backslash escapes.
+            end = i + 1
+            while True:
+                end = text.find('"', end)
+                if end < 0:
+                    return None
+                if text.startswith('""', end):
+                    end += 2
+                    continue
+                return end + 1
+        raw = hashes or ("dart_raw" in syntax and prefix == "r")
+        run = len(QUOTE_RUN_PATTERN.match(text, i).group())
+        if run >= 3 and "text_block" in syntax:
+            # C# raw strings close with as many quotes as they opened with; the others with three.
+            width = run if "verbatim" in syntax else 3
+            closing = quote * width + hashes
+            escapes = not raw and "raw_blocks" not in syntax
+            end = i + width
+            while True:
+                end = text.find(closing, end)
+                if end < 0:
+                    return None
+                escaped = end
+                while escapes and text[escaped - 1] == "\\":
+                    escaped -= 1
+                if (end - escaped) % 2:
+                    end += 1
+                    continue
+                # Quotes right before the closing ones belong to the text: """a"""" ends after four.
+                end += width
+                while not hashes and text.startswith(quote, end):
+                    end += 1
+                return end + len(hashes)
+        if hashes and "swift_raw" in syntax:
+            end = text.find('"' + hashes, i + 1)
+            line_end = text.find("\n", i)
+            if end >= 0 and (line_end < 0 or end < line_end):
+                return end + 1 + len(hashes)
+            return len(text) if line_end < 0 else line_end
+        patterns = RAW_STRING_END_PATTERNS if raw else STRING_END_PATTERNS
+        end = i + 1
+        while True:
+            match = patterns[quote].search(text, end)
+            if match is None:
+                return None if "multiline" in syntax else len(text)
+            if match.group() == quote:
+                return match.end()
+            if match.group() == "\n" and "multiline" not in syntax:
+                # An unterminated single-line string: pick up again on the next line.
+                return match.start()
+            end = match.end()
+
+    @staticmethod
+    def _shingles(body: str) -> frozenset:
+        return frozenset(hash(line.strip()) for line in body.split("\n") if len(line.strip()) > 3)
+
+    # ------------------------------------------------------------------
+    # Snapshot compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, repo_data: Dict[str, str]) -> CompactedRepo:
+        """Filter, strip and de-duplicate the files of a ``Repo2TextService`` result."""
+        if not self.enabled:
+            return CompactedRepo(repo_data, repo_data)
+        revision = self._revision(repo_data)
+        with self._lock:
+            cached = self._compacted.get(revision)
+        if cached is not None:
+            return cached
+        content = repo_data.get("content", "")
+        headers = list(FILE_HEADER_PATTERN.finditer(content))
+        parts = [content[:headers[0].start()] if headers else content]
+        result = CompactedRepo({}, repo_data)
+        exact, kept = {}, []
+        for i, header in enumerate(headers):
+            path = header.group(1).strip()
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+            body = content[header.end():end]
+            reason = self.exclusion_reason(path, body)
+            if reason is not None:
+                result.dropped.append((path, reason))
+                continue
+            body = self.strip(path, body)
+            original = self._find_duplicate(body, exact, kept)
+            if original is not None:
+                result.duplicates.append((path, original))
+                body = f"(same as {original})\n"
+            else:
+                exact.setdefault(hashlib.sha256(body.encode("utf-8", "surrogatepass")).digest(), path)
+                kept.append((path, len(body), self._shingles(body)))
+            parts.append(header.group(0))
+            parts.append(body + "\n")
+        result.repo = {**repo_data, "content": "".join(parts)}
+        stats = result.as_dict()
+        logger.info(f"[ContextCompactor] Content {stats['chars_before']} -> {stats['chars_after']} chars: "
+                    f"{stats['dropped']} files dropped, {stats['duplicates']} duplicates")
+        with self._lock:
+            return self._remember(self._compacted, revision, result)
+
+    def _find_duplicate(self, body: str, exact: dict, kept: list) -> Optional[str]:
+        if len(body) < 200:
+            # A reference would cost about as much as the file itself.
+            return None
+        digest = hashlib.sha256(body.encode("utf-8", "surrogatepass")).digest()
+        if digest in exact:
+            return exact[digest]
+        if self.dedup_threshold >= 1:
+            return None
+        shingles = self._shingles(body)
+        if not shingles:
+            return None
+        for path, size, other in kept:
+            # Files of very different size cannot be near-duplicates; skip the set comparison.
+            if not other or abs(size - len(body)) > 0.2 * max(size, len(body)):
+                continue
+            if len(shingles & other) / len(shingles | other) >= self.dedup_threshold:
+                return path
+        return None
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def serialize(repo: Dict[str, str], encoding: str) -> str:
+        if encoding == "toon":
+            return encode(repo)
+        if encoding == "json":
+            return json.dumps(repo, ensure_ascii=False)
+        return (f"Summary:\n{repo.get('summary', '')}\n\n"
+                f"Directory structure:\n{repo.get('structure', '')}\n\n"
+                f"{repo.get('content', '')}")
+
+    def render(self, compacted: CompactedRepo) -> RenderedContext:
+        """Serialize the compacted snapshot in the encoding that measures the fewest tokens."""
+        if not self.enabled:
+            text = encode(compacted.source)
+            tokens = self.count_tokens(text)
+            return RenderedContext(text, "toon", tokens, tokens, {"toon": tokens})
+        key = self._revision(compacted.repo)
+        with self._lock:
+            cached = self._rendered.get(key)
+        if cached is not None:
+            return cached
+        candidates = {name: self.serialize(compacted.repo, name) for name in self.encodings}
+        counts = {name: self.count_tokens(text) for name, text in candidates.items()}
+        best = min(counts, key=counts.get)
+        tokens_before = self.count_tokens(encode(compacted.source))
+        rendered = RenderedContext(candidates[best], best, counts[best], tokens_before, counts)
+        logger.info(f"[ContextCompactor] Prompt context {tokens_before} -> {rendered.tokens} tokens "
+                    f"({rendered.ratio:.1f}x, {best}; candidates {counts})")
+        with self._lock:
+            self._stats["tokens_before"] += tokens_before
+            self._stats["tokens_after"] += rendered.tokens
+            self._stats["renders"] += 1
+            return self._remember(self._rendered, key, rendered)
+
+    def stats(self) -> dict:
+        """Tokens before and after compaction, summed over the contexts rendered by this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["saved_tokens"] = stats["tokens_before"] - stats["tokens_after"]
+        return stats
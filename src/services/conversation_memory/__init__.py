@@ -0,0 +1,232 @@
+"""
+ORBIT conversation memory.
+
+``LlamaModel.chat`` keeps the history of each chat session in a
+``ConversationMemory`` held by the process-wide ``ConversationStore``, so a
+session is identified by its id rather than by the adapter instance that
+happens to serve it. Both the user prompts and the assistant replies are
+recorded. What is sent back to the model is bounded twice: by a sliding
+window of the most recent messages, and by a token budget that the caller
+derives from the model's context window.
+
+Messages that fall out of the window are dropped, or, with
+``CHAT_MEMORY_SUMMARIZE=true``, folded into a running summary that is sent
+ahead of the recent messages. Compaction trims the history to
+``CHAT_MEMORY_COMPACT_TO`` of its limits in one go, so the summarizer runs
+once per batch of evicted turns rather than on every call.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, List, Optional
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+CLIPPED_MARKER = "\n[...]\n"
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count with tiktoken's cl100k_base, or ~4 characters per token if it is unavailable."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"[ConversationMemory] tiktoken unavailable, estimating tokens from length: {e}")
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+class ConversationMemory:
+    def __init__(self, session_id: str, max_messages: int, count_tokens: Callable[[str], int] = estimate_tokens):
+        """
+        Args:
+            session_id: The session this history belongs to
+            max_messages: Sliding window; older messages are compacted away
+            count_tokens: Token counter used for the budget
+        """
+        self.session_id = session_id
+        self.max_messages = max_messages
+        self.count_tokens = count_tokens
+        self.summary = ""
+        self.messages: List[dict] = []
+        self.updated_at = time.time()
+        self.lock = Lock()
+        # Evicted messages waiting for the summarizer, and whether a summarizer is running.
+        self.unsummarized: List[dict] = []
+        self.summarizing = False
+
+    def _tokens(self, message: dict) -> int:
+        if "tokens" not in message:
+            message["tokens"] = self.count_tokens(message["content"])
+        return message["tokens"]
+
+    def clip(self, content: str, max_tokens: int) -> str:
+        """Keep the head and tail of a message that alone would take more than ``max_tokens``."""
+        tokens = self.count_tokens(content)
+        if tokens <= max_tokens:
+            return content
+        keep = max(int(len(content) * max_tokens / tokens) - len(CLIPPED_MARKER), 0) // 2
+        return content[:keep] + CLIPPED_MARKER + content[len(content) - keep:]
+
+    def add(self, role: str, content: str, max_tokens: int) -> None:
+        """Record a message, clipped to ``max_tokens`` so one huge prompt cannot crowd out the rest."""
+        self.messages.append({"role": role, "content": self.clip(content or "", max_tokens)})
+        self.updated_at = time.time()
+
+    def total_tokens(self) -> int:
+        return sum(self._tokens(message) for message in self.messages) + (self.count_tokens(self.summary) if self.summary else 0)
+
+    def context(self, budget: int) -> List[dict]:
+        """The summary plus the newest messages that fit in ``budget`` tokens, oldest first."""
+        selected = []
+        used = 0
+        if self.summary:
+            used = self.count_tokens(self.summary)
+        for message in reversed(self.messages[-self.max_messages:]):
+            used += self._tokens(message)
+            if used > budget:
+                break
+            selected.append({"role": message["role"], "content": message["content"]})
+        selected.reverse()
+        # A window must not open with an assistant reply whose prompt was cut off.
+        while selected and selected[0]["role"] != "user":
+            selected.pop(0)
+        if self.summary:
+            selected.insert(0, {"role": "system", "content": f"Summary of the conversation so far:\n{self.summary}"})
+        return selected
+
+    def evict(self, budget: int, compact_to: float) -> List[dict]:
+        """
+        Remove the oldest messages once the history exceeds ``budget`` tokens or
+        the sliding window, down to ``compact_to`` of both limits.
+
+        Returns:
+            The removed messages, oldest first (empty if nothing was over)
+        """
+        if len(self.messages) <= self.max_messages and self.total_tokens() <= budget:
+            return []
+        target_messages = max(int(self.max_messages * compact_to), 2)
+        target_tokens = int(budget * compact_to)
+        dropped = 0
+        total = sum(self._tokens(message) for message in self.messages)
+        while dropped < len(self.messages) and (len(self.messages) - dropped > target_messages or total > target_tokens):
+            total -= self._tokens(self.messages[dropped])
+            dropped += 1
+        # Drop whole exchanges: keep the history starting with a user prompt.
+        while dropped < len(self.messages) and self.messages[dropped]["role"] != "user":
+            dropped += 1
+        evicted, self.messages = self.messages[:dropped], self.messages[dropped:]
+        return evicted
+
+    @staticmethod
+    def summary_prompt(summary: str, evicted: List[dict]) -> str:
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in evicted)
+        previous = f"Summary so far:\n{summary}\n\n" if summary else ""
+        return f"{previous}Conversation to add to the summary:\n{transcript}"
+
+
+class ConversationStore(metaclass=Singleton):
+    SUMMARY_INSTRUCTION = (
+        "Summarize the conversation below for the assistant's own reference. Keep facts, decisions, "
+        "names, file paths and open questions; drop pleasantries. Reply with the summary only.")
+
+    def __init__(self):
+        load_dotenv()
+        self.max_messages = int(os.getenv("CHAT_MEMORY_MAX_MESSAGES") or 20)
+        # 0 = half of the model's context window, see history_budget().
+        self.max_tokens = int(os.getenv("CHAT_MEMORY_MAX_TOKENS") or 0)
+        self.summarize = (os.getenv("CHAT_MEMORY_SUMMARIZE") or "false").lower() == "true"
+        self.summary_tokens = int(os.getenv("CHAT_MEMORY_SUMMARY_TOKENS") or 512)
+        self.compact_to = float(os.getenv("CHAT_MEMORY_COMPACT_TO") or 0.75)
+        self.max_sessions = int(os.getenv("CHAT_MEMORY_MAX_SESSIONS") or 256)
+        self.session_ttl = float(os.getenv("CHAT_MEMORY_SESSION_TTL") or 3600)
+        self._sessions: "OrderedDict[str, ConversationMemory]" = OrderedDict()
+        self._lock = Lock()
+        self._stats = {"compactions": 0, "summaries": 0, "evicted_messages": 0, "expired_sessions": 0}
+
+    def history_budget(self, context_window: int, *reserved: int) -> int:
+        """Tokens the history may use: the configured budget, capped by what the window has left."""
+        budget = self.max_tokens or context_window // 2
+        return max(min(budget, context_window - sum(reserved)), 0)
+
+    def get(self, session_id: str) -> ConversationMemory:
+        with self._lock:
+            self._expire()
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                memory = self._sessions[session_id] = ConversationMemory(session_id, self.max_messages)
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            return memory
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.session_ttl
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.updated_at >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self._stats["expired_sessions"] += 1
+
+    def reset(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def compact(self, memory: ConversationMemory, budget: int,
+                summarizer: Optional[Callable[[str, str], str]] = None) -> None:
+        """
+        Enforce the window and budget on ``memory``; evicted turns are folded into
+        its summary when summarization is on and a ``summarizer(prompt, instruction)`` is given.
+
+        Takes ``memory.lock`` only to evict and to store the summary. The summarizer
+        is a model call and runs without it, so other chats on the session go on.
+        One summarizer runs per session at a time; turns evicted meanwhile are
+        picked up by it before it finishes.
+        """
+        summarize = self.summarize and summarizer is not None
+        with memory.lock:
+            evicted = memory.evict(budget, self.compact_to)
+            if not evicted:
+                return
+            if summarize:
+                memory.unsummarized.extend(evicted)
+                summarize = not memory.summarizing
+                memory.summarizing = True
+        self._count("compactions")
+        self._count("evicted_messages", len(evicted))
+        while summarize:
+            with memory.lock:
+                batch, memory.unsummarized = memory.unsummarized, []
+                if not batch:
+                    memory.summarizing = False
+                    return
+                previous = memory.summary
+            try:
+                summary = summarizer(ConversationMemory.summary_prompt(previous, batch), self.SUMMARY_INSTRUCTION)
+            except Exception as e:
+                logger.warning(f"[ConversationStore] Could not summarize session {memory.session_id}: {e}")
+                summary = None
+            if summary:
+                with memory.lock:
+                    memory.summary = memory.clip(summary.strip(), self.summary_tokens)
+                self._count("summaries")
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[stat] += amount
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sessions"] = len(self._sessions)
+        return stats
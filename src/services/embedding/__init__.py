@@ -0,0 +1,54 @@
+"""
+ORBIT embedding service.
+
+Wraps the ONNX sentence-embedding model shipped with ``pymilvus.model``
+(onnxruntime + a transformers tokenizer), so embeddings are computed locally
+without a torch install. The model is loaded lazily, once per process.
+"""
+
+import os
+from typing import List
+import numpy as np
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+
+class EmbeddingService(metaclass=Singleton):
+    def __init__(self):
+        load_dotenv()
+        self.model_name = os.getenv("EMBEDDING_MODEL") or "GPTCache/paraphrase-albert-onnx"
+        self.tokenizer_name = os.getenv("EMBEDDING_TOKENIZER") or "GPTCache/paraphrase-albert-small-v2"
+        self._embedding_function = None
+
+    def _load(self):
+        if self._embedding_function is None:
+            from pymilvus import model as milvus_model
+            logger.info(f"[EmbeddingService] Loading embedding model {self.model_name}")
+            self._embedding_function = milvus_model.DefaultEmbeddingFunction(
+                model_name=self.model_name,
+                tokenizer_name=self.tokenizer_name)
+        return self._embedding_function
+
+    @property
+    def dim(self) -> int:
+        return self._load().dim
+
+    @staticmethod
+    def _normalize(vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Unit-length embeddings for passages, one row per text."""
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self._normalize(self._load().encode_documents(texts))
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Unit-length embeddings for queries, one row per text."""
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self._normalize(self._load().encode_queries(texts))
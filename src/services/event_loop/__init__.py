@@ -0,0 +1,75 @@
+"""
+ORBIT background event loop.
+
+Async HTTP clients (httpx, and the OpenAI/Anthropic SDKs built on it) keep
+their pooled connections on the event loop that opened them. Callers that
+drive async code through a fresh ``asyncio.run()`` per query would get a new
+pool each time, and a client reused on another loop fails on its stale
+connections. ``BackgroundLoop`` runs one long-lived loop per process on a
+daemon thread; ``await BackgroundLoop().run(coro)`` runs ``coro`` there from
+any loop, so a single client per process keeps its connections alive.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from typing import Awaitable, Callable, List, Optional
+from loguru import logger
+from src.services.singleton import Singleton
+
+
+class BackgroundLoop(metaclass=Singleton):
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._closers: List[Callable[[], Awaitable]] = []
+        atexit.register(self.shutdown)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # The loop thread stays with the parent after a fork, and so do the clients on it.
+            if self._loop is None or self._pid != os.getpid():
+                self._closers = []
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="orbit-async", daemon=True).start()
+            return self._loop
+
+    async def run(self, coro):
+        """Run ``coro`` on the background loop and await it from whatever loop the caller is on."""
+        loop = self.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def on_shutdown(self, closer: Callable[[], Awaitable]) -> None:
+        """Await ``closer()`` on the loop at shutdown, e.g. a client's ``aclose``."""
+        with self._lock:
+            self._closers.append(closer)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            loop, closers = self._loop, self._closers
+            if loop is None or self._pid != os.getpid():
+                return
+            self._loop, self._closers = None, []
+
+        async def close_all():
+            for closer in closers:
+                try:
+                    await closer()
+                except Exception as e:
+                    logger.warning(f"[BackgroundLoop] Close failed: {e}")
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_all(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"[BackgroundLoop] Shutdown did not finish: {e}")
+        loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,138 @@
+"""
+ORBIT intent decision cache.
+
+Remembers which agent a query was routed to, keyed by the normalized query
+text and the agent registry, so repeated questions skip the router and the
+IntentAgent LLM call. Entries expire after a TTL and the least recently used
+ones are dropped once the cache is full. Any change to the agent set (a new
+``AgentRegistry.register_agent``) empties the cache. The cache can optionally
+be persisted to a JSON file so it survives restarts; the file is discarded
+when it was written for a different agent set.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+from loguru import logger
+from src.agent_registry.register import AgentRegistry
+from src.services.singleton import Singleton
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent.parent / "temp" / "intent_cache.json"
+TRAILING_PUNCTUATION = re.compile(r"[\s?!.,;:]+$")
+
+
+class IntentDecisionCache(metaclass=Singleton):
+    def __init__(self, registry: AgentRegistry = None):
+        load_dotenv()
+        self.registry = registry or AgentRegistry()
+        self.enabled = (os.getenv("INTENT_CACHE_ENABLED") or "true").lower() != "false"
+        self.ttl = float(os.getenv("INTENT_CACHE_TTL") or 3600)
+        self.max_entries = int(os.getenv("INTENT_CACHE_MAX_ENTRIES") or 1024)
+        self.persist = (os.getenv("INTENT_CACHE_PERSIST") or "false").lower() == "true"
+        self.path = Path(os.getenv("INTENT_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._version = None
+        self._fingerprint = None
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Case-fold, collapse whitespace and drop trailing punctuation."""
+        text = unicodedata.normalize("NFKC", query).casefold()
+        text = " ".join(text.split())
+        return TRAILING_PUNCTUATION.sub("", text)
+
+    def _sync_registry(self) -> None:
+        """Drop every entry when the agent set changed since the last call."""
+        if self._version == self.registry.version:
+            return
+        fingerprint = self.registry.fingerprint()
+        if self._version is None and self.persist:
+            self._load(fingerprint)
+        elif fingerprint != self._fingerprint and self._entries:
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+            logger.info("[IntentDecisionCache] Agent registry changed, cache cleared")
+        self._version = self.registry.version
+        self._fingerprint = fingerprint
+
+    def get(self, query: str) -> Optional[dict]:
+        """Cached decision for ``query``, or None."""
+        if not self.enabled:
+            return None
+        self._sync_registry()
+        key = self.normalize(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        if time.time() - entry["stored_at"] > self.ttl:
+            del self._entries[key]
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry["decision"]
+
+    def put(self, query: str, decision: dict) -> None:
+        if not self.enabled:
+            return
+        self._sync_registry()
+        key = self.normalize(query)
+        self._entries[key] = {"decision": decision, "stored_at": time.time()}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+        if self.persist:
+            self._save()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self.persist:
+            self.path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self._entries)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self, fingerprint: str) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if payload.get("fingerprint") != fingerprint:
+            logger.info("[IntentDecisionCache] Persisted cache was built for another agent set, ignoring it")
+            return
+        now = time.time()
+        for key, entry in payload.get("entries", []):
+            if now - entry["stored_at"] <= self.ttl:
+                self._entries[key] = entry
+        logger.info(f"[IntentDecisionCache] Loaded {len(self._entries)} decisions from {self.path}")
+
+    def _save(self) -> None:
+        payload = {"fingerprint": self._fingerprint, "entries": list(self._entries.items())}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"[IntentDecisionCache] Could not persist cache: {e}")
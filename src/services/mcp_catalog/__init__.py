@@ -0,0 +1,89 @@
+"""
+ORBIT MCP capability catalog.
+
+Remembers the tools, resources and prompts each MCP server offers, so a new
+connection can skip the ``list_tools``/``list_resources``/``list_prompts``
+round trips of discovery. Catalogs are stored as JSON files in
+``temp/mcp_catalog/``, one per server launch configuration (transport,
+command and arguments, or URL; the environment is left out so tokens never
+reach the disk), and are only used for the server version they were listed
+from. ``MCPConnection`` refreshes a loaded catalog in the background once it
+is older than ``MCP_CATALOG_MAX_AGE``, and whenever the server announces that
+a list changed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+DEFAULT_CATALOG_DIR = Path(__file__).parent.parent.parent.parent / "temp" / "mcp_catalog"
+
+
+class MCPCatalogStore(metaclass=Singleton):
+    def __init__(self):
+        load_dotenv()
+        self.enabled = (os.getenv("MCP_CATALOG_ENABLED") or "true").lower() != "false"
+        self.directory = Path(os.getenv("MCP_CATALOG_DIR") or DEFAULT_CATALOG_DIR)
+        # A loaded catalog older than this is used right away but refreshed in the background.
+        self.max_age = float(os.getenv("MCP_CATALOG_MAX_AGE") or 300)
+
+    @staticmethod
+    def key(config) -> str:
+        """Identity of a server launch configuration (an ``MCPServerConfig``)."""
+        identity = {
+            "transport": config.transport,
+            "command": config.command,
+            "args": list(config.args or []),
+            "url": config.url,
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, config) -> Path:
+        return self.directory / f"{self.key(config)}.json"
+
+    def load(self, config, server_version: str) -> Optional[dict]:
+        """The stored catalog of ``config``, or None if there is none for this server version."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(config), encoding="utf-8") as f:
+                catalog = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[MCPCatalogStore] Ignoring unreadable catalog for {config.name}: {e}")
+            return None
+        if catalog.get("server_version") != server_version:
+            logger.info(f"[MCPCatalogStore] {config.name} is now version {server_version}, catalog discarded")
+            return None
+        return catalog
+
+    def is_stale(self, catalog: dict) -> bool:
+        return time.time() - catalog.get("saved_at", 0) > self.max_age
+
+    def save(self, config, server_version: str, tools: list, resources: list, prompts: list) -> None:
+        if not self.enabled:
+            return
+        catalog = {
+            "server_name": config.name,
+            "server_version": server_version,
+            "saved_at": time.time(),
+            "tools": tools,
+            "resources": resources,
+            "prompts": prompts,
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(catalog, f, default=str)
+            os.replace(tmp_path, self._path(config))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"[MCPCatalogStore] Could not save catalog for {config.name}: {e}")
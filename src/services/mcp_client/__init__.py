@@ -4,14 +4,25 @@ ORBIT MCP Client Service - Allows ORBIT agents to consume external MCP tools
 This service enables ORBIT agents to connect to and use external MCP servers
 like GitHub, filesystem, web search, databases, etc.
 
+``MCPClientService`` is a process-wide connection pool. Servers are
+registered once and connected lazily on first use; the connection (and the
+server process behind a stdio transport) then stays up across queries. A
+connection that has been quiet for a while is pinged before it is used
+again, a dead one is reconnected transparently, and connections idle for
+longer than ``MCP_IDLE_TIMEOUT`` are shut down until they are needed again.
+
+All sessions live on the pool's own event loop, running in a background
+thread, so the service can be awaited from any event loop (each actor runs
+its own) without a session ever crossing loops.
+
 Usage:
     from services.mcp_client import MCPClientService
     
     async def use_mcp_tools():
         service = MCPClientService()
         
-        # Connect to GitHub MCP server
-        await service.connect_stdio_server(
+        # Register the GitHub MCP server (connected when first used)
+        service.register_stdio_server(
             "github",
             command="npx",
             args=["-y", "@modelcontextprotocol/server-github"],
@@ -28,21 +39,70 @@ Usage:
             {"query": "thespian actor python"}
         )
         
-        await service.disconnect_all()
+        # Connections stay open for the next query; shutdown() (also run at exit) closes them
 """
 
 import asyncio
+import atexit
 import json
+import os
+import threading
+import time
 from typing import Dict, Any, Optional, List
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
+import anyio
+import httpx
+from dotenv import load_dotenv
 from loguru import logger
 
 # MCP SDK imports
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamable_http_client
+from mcp.shared.exceptions import McpError
 from mcp import types
+from src.services.singleton import Singleton
+from src.services.tool_cache import NEVER, ToolResultCache
+from src.services.mcp_catalog import MCPCatalogStore
+
+# Raised when sending on a session that is already gone: the request never reached the server.
+SEND_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, BrokenPipeError)
+
+# Error code the streamable-HTTP client reports when the server answers 404 for our session id
+# (it restarted or expired the session); the request was rejected without running.
+SESSION_TERMINATED = 32600
+
+
+def is_session_terminated(error: BaseException) -> bool:
+    return isinstance(error, McpError) and error.error.code == SESSION_TERMINATED
+
+
+def is_send_error(error: BaseException) -> bool:
+    """True if the request certainly did not run, so it is safe to send it again on a new session."""
+    return isinstance(error, SEND_ERRORS) or is_session_terminated(error)
+
+
+def rejected_by_server(error: BaseException) -> bool:
+    """True if a streamable-HTTP session ended because the server answered with an error status."""
+    if isinstance(error, BaseExceptionGroup):
+        return any(rejected_by_server(inner) for inner in error.exceptions)
+    return isinstance(error, httpx.HTTPStatusError)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """True if ``error`` means the session is gone (server exited, pipe closed) rather than that the call failed."""
+    if isinstance(error, McpError):
+        return error.error.code == types.CONNECTION_CLOSED or is_session_terminated(error)
+    return isinstance(error, SEND_ERRORS + (ConnectionError, EOFError))
+
+CAPABILITY_KINDS = ("tools", "resources", "prompts")
+LIST_CHANGED_NOTIFICATIONS = {
+    types.ToolListChangedNotification: "tools",
+    types.ResourceListChangedNotification: "resources",
+    types.PromptListChangedNotification: "prompts",
+}
 
 
 @dataclass
@@ -60,8 +120,22 @@ class MCPServerConfig:
 class MCPConnection:
     """Manages a single MCP server connection."""
     
-    def __init__(self, config: MCPServerConfig):
+    def __init__(self, config: MCPServerConfig, catalog: MCPCatalogStore = None,
+                 http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            config: The server to connect to
+            catalog: Store of previously discovered capabilities
+            http_client: Shared client for the streamable-HTTP transport; its keep-alive
+                         connections are reused by every session on the same endpoint
+        """
         self.config = config
+        self.catalog = catalog or MCPCatalogStore()
+        self.http_client = http_client
+        self.session_id: Optional[str] = None
+        self.server_version: Optional[str] = None
+        self.server_capabilities: Optional[types.ServerCapabilities] = None
+        self._refresh_tasks = set()
         self.session: Optional[ClientSession] = None
         self._read = None
         self._write = None
@@ -69,13 +143,52 @@ class MCPConnection:
         self.tools: List[Dict[str, Any]] = []
         self.resources: List[Dict[str, Any]] = []
         self.prompts: List[Dict[str, Any]] = []
+        self.last_used = time.monotonic()
+        self.in_flight = 0
+        self.error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+    
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
     
     async def connect(self):
         """Establish connection to the MCP server."""
-        from contextlib import AsyncExitStack
-        
-        self._exit_stack = AsyncExitStack()
-        
+        # The transports are anyio task groups, which must be exited by the task
+        # that entered them; a dedicated task owns the connection for its lifetime.
+        ready = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(ready), name=f"mcp-{self.config.name}")
+        try:
+            await ready
+        except BaseException:
+            self._task.cancel()
+            raise
+    
+    async def _run(self, ready: asyncio.Future):
+        try:
+            async with AsyncExitStack() as exit_stack:
+                self._exit_stack = exit_stack
+                await self._open(exit_stack)
+                ready.set_result(None)
+                await self._closing.wait()
+                for task in list(self._refresh_tasks):
+                    task.cancel()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                self.error = e
+                logger.warning(f"MCP server {self.config.name} connection ended with error: {e}")
+        finally:
+            self.session = None
+            self._read = None
+            self._write = None
+            self._exit_stack = None
+            self.session_id = None
+    
+    async def _open(self, exit_stack: AsyncExitStack):
         if self.config.transport == "stdio":
             server_params = StdioServerParameters(
                 command=self.config.command,
@@ -83,81 +196,133 @@ class MCPConnection:
                 env=self.config.env
             )
             
-            stdio_transport = await self._exit_stack.enter_async_context(
+            stdio_transport = await exit_stack.enter_async_context(
                 stdio_client(server_params)
             )
             self._read, self._write = stdio_transport
             
         elif self.config.transport == "sse":
-            sse_transport = await self._exit_stack.enter_async_context(
+            sse_transport = await exit_stack.enter_async_context(
                 sse_client(self.config.url, headers=self.config.headers)
             )
             self._read, self._write = sse_transport
             
+        elif self.config.transport == "streamable-http":
+            # The shared client outlives this session; only the session is terminated on close.
+            self._read, self._write, get_session_id = await exit_stack.enter_async_context(
+                streamable_http_client(self.config.url, http_client=self.http_client)
+            )
+            
         else:
             raise ValueError(f"Unsupported transport: {self.config.transport}")
         
         # Create and initialize session
-        self.session = await self._exit_stack.enter_async_context(
-            ClientSession(self._read, self._write)
+        self.session = await exit_stack.enter_async_context(
+            ClientSession(self._read, self._write, message_handler=self._on_message)
         )
-        await self.session.initialize()
-        
-        # Cache available capabilities
-        await self._refresh_capabilities()
+        init_result = await self.session.initialize()
+        self.server_version = init_result.serverInfo.version
+        self.server_capabilities = init_result.capabilities
+        if self.config.transport == "streamable-http":
+            self.session_id = get_session_id()
+        
+        # Use the catalog from an earlier connection if the server has not changed since
+        catalog = self.catalog.load(self.config, self.server_version)
+        if catalog is not None:
+            self.tools, self.resources, self.prompts = catalog["tools"], catalog["resources"], catalog["prompts"]
+            if self.catalog.is_stale(catalog):
+                self._schedule_refresh()
+        else:
+            await self._refresh_capabilities()
         
-        logger.info(f"Connected to MCP server: {self.config.name}")
+        logger.info(f"Connected to MCP server: {self.config.name}" + (" (cached catalog)" if catalog else ""))
         logger.info(f"  Tools: {len(self.tools)}")
         logger.info(f"  Resources: {len(self.resources)}")
         logger.info(f"  Prompts: {len(self.prompts)}")
     
-    async def _refresh_capabilities(self):
-        """Refresh the list of available tools, resources, and prompts."""
-        # Get tools
+    async def _on_message(self, message):
+        """Session message handler: re-list whatever the server says has changed."""
+        if isinstance(message, types.ServerNotification):
+            kind = LIST_CHANGED_NOTIFICATIONS.get(type(message.root))
+            if kind is not None:
+                logger.info(f"MCP server {self.config.name} changed its {kind}, refreshing")
+                # Not awaited here: the handler runs on the session's receive loop, which the refresh needs.
+                self._schedule_refresh((kind,))
+    
+    def _schedule_refresh(self, kinds: tuple = CAPABILITY_KINDS):
+        task = asyncio.create_task(self._refresh_capabilities(kinds), name=f"mcp-{self.config.name}-refresh")
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_done)
+    
+    def _refresh_done(self, task: asyncio.Task):
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"MCP server {self.config.name} catalog refresh failed: {task.exception()}")
+    
+    async def _refresh_capabilities(self, kinds: tuple = CAPABILITY_KINDS):
+        """Refresh the list of available tools, resources, and prompts (concurrently) and save the catalog."""
+        capabilities = self.server_capabilities
+        listers = {
+            "tools": self._list_tools,
+            # Only ask for what the server says it supports.
+            "resources": self._list_resources if capabilities is None or capabilities.resources else None,
+            "prompts": self._list_prompts if capabilities is None or capabilities.prompts else None,
+        }
+        kinds = [kind for kind in kinds if listers[kind] is not None]
+        results = await asyncio.gather(*(listers[kind]() for kind in kinds), return_exceptions=True)
+        for kind, result in zip(kinds, results):
+            if isinstance(result, BaseException):
+                if kind == "tools":
+                    raise result
+                result = []
+            setattr(self, kind, result)
+        self.catalog.save(self.config, self.server_version, self.tools, self.resources, self.prompts)
+    
+    async def _list_tools(self) -> List[Dict[str, Any]]:
         tools_result = await self.session.list_tools()
-        self.tools = [
+        return [
             {
                 "name": tool.name,
                 "description": tool.description,
-                "input_schema": tool.inputSchema
+                "input_schema": tool.inputSchema,
+                "annotations": tool.annotations.model_dump(exclude_none=True) if tool.annotations else {}
             }
             for tool in tools_result.tools
         ]
-        
-        # Get resources (if supported)
-        try:
-            resources_result = await self.session.list_resources()
-            self.resources = [
-                {
-                    "uri": resource.uri,
-                    "name": resource.name,
-                    "description": getattr(resource, 'description', ''),
-                    "mimeType": getattr(resource, 'mimeType', '')
-                }
-                for resource in resources_result.resources
-            ]
-        except Exception:
-            self.resources = []
-        
-        # Get prompts (if supported)
-        try:
-            prompts_result = await self.session.list_prompts()
-            self.prompts = [
-                {
-                    "name": prompt.name,
-                    "description": getattr(prompt, 'description', ''),
-                    "arguments": [
-                        {"name": arg.name, "description": getattr(arg, 'description', ''), "required": getattr(arg, 'required', False)}
-                        for arg in getattr(prompt, 'arguments', [])
-                    ]
-                }
-                for prompt in prompts_result.prompts
-            ]
-        except Exception:
-            self.prompts = []
+    
+    async def _list_resources(self) -> List[Dict[str, Any]]:
+        resources_result = await self.session.list_resources()
+        return [
+            {
+                "uri": str(resource.uri),
+                "name": resource.name,
+                "description": getattr(resource, 'description', ''),
+                "mimeType": getattr(resource, 'mimeType', '')
+            }
+            for resource in resources_result.resources
+        ]
+    
+    async def _list_prompts(self) -> List[Dict[str, Any]]:
+        prompts_result = await self.session.list_prompts()
+        return [
+            {
+                "name": prompt.name,
+                "description": getattr(prompt, 'description', ''),
+                "arguments": [
+                    {"name": arg.name, "description": getattr(arg, 'description', ''), "required": getattr(arg, 'required', False)}
+                    for arg in getattr(prompt, 'arguments', None) or []
+                ]
+            }
+            for prompt in prompts_result.prompts
+        ]
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> Any:
         """Call a tool on the MCP server."""
+        text, _ = await self.call_tool_result(tool_name, arguments)
+        return text
+    
+    async def call_tool_result(self, tool_name: str, arguments: Dict[str, Any] = None) -> tuple:
+        """Call a tool on the MCP server; returns (text, whether the server reported an error)."""
         if not self.session:
             raise RuntimeError("Not connected to MCP server")
         
@@ -173,7 +338,7 @@ class MCPConnection:
             elif isinstance(content, types.EmbeddedResource):
                 response_parts.append(f"[Resource: {content.resource.uri}]")
         
-        return "\n".join(response_parts)
+        return "\n".join(response_parts), bool(result.isError)
     
     async def read_resource(self, uri: str) -> str:
         """Read a resource from the MCP server."""
@@ -206,26 +371,251 @@ class MCPConnection:
         
         return "\n".join(response_parts)
     
-    async def disconnect(self):
+    async def until_closed(self, coro):
+        """
+        Await a request on the session, failing as soon as the session ends: a transport
+        that dies by cancellation (streamable HTTP) never answers its pending requests.
+        """
+        request = asyncio.ensure_future(coro)
+        try:
+            await asyncio.wait({request, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not request.done():
+                request.cancel()
+        if request.done():
+            return request.result()
+        if self.error is not None and rejected_by_server(self.error):
+            # The server refused the session (e.g. it restarted): the request never ran.
+            raise McpError(types.ErrorData(code=SESSION_TERMINATED, message=f"Session rejected: {self.error}"))
+        raise ConnectionError(f"Connection to MCP server {self.config.name} closed")
+    
+    async def ping(self, timeout: float) -> bool:
+        """True if the server answers a ping within ``timeout`` seconds."""
+        if not self.connected:
+            return False
+        try:
+            await asyncio.wait_for(self.until_closed(self.session.send_ping()), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP server {self.config.name} failed health check: {e!r}")
+            return False
+    
+    async def disconnect(self, timeout: float = 10):
         """Disconnect from the MCP server."""
-        if self._exit_stack:
-            await self._exit_stack.aclose()
-            self.session = None
-            self._read = None
-            self._write = None
-            logger.info(f"Disconnected from MCP server: {self.config.name}")
+        if self._task is None:
+            return
+        self._closing.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        except Exception as e:
+            logger.warning(f"Error while disconnecting from MCP server {self.config.name}: {e}")
+        self._task = None
+        logger.info(f"Disconnected from MCP server: {self.config.name}")
 
 
-class MCPClientService:
+class MCPClientService(metaclass=Singleton):
     """
     Service for managing multiple MCP server connections within ORBIT.
     
     This service allows ORBIT agents to dynamically connect to and use
-    external MCP servers for enhanced capabilities.
+    external MCP servers for enhanced capabilities. One instance is shared
+    by the whole process, so connections outlive the queries that use them.
     """
     
     def __init__(self):
+        load_dotenv()
+        # Connections unused for this long are closed (and reopened on demand).
+        self.idle_timeout = float(os.getenv("MCP_IDLE_TIMEOUT") or 600)
+        # A connection quiet for this long is pinged before it is used again.
+        self.health_check_interval = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL") or 60)
+        self.health_check_timeout = float(os.getenv("MCP_HEALTH_CHECK_TIMEOUT") or 5)
+        # After a failed connect, calls fail fast for this long instead of respawning the server each time.
+        self.reconnect_backoff = float(os.getenv("MCP_RECONNECT_BACKOFF") or 30)
+        # Seconds a tool call may take; MCP_TOOL_TIMEOUTS overrides it per tool ("fetch.fetch=10,github=20").
+        self.tool_timeout = float(os.getenv("MCP_TOOL_TIMEOUT") or 30)
+        self.tool_timeouts = {
+            key.strip(): float(value)
+            for key, _, value in (item.partition("=") for item in (os.getenv("MCP_TOOL_TIMEOUTS") or "").split(","))
+            if key.strip() and value.strip()
+        }
+        self.configs: Dict[str, MCPServerConfig] = {}
         self.connections: Dict[str, MCPConnection] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._connect_locks: Dict[str, asyncio.Lock] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._stats = {"connects": 0, "reconnects": 0, "failed_connects": 0, "idle_shutdowns": 0}
+        # Fresh results of read-only tools are reused instead of calling the server again.
+        self.result_cache = ToolResultCache()
+        # Tool/resource/prompt lists of earlier connections, so reconnects skip discovery.
+        self.catalog = MCPCatalogStore()
+        # Streamable-HTTP servers share one HTTP client per set of headers, so sessions reuse
+        # keep-alive connections instead of opening new ones.
+        self.http_timeout = float(os.getenv("MCP_HTTP_TIMEOUT") or 30)
+        # How long a response stream (server-sent events) may stay silent.
+        self.http_read_timeout = float(os.getenv("MCP_HTTP_READ_TIMEOUT") or 300)
+        self.http_max_connections = int(os.getenv("MCP_HTTP_MAX_CONNECTIONS") or 20)
+        self.http_keepalive_expiry = float(os.getenv("MCP_HTTP_KEEPALIVE_EXPIRY") or 60)
+        self._http_clients: Dict[tuple, httpx.AsyncClient] = {}
+        atexit.register(self.shutdown)
+    
+    # ------------------------------------------------------------------
+    # Pool event loop
+    # ------------------------------------------------------------------
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # The loop thread and the server processes stay with the parent after a fork.
+            if self._loop is None or self._pid != os.getpid():
+                self.connections = {}
+                self._connect_locks = {}
+                self._failed_at = {}
+                self._http_clients = {}
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name="mcp-pool", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._reap_idle(), self._loop)
+            return self._loop
+    
+    async def _in_pool(self, coro):
+        """Run ``coro`` on the pool loop and await it from whatever loop the caller is on."""
+        loop = self.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    # ------------------------------------------------------------------
+    # Connection management (pool loop only)
+    # ------------------------------------------------------------------
+    
+    async def _acquire(self, name: str) -> MCPConnection:
+        """The live connection for ``name``, connecting or reconnecting as needed."""
+        config = self.configs.get(name)
+        if config is None:
+            raise ValueError(f"No connection named: {name}")
+        lock = self._connect_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            connection = self.connections.get(name)
+            if connection is not None and (connection.config != config or not connection.connected):
+                await self._drop(name)
+                connection = None
+                self._stats["reconnects"] += 1
+            elif connection is not None and time.monotonic() - connection.last_used > self.health_check_interval:
+                if not await connection.ping(self.health_check_timeout):
+                    logger.warning(f"[MCPClientService] Reconnecting to {name}")
+                    await self._drop(name)
+                    connection = None
+                    self._stats["reconnects"] += 1
+            if connection is None:
+                failed_at = self._failed_at.get(name)
+                if failed_at is not None and time.monotonic() - failed_at < self.reconnect_backoff:
+                    raise ConnectionError(f"MCP server {name} failed to connect "
+                                          f"{time.monotonic() - failed_at:.0f}s ago, not retrying yet")
+                connection = MCPConnection(config, self.catalog, self._http_client(config))
+                try:
+                    await connection.connect()
+                except Exception:
+                    self._failed_at[name] = time.monotonic()
+                    self._stats["failed_connects"] += 1
+                    raise
+                self._failed_at.pop(name, None)
+                self.connections[name] = connection
+                self._stats["connects"] += 1
+            connection.last_used = time.monotonic()
+            return connection
+    
+    def _http_client(self, config: MCPServerConfig) -> Optional[httpx.AsyncClient]:
+        """The pooled HTTP client for a streamable-HTTP server (None for other transports)."""
+        if config.transport != "streamable-http":
+            return None
+        key = tuple(sorted((config.headers or {}).items()))
+        client = self._http_clients.get(key)
+        if client is None or client.is_closed:
+            client = self._http_clients[key] = httpx.AsyncClient(
+                headers=config.headers,
+                timeout=httpx.Timeout(self.http_timeout, read=self.http_read_timeout),
+                limits=httpx.Limits(max_connections=self.http_max_connections,
+                                    max_keepalive_connections=self.http_max_connections,
+                                    keepalive_expiry=self.http_keepalive_expiry),
+                follow_redirects=True,
+            )
+        return client
+    
+    async def _drop(self, name: str):
+        connection = self.connections.pop(name, None)
+        if connection is not None:
+            await connection.disconnect()
+    
+    async def _reap_idle(self):
+        """Close connections nobody has used for ``idle_timeout`` seconds."""
+        while True:
+            await asyncio.sleep(max(min(self.idle_timeout / 4, 60), 1))
+            now = time.monotonic()
+            for name, connection in list(self.connections.items()):
+                if connection.in_flight == 0 and now - connection.last_used > self.idle_timeout:
+                    logger.info(f"[MCPClientService] Closing idle connection to {name}")
+                    await self._drop(name)
+                    self._stats["idle_shutdowns"] += 1
+    
+    async def _with_connection(self, name: str, operation):
+        """
+        Run ``operation(connection)``. A dead session is dropped so the next call
+        reconnects; the operation itself is retried on a new connection only if
+        it could not even be sent, since a tool may have run before the server died.
+        """
+        for attempt in range(2):
+            connection = await self._acquire(name)
+            connection.in_flight += 1
+            try:
+                return await connection.until_closed(operation(connection))
+            except Exception as e:
+                if not is_connection_error(e):
+                    raise
+                logger.warning(f"[MCPClientService] Connection to {name} lost ({e!r})")
+                await self._drop(name)
+                self._stats["reconnects"] += 1
+                if attempt or not is_send_error(e):
+                    raise
+            finally:
+                connection.in_flight -= 1
+                connection.last_used = time.monotonic()
+    
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    
+    def register_server(self, config: MCPServerConfig):
+        """Make a server available under ``config.name``; it is connected on first use."""
+        with self._lock:
+            self.configs[config.name] = config
+    
+    def register_stdio_server(
+        self,
+        name: str,
+        command: str,
+        args: List[str] = None,
+        env: Dict[str, str] = None
+    ):
+        """Register an MCP server reached via stdio transport (see ``connect_stdio_server``)."""
+        self.register_server(MCPServerConfig(
+            name=name,
+            transport="stdio",
+            command=command,
+            args=args or [],
+            env=env
+        ))
+    
+    async def connect(self, name: str) -> MCPConnection:
+        """Connect a registered server now (a no-op if it is already connected)."""
+        return await self._in_pool(self._acquire(name))
     
     async def connect_stdio_server(
         self,
@@ -237,6 +627,8 @@ class MCPClientService:
         """
         Connect to an MCP server via stdio transport.
         
+        An existing connection with the same configuration is reused.
+        
         Args:
             name: A unique name for this connection
             command: The command to run (e.g., "python", "npx", "node")
@@ -246,18 +638,8 @@ class MCPClientService:
         Returns:
             The MCPConnection object
         """
-        config = MCPServerConfig(
-            name=name,
-            transport="stdio",
-            command=command,
-            args=args or [],
-            env=env
-        )
-        
-        connection = MCPConnection(config)
-        await connection.connect()
-        self.connections[name] = connection
-        return connection
+        self.register_stdio_server(name, command, args, env)
+        return await self.connect(name)
     
     async def connect_sse_server(
         self,
@@ -268,6 +650,8 @@ class MCPClientService:
         """
         Connect to an MCP server via SSE transport.
         
+        An existing connection with the same configuration is reused.
+        
         Args:
             name: A unique name for this connection
             url: The server URL (e.g., "http://localhost:8000/sse")
@@ -276,20 +660,66 @@ class MCPClientService:
         Returns:
             The MCPConnection object
         """
-        config = MCPServerConfig(
+        self.register_server(MCPServerConfig(
             name=name,
             transport="sse",
             url=url,
             headers=headers
-        )
+        ))
+        return await self.connect(name)
+    
+    def register_http_server(
+        self,
+        name: str,
+        url: str,
+        headers: Dict[str, str] = None
+    ):
+        """Register an MCP server reached via streamable-HTTP transport (see ``connect_http_server``)."""
+        self.register_server(MCPServerConfig(
+            name=name,
+            transport="streamable-http",
+            url=url,
+            headers=headers
+        ))
+    
+    async def connect_http_server(
+        self,
+        name: str,
+        url: str,
+        headers: Dict[str, str] = None
+    ) -> MCPConnection:
+        """
+        Connect to an MCP server via streamable-HTTP transport.
+        
+        An existing connection with the same configuration is reused, and
+        servers with the same headers share one pool of HTTP connections.
+        
+        Args:
+            name: A unique name for this connection
+            url: The server's MCP endpoint (e.g., "http://localhost:8000/mcp")
+            headers: HTTP headers to include (e.g., an Authorization header)
         
-        connection = MCPConnection(config)
-        await connection.connect()
-        self.connections[name] = connection
-        return connection
+        Returns:
+            The MCPConnection object
+        """
+        self.register_http_server(name, url, headers)
+        return await self.connect(name)
+    
+    def timeout_for(self, connection_name: str, tool_name: str) -> float:
+        """Timeout of ``connection_name.tool_name``: its own setting, else its server's, else the default."""
+        return self.tool_timeouts.get(f"{connection_name}.{tool_name}",
+                                      self.tool_timeouts.get(connection_name, self.tool_timeout))
+    
+    def tool_annotations(self, connection_name: str, tool_name: str) -> Optional[dict]:
+        """The MCP annotations (readOnlyHint, ...) a connected server declared for a tool."""
+        connection = self.connections.get(connection_name)
+        for tool in connection.tools if connection is not None else []:
+            if tool["name"] == tool_name:
+                return tool.get("annotations")
+        return None
     
     def get_connection(self, name: str) -> Optional[MCPConnection]:
-        """Get a connection by name."""
+        """Get an open connection by name (None if it is not connected right now)."""
         return self.connections.get(name)
     
     async def list_tools(self, connection_name: str = None) -> Dict[str, List[Dict]]:
@@ -303,21 +733,23 @@ class MCPClientService:
             Dict mapping connection names to their tools
         """
         result = {}
-        
-        if connection_name:
-            if connection_name in self.connections:
-                result[connection_name] = self.connections[connection_name].tools
-        else:
-            for name, conn in self.connections.items():
-                result[name] = conn.tools
-        
+        names = [connection_name] if connection_name else list(self.configs)
+        for name in names:
+            if name not in self.configs:
+                continue
+            try:
+                result[name] = (await self.connect(name)).tools
+            except Exception as e:
+                logger.warning(f"[MCPClientService] Could not list tools of {name}: {e}")
         return result
     
     async def call_tool(
         self,
         connection_name: str,
         tool_name: str,
-        arguments: Dict[str, Any] = None
+        arguments: Dict[str, Any] = None,
+        timeout: float = None,
+        use_cache: bool = True
     ) -> str:
         """
         Call a tool on a specific MCP server.
@@ -326,34 +758,75 @@ class MCPClientService:
             connection_name: The connection to use
             tool_name: Name of the tool to call
             arguments: Tool arguments
+            timeout: Seconds to wait for the result, connecting included
+                     (defaults to ``timeout_for(connection_name, tool_name)``)
+            use_cache: Answer from ``result_cache`` if the tool's policy allows it
         
         Returns:
             The tool's response
-        """
-        connection = self.connections.get(connection_name)
-        if not connection:
-            raise ValueError(f"No connection named: {connection_name}")
         
-        return await connection.call_tool(tool_name, arguments)
+        Raises:
+            asyncio.TimeoutError: The tool did not answer in time
+        """
+        policy = self.result_cache.policy(connection_name, tool_name, self.tool_annotations(connection_name, tool_name)) \
+            if use_cache else NEVER
+        cached = self.result_cache.get(connection_name, tool_name, arguments, policy)
+        if cached is not None:
+            return cached
+        if timeout is None:
+            timeout = self.timeout_for(connection_name, tool_name)
+        text, is_error = await self._in_pool(asyncio.wait_for(self._with_connection(
+            connection_name, lambda connection: connection.call_tool_result(tool_name, arguments)), timeout))
+        if not is_error:
+            self.result_cache.put(connection_name, tool_name, arguments, policy, text)
+        return text
     
     async def read_resource(self, connection_name: str, uri: str) -> str:
         """Read a resource from an MCP server."""
-        connection = self.connections.get(connection_name)
-        if not connection:
-            raise ValueError(f"No connection named: {connection_name}")
-        
-        return await connection.read_resource(uri)
+        return await self._in_pool(self._with_connection(
+            connection_name, lambda connection: connection.read_resource(uri)))
     
     async def disconnect(self, connection_name: str):
-        """Disconnect from a specific MCP server."""
-        connection = self.connections.pop(connection_name, None)
-        if connection:
-            await connection.disconnect()
+        """Disconnect from a specific MCP server and forget its configuration."""
+        with self._lock:
+            self.configs.pop(connection_name, None)
+        await self._in_pool(self._drop(connection_name))
     
     async def disconnect_all(self):
         """Disconnect from all MCP servers."""
-        for name in list(self.connections.keys()):
+        for name in list(self.configs.keys()):
             await self.disconnect(name)
+    
+    def shutdown(self, timeout: float = 10):
+        """Close every connection and stop the pool loop (run at interpreter exit)."""
+        with self._lock:
+            loop, pid = self._loop, self._pid
+            self._loop = None
+        if loop is None or pid != os.getpid():
+            return
+        
+        async def close_all():
+            for name in list(self.connections):
+                await self._drop(name)
+            for client in self._http_clients.values():
+                await client.aclose()
+            # The idle reaper, and anything still running.
+            tasks = asyncio.all_tasks() - {asyncio.current_task()}
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            asyncio.run_coroutine_threadsafe(close_all(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"[MCPClientService] Error while closing MCP connections: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+    
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["registered"] = len(self.configs)
+        stats["connected"] = sum(1 for connection in self.connections.values() if connection.connected)
+        stats["result_cache"] = self.result_cache.stats()
+        return stats
 
 
 # ============================================================================
@@ -1,6 +1,8 @@
 
 
 from src.services.service_interface import ServiceInterface
+from src.services.repo_cache import RepoSnapshotCache
+from src.services.single_flight import SingleFlight
 from gitingest import ingest,ingest_async
 import os
 from dotenv import load_dotenv
@@ -13,43 +15,73 @@ class Repo2TextService(ServiceInterface):
         super().__init__()
         load_dotenv()
         gitingest.config.DEFAULT_TIMEOUT = int(os.getenv("DEFAULT_TIMEOUT") or 300)
+        self.cache = RepoSnapshotCache()
+        # Agents asking for the same repository at once share one clone.
+        self.single_flight = SingleFlight()
 
     def _sync_ingest(self, repo_url: str, max_file_size: int) -> dict:
         """Perform the actual ingest in a sync context."""
         s, t, c = ingest(
-            repo_url, 
-            token=os.getenv("PAT_TOKEN"), 
+            repo_url,
+            token=os.getenv("PAT_TOKEN"),
             max_file_size=max_file_size
         )
         return {"summary": s, "structure": t, "content": c}
-    
+
     async def call_service_async(self, repo_url: str, options: dict = None) -> dict:
         """Async version for use in async contexts."""
         if options is None:
             options = {}
         MAX_FILE_SIZE = options.get("max_file_size", 5 * 1024 * 1024)
-        
-        s, t, c = await ingest_async(
-            repo_url,
-            token=os.getenv("PAT_TOKEN"),
-            max_file_size=MAX_FILE_SIZE
-        )
-        return {"summary": s, "structure": t, "content": c}
+        cache_options = {"max_file_size": MAX_FILE_SIZE}
+        key, cached = await asyncio.to_thread(self.cache.lookup, repo_url, cache_options)
+        if cached is not None:
+            return cached
+
+        async def ingest_and_store():
+            s, t, c = await ingest_async(
+                repo_url,
+                token=os.getenv("PAT_TOKEN"),
+                max_file_size=MAX_FILE_SIZE
+            )
+            result = {"summary": s, "structure": t, "content": c}
+            await asyncio.to_thread(self.cache.store, key, repo_url, result)
+            return result
+        return await self.single_flight.ado(self.flight_key(repo_url, cache_options), ingest_and_store)
+
+    @staticmethod
+    def flight_key(repo_url: str, options: dict) -> str:
+        return SingleFlight.make_key("ingest", repo_url, sorted(options.items()))
 
     def call_service(self, repo_url:str, options:dict) -> dict:
         if options is None:
             options = {}
         MAX_FILE_SIZE = options.get("max_file_size", 5 * 1024 * 1024)  # Default to 5 MB
+        cache_options = {"max_file_size": MAX_FILE_SIZE}
+        key, cached = self.cache.lookup(repo_url, cache_options)
+        if cached is not None:
+            return cached
+        return self.single_flight.do(
+            self.flight_key(repo_url, cache_options),
+            lambda: self._ingest_and_store(key, repo_url, MAX_FILE_SIZE))
+
+    def _ingest_and_store(self, key, repo_url: str, max_file_size: int) -> dict:
         try:
-            loop = asyncio.get_running_loop() 
+            asyncio.get_running_loop()
+            in_event_loop = True
+        except RuntimeError:
+            in_event_loop = False
+        if in_event_loop:
             # We're in an async context, need to use nest_asyncio or run in thread
             with concurrent.futures.ThreadPoolExecutor() as executor:
                 future = executor.submit(
-                    self._sync_ingest, repo_url, MAX_FILE_SIZE
+                    self._sync_ingest, repo_url, max_file_size
                 )
-                return future.result(timeout=300)
-        except RuntimeError:
-            return self._sync_ingest(repo_url, MAX_FILE_SIZE)
-        # Implement the logic to convert repository data to text
-        s,t,c=ingest(repo_url,token=os.getenv("PAT_TOKEN"), max_file_size=MAX_FILE_SIZE)
-        return {"summary": s, "structure": t, "content": c}
\ No newline at end of file
+                result = future.result(timeout=300)
+        else:
+            result = self._sync_ingest(repo_url, max_file_size)
+        self.cache.store(key, repo_url, result)
+        return result
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,243 @@
+"""
+ORBIT repository snapshot cache.
+
+Keeps the flattened output of ``Repo2TextService`` on disk, keyed by repo URL,
+the commit SHA the URL currently resolves to and the ingest options. Resolving
+the SHA is a single ``git ls-remote`` (or ``git rev-parse`` for local paths),
+so a warm query never clones. Entries are evicted least-recently-used once the
+cache exceeds its size or entry budget. Files are written atomically, so the
+cache can be shared by every actor process.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "temp" / "repo_cache"
+
+
+class RepoSnapshotCache(metaclass=Singleton):
+    def __init__(self):
+        load_dotenv()
+        self.cache_dir = Path(os.getenv("REPO_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.max_bytes = int(os.getenv("REPO_CACHE_MAX_BYTES") or 1024 * 1024 * 1024)  # 1 GB
+        self.max_entries = int(os.getenv("REPO_CACHE_MAX_ENTRIES") or 64)
+        # How long a resolved SHA is trusted before asking the remote again.
+        self.freshness_ttl = float(os.getenv("REPO_CACHE_FRESHNESS_TTL") or 60)
+        self.enabled = (os.getenv("REPO_CACHE_ENABLED") or "true").lower() != "false"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale_hits": 0, "uncacheable": 0, "evictions": 0}
+
+    # ------------------------------------------------------------------
+    # Revision resolution
+    # ------------------------------------------------------------------
+
+    def _auth_env(self, repo_url: str) -> dict:
+        """
+        Git config that sends ``PAT_TOKEN`` as an HTTP header, passed through the
+        environment: a token in the URL or a ``-c`` option would show in ``ps``
+        and in git's error messages.
+        """
+        token = os.getenv("PAT_TOKEN")
+        parsed = urlparse(repo_url)
+        if not token or parsed.scheme != "https" or "@" in parsed.netloc:
+            return {}
+        # Same header gitingest sends when it clones.
+        basic = base64.b64encode(f"x-oauth-basic:{token}".encode()).decode()
+        return {
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": f"http.https://{parsed.hostname}/.extraheader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: Basic {basic}",
+        }
+
+    def _remote_ref(self, options: dict) -> str:
+        if options.get("branch"):
+            return f"refs/heads/{options['branch']}"
+        if options.get("tag"):
+            return f"refs/tags/{options['tag']}"
+        return "HEAD"
+
+    def _run_git(self, args: list, env: dict = None) -> Optional[str]:
+        try:
+            result = subprocess.run(["git", *args], capture_output=True, text=True, timeout=30,
+                                    env={**os.environ, "GIT_TERMINAL_PROMPT": "0", **(env or {})})
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"[RepoSnapshotCache] git {args[0]} failed: {e}")
+            return None
+        if result.returncode != 0:
+            logger.warning(f"[RepoSnapshotCache] git {args[0]} exited with {result.returncode}")
+            return None
+        return result.stdout.strip()
+
+    def _resolve_remote(self, repo_url: str, options: dict) -> Optional[str]:
+        output = self._run_git(["ls-remote", repo_url, self._remote_ref(options)], env=self._auth_env(repo_url))
+        if not output:
+            return None
+        return output.split()[0]
+
+    def _resolve_local(self, repo_path: str) -> Optional[str]:
+        sha = self._run_git(["-C", repo_path, "rev-parse", "HEAD"])
+        if sha is None:
+            return None
+        # Uncommitted changes are not described by HEAD, so the snapshot cannot be keyed on it.
+        if self._run_git(["-C", repo_path, "status", "--porcelain"]):
+            return None
+        return sha
+
+    def _head_path(self, repo_url: str, options: dict) -> Path:
+        digest = hashlib.sha256(f"{repo_url}|{self._remote_ref(options)}".encode()).hexdigest()
+        return self.cache_dir / f"{digest}.head"
+
+    def _read_head(self, repo_url: str, options: dict) -> Optional[dict]:
+        try:
+            with open(self._head_path(repo_url, options), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def resolve_revision(self, repo_url: str, options: dict) -> Tuple[Optional[str], bool]:
+        """
+        Resolve the commit SHA a repo URL currently points to.
+
+        Returns the SHA and whether it was confirmed against the repository
+        (``False`` means it is the last SHA we knew, used because the remote
+        could not be reached).
+        """
+        head = self._read_head(repo_url, options)
+        if head and time.time() - head["checked_at"] < self.freshness_ttl:
+            return head["sha"], True
+        if os.path.isdir(repo_url):
+            sha = self._resolve_local(repo_url)
+            return sha, sha is not None
+        sha = self._resolve_remote(repo_url, options)
+        if sha is not None:
+            self._atomic_write(self._head_path(repo_url, options), {"sha": sha, "checked_at": time.time()})
+            if head is None:
+                self.evict()
+            return sha, True
+        if head:
+            return head["sha"], False
+        return None, False
+
+    # ------------------------------------------------------------------
+    # Snapshot storage
+    # ------------------------------------------------------------------
+
+    def make_key(self, repo_url: str, revision: str, options: dict) -> str:
+        canonical_options = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{repo_url}|{revision}|{canonical_options}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _atomic_write(self, path: Path, payload: dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def lookup(self, repo_url: str, options: dict) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        """
+        Look up a snapshot for ``repo_url``.
+
+        Returns ``(key, data)``. ``data`` is ``None`` on a miss; ``key`` is
+        ``None`` when the revision cannot be resolved and the result must not
+        be cached.
+        """
+        if not self.enabled:
+            return None, None
+        revision, confirmed = self.resolve_revision(repo_url, options)
+        if revision is None:
+            self._count("uncacheable")
+            return None, None
+        key = self.make_key(repo_url, revision, options)
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            self._count("misses")
+            logger.info(f"[RepoSnapshotCache] Miss for {repo_url}@{revision[:12]}")
+            return (key if confirmed else None), None
+        os.utime(path)  # mtime is the LRU clock shared by every process
+        self._count("hits" if confirmed else "stale_hits")
+        logger.info(f"[RepoSnapshotCache] {'Hit' if confirmed else 'Stale hit'} for {repo_url}@{revision[:12]}")
+        return key, snapshot["data"]
+
+    def store(self, key: Optional[str], repo_url: str, data: Dict[str, str]) -> None:
+        if key is None or not self.enabled:
+            return
+        try:
+            self._atomic_write(self._entry_path(key), {"repo_url": repo_url, "stored_at": time.time(), "data": data})
+            self.evict()
+        except OSError as e:
+            logger.warning(f"[RepoSnapshotCache] Could not store snapshot for {repo_url}: {e}")
+
+    def _entries(self, pattern: str = "*.json") -> list:
+        entries = []
+        for path in self.cache_dir.glob(pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """Drop least-recently-used snapshots until the cache fits its budget, and all but the newest resolved heads."""
+        entries = sorted(self._entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        while entries and (total_bytes > self.max_bytes or len(entries) > self.max_entries):
+            _, size, path = entries.pop(0)
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total_bytes -= size
+            evicted += 1
+        # One head per repo and ref ever queried; keep as many as there may be snapshots.
+        heads = sorted(self._entries("*.head"))
+        for _, _, path in heads[:max(len(heads) - self.max_entries, 0)]:
+            path.unlink(missing_ok=True)
+        if evicted:
+            with self._lock:
+                self._stats["evictions"] += evicted
+            logger.info(f"[RepoSnapshotCache] Evicted {evicted} snapshot(s)")
+        return evicted
+
+    def clear(self) -> None:
+        for path in list(self.cache_dir.glob("*.json")) + list(self.cache_dir.glob("*.head")):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the current on-disk footprint."""
+        entries = self._entries()
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        stats["entries"] = len(entries)
+        stats["bytes"] = sum(size for _, size, _ in entries)
+        return stats
@@ -0,0 +1,212 @@
+"""
+ORBIT model response cache.
+
+``ModelAdapter`` consults a ``ResponseCache`` before calling the model. The
+default ``DiskResponseCache`` stores responses in a SQLite database keyed by
+a hash of the model, the instruction and the prompt, so every actor process
+shares the same entries. Entries expire after a TTL and the least recently
+used ones are dropped when the cache exceeds its entry or size budget.
+
+With ``RESPONSE_CACHE_SEMANTIC=true`` an exact miss on a call that names
+its user ``query`` also looks for a cached response to a near-identical
+query: same model, same instruction and the same prompt apart from the
+query, with query embeddings more similar than
+``RESPONSE_CACHE_SEMANTIC_THRESHOLD``. Only the query is embedded. Prompts
+such as IntentAgent's share a long fixed prefix, and whole-prompt
+embeddings would match different questions. Calls without a query, and
+queries longer than ``RESPONSE_CACHE_SEMANTIC_MAX_CHARS``, only match exactly.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+import numpy as np
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent.parent / "temp" / "response_cache.db"
+
+
+class ResponseCache:
+    """Interface for ``ModelAdapter`` caches."""
+
+    def get(self, model: str, instruction: str, prompt: str, query: str = None) -> Optional[str]:
+        return None
+
+    def put(self, model: str, instruction: str, prompt: str, response: str, query: str = None) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class DiskResponseCache(ResponseCache, metaclass=Singleton):
+    def __init__(self):
+        load_dotenv()
+        self.path = Path(os.getenv("RESPONSE_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl = float(os.getenv("RESPONSE_CACHE_TTL") or 24 * 3600)
+        self.max_entries = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES") or 5000)
+        self.max_bytes = int(os.getenv("RESPONSE_CACHE_MAX_BYTES") or 256 * 1024 * 1024)  # 256 MB
+        self.semantic = (os.getenv("RESPONSE_CACHE_SEMANTIC") or "false").lower() == "true"
+        self.semantic_threshold = float(os.getenv("RESPONSE_CACHE_SEMANTIC_THRESHOLD") or 0.95)
+        self.semantic_max_chars = int(os.getenv("RESPONSE_CACHE_SEMANTIC_MAX_CHARS") or 2000)
+        self.semantic_scan = int(os.getenv("RESPONSE_CACHE_SEMANTIC_SCAN") or 500)
+        self._connection = None
+        self._pid = None
+        self._lock = Lock()
+        self._stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, so each actor process opens its own.
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, instruction TEXT, response TEXT,"
+                " embedding BLOB, size INTEGER, created_at REAL, accessed_at REAL, context TEXT)")
+            try:
+                # Databases from before semantic lookups were scoped by context.
+                connection.execute("ALTER TABLE responses ADD COLUMN context TEXT")
+            except sqlite3.OperationalError:
+                pass
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (model, instruction, created_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _hash(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _context_hash(self, prompt: str, query: str) -> Optional[str]:
+        """Hash of the prompt without its query; semantic matches must agree on it exactly."""
+        if query is None or query not in prompt:
+            return None
+        return self._hash(prompt.replace(query, "\0", 1))
+
+    def _embed(self, query: Optional[str]) -> Optional[np.ndarray]:
+        if not self.semantic or query is None or len(query) > self.semantic_max_chars:
+            return None
+        from src.services.embedding import EmbeddingService
+        try:
+            return EmbeddingService().embed_queries([query])[0]
+        except Exception as e:
+            logger.warning(f"[DiskResponseCache] Embedding unavailable, disabling semantic matching: {e}")
+            self.semantic = False
+            return None
+
+    def get(self, model: str, instruction: str, prompt: str, query: str = None) -> Optional[str]:
+        instruction_hash = self._hash(instruction)
+        key = self._hash(model, instruction_hash, prompt)
+        oldest = time.time() - self.ttl
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at >= ?", (key, oldest)).fetchone()
+                if row is not None:
+                    self.connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            if row is not None:
+                self._count("hits")
+                return row[0]
+            response = self._semantic_lookup(model, instruction_hash, self._context_hash(prompt, query), query, oldest)
+        except Exception as e:
+            logger.warning(f"[DiskResponseCache] Lookup failed: {e}")
+            self._count("errors")
+            return None
+        self._count("semantic_hits" if response is not None else "misses")
+        return response
+
+    def _semantic_lookup(self, model: str, instruction_hash: str, context: Optional[str], query: Optional[str],
+                         oldest: float) -> Optional[str]:
+        if context is None:
+            return None
+        vector = self._embed(query)
+        if vector is None:
+            return None
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT key, response, embedding FROM responses"
+                " WHERE model = ? AND instruction = ? AND context = ? AND embedding IS NOT NULL AND created_at >= ?"
+                " ORDER BY created_at DESC LIMIT ?",
+                (model, instruction_hash, context, oldest, self.semantic_scan)).fetchall()
+        if not rows:
+            return None
+        matrix = np.stack([np.frombuffer(embedding, dtype=np.float32) for _, _, embedding in rows])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.semantic_threshold:
+            return None
+        logger.info(f"[DiskResponseCache] Semantic hit (similarity {scores[best]:.3f})")
+        with self._lock:
+            self.connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), rows[best][0]))
+        return rows[best][1]
+
+    def put(self, model: str, instruction: str, prompt: str, response: str, query: str = None) -> None:
+        if not isinstance(response, str) or not response.strip():
+            return
+        instruction_hash = self._hash(instruction)
+        key = self._hash(model, instruction_hash, prompt)
+        try:
+            context = self._context_hash(prompt, query)
+            vector = self._embed(query) if context is not None else None
+            embedding = vector.astype(np.float32).tobytes() if vector is not None else None
+            now = time.time()
+            with self._lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO responses"
+                    " (key, model, instruction, response, embedding, size, created_at, accessed_at, context)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, model, instruction_hash, response, embedding,
+                     len(response.encode()) + (len(embedding) if embedding else 0), now, now, context))
+            self._count("stores")
+            self.evict()
+        except Exception as e:
+            logger.warning(f"[DiskResponseCache] Could not store response: {e}")
+            self._count("errors")
+
+    def evict(self) -> int:
+        """Drop expired entries, then least-recently-used ones until the cache fits its budget."""
+        with self._lock:
+            connection = self.connection
+            evicted = connection.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+            count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            while count > self.max_entries or total > self.max_bytes:
+                row = connection.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+                if row is None:
+                    break
+                connection.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+                count, total, evicted = count - 1, total - row[1], evicted + 1
+            if evicted:
+                self._stats["evictions"] += evicted
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self.connection.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the current database footprint."""
+        with self._lock:
+            stats = dict(self._stats)
+            count, total = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = stats["hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["semantic_hits"]) / lookups if lookups else 0.0
+        stats["entries"] = count
+        stats["bytes"] = total
+        return stats
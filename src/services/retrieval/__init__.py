@@ -0,0 +1,201 @@
+"""
+ORBIT repository retrieval.
+
+Indexes ingested repositories as file sections in a local milvus-lite
+database and returns only the sections most relevant to a query, packed into
+a token budget. When the best match is weak, ``build_context`` returns
+``None`` so the caller can fall back to sending the full repository.
+
+milvus-lite keeps a database file open from a single process, so every
+agent gets its own database (``RepoIndexService("OrbitAgent")``).
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.embedding import EmbeddingService
+
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent.parent.parent / "temp" / "retrieval"
+COLLECTION_NAME = "repo_sections"
+FILE_HEADER_PATTERN = re.compile(r"^={16,}\nFILE: (.+)\n={16,}\n", re.MULTILINE)
+# Milvus bounds VARCHAR fields in UTF-8 bytes, not characters.
+MAX_TEXT_BYTES = 65535
+MAX_PATH_BYTES = 1024
+
+
+class RepoIndexService:
+    def __init__(self, name: str, encoding=None):
+        """
+        Args:
+            name: Database name, one per agent process
+            encoding: tiktoken-compatible encoding used to measure the budget
+        """
+        load_dotenv()
+        self.name = name
+        self.encoding = encoding
+        self.enabled = (os.getenv("RETRIEVAL_ENABLED") or "true").lower() != "false"
+        self.index_dir = Path(os.getenv("RETRIEVAL_DIR") or DEFAULT_INDEX_DIR)
+        self.top_k = int(os.getenv("RETRIEVAL_TOP_K") or 24)
+        self.min_score = float(os.getenv("RETRIEVAL_MIN_SCORE") or 0.35)
+        self.section_chars = int(os.getenv("RETRIEVAL_SECTION_CHARS") or 1500)
+        self.embedding_service = EmbeddingService()
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from pymilvus import MilvusClient, DataType
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            self._client = MilvusClient(str(self.index_dir / f"{self.name}.db"))
+            if not self._client.has_collection(COLLECTION_NAME):
+                schema = MilvusClient.create_schema(auto_id=True, enable_dynamic_field=False)
+                schema.add_field("id", DataType.INT64, is_primary=True)
+                schema.add_field("vector", DataType.FLOAT_VECTOR, dim=self.embedding_service.dim)
+                schema.add_field("repo_url", DataType.VARCHAR, max_length=1024)
+                schema.add_field("revision", DataType.VARCHAR, max_length=64)
+                schema.add_field("path", DataType.VARCHAR, max_length=MAX_PATH_BYTES)
+                schema.add_field("section", DataType.INT64)
+                schema.add_field("text", DataType.VARCHAR, max_length=MAX_TEXT_BYTES)
+                index_params = self._client.prepare_index_params()
+                index_params.add_index(field_name="vector", index_type="AUTOINDEX", metric_type="COSINE")
+                self._client.create_collection(COLLECTION_NAME, schema=schema, index_params=index_params)
+        return self._client
+
+    def count_tokens(self, text: str) -> int:
+        if self.encoding is None:
+            return len(text) // 4
+        return len(self.encoding.encode(text))
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def revision_of(repo_data: Dict[str, str]) -> str:
+        return hashlib.sha256(repo_data.get("content", "").encode()).hexdigest()
+
+    def split_sections(self, content: str) -> List[Dict[str, object]]:
+        """Split gitingest content into per-file sections of about ``section_chars``."""
+        headers = list(FILE_HEADER_PATTERN.finditer(content))
+        sections = []
+        for i, header in enumerate(headers):
+            path = header.group(1).strip()
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+            body = content[header.end():end]
+            current, current_len, index = [], 0, 0
+            for line in body.splitlines(keepends=True):
+                if current and current_len + len(line) > self.section_chars:
+                    sections.append({"path": path, "section": index, "text": "".join(current)})
+                    current, current_len, index = [], 0, index + 1
+                current.append(line)
+                current_len += len(line)
+            if current and "".join(current).strip():
+                sections.append({"path": path, "section": index, "text": "".join(current)})
+        return sections
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return json.dumps(value)
+
+    @staticmethod
+    def _clip(value: str, max_bytes: int) -> str:
+        """``value`` cut to at most ``max_bytes`` of UTF-8, never inside a character."""
+        if len(value) * 4 <= max_bytes:
+            return value
+        return value.encode("utf-8", "ignore")[:max_bytes].decode("utf-8", "ignore")
+
+    def index(self, repo_url: str, repo_data: Dict[str, str]) -> int:
+        """Index a repository snapshot; returns the number of sections written (0 if up to date)."""
+        revision = self.revision_of(repo_data)
+        existing = self.client.query(
+            COLLECTION_NAME,
+            filter=f"repo_url == {self._quote(repo_url)} and revision == {self._quote(revision)}",
+            limit=1,
+            output_fields=["id"])
+        if existing:
+            return 0
+        self.client.delete(COLLECTION_NAME, filter=f"repo_url == {self._quote(repo_url)}")
+        sections = self.split_sections(repo_data.get("content", ""))
+        if not sections:
+            return 0
+        vectors = self.embedding_service.embed_documents([f"{s['path']}\n{s['text']}" for s in sections])
+        rows = [
+            {
+                "vector": vector.tolist(),
+                "repo_url": repo_url,
+                "revision": revision,
+                "path": self._clip(section["path"], MAX_PATH_BYTES),
+                "section": section["section"],
+                "text": self._clip(section["text"], MAX_TEXT_BYTES),
+            }
+            for section, vector in zip(sections, vectors)
+        ]
+        self.client.insert(COLLECTION_NAME, rows)
+        logger.info(f"[RepoIndexService] Indexed {len(rows)} sections of {repo_url}")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Retrieval
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, repo_urls: List[str], top_k: int = None) -> List[Dict[str, object]]:
+        vector = self.embedding_service.embed_queries([query])[0]
+        results = self.client.search(
+            COLLECTION_NAME,
+            data=[vector.tolist()],
+            limit=top_k or self.top_k,
+            filter=f"repo_url in {json.dumps(list(repo_urls))}",
+            output_fields=["repo_url", "path", "section", "text"],
+            search_params={"metric_type": "COSINE"})
+        return [{"score": hit["distance"], **hit["entity"]} for hit in results[0]]
+
+    def build_context(self, query: str, repos: Dict[str, Dict[str, str]], token_budget: int) -> Optional[str]:
+        """
+        Assemble the most relevant sections of ``repos`` within ``token_budget``.
+
+        Args:
+            query: The user query
+            repos: Repo URL -> Repo2TextService result
+            token_budget: Maximum tokens of context to return
+
+        Returns:
+            The context text, or None when retrieval is disabled, fails or is
+            not confident enough and the caller should use the full repository
+        """
+        if not self.enabled or not repos:
+            return None
+        try:
+            for repo_url, repo_data in repos.items():
+                self.index(repo_url, repo_data)
+            hits = self.search(query, list(repos.keys()))
+        except Exception as e:
+            logger.warning(f"[RepoIndexService] Retrieval unavailable, using full context: {e}")
+            return None
+        if not hits or hits[0]["score"] < self.min_score:
+            logger.info(f"[RepoIndexService] Low retrieval confidence ({hits[0]['score'] if hits else 0:.2f}), using full context")
+            return None
+
+        parts, used = [], 0
+        for repo_url, repo_data in repos.items():
+            header = f"Repository: {repo_url}\nDirectory structure:\n{repo_data.get('structure', '')}\n"
+            tokens = self.count_tokens(header)
+            if used + tokens <= token_budget // 4:
+                parts.append(header)
+                used += tokens
+        selected = []
+        for hit in hits:
+            block = f"\n--- {hit['repo_url']} :: {hit['path']} (part {hit['section'] + 1}) ---\n{hit['text']}"
+            tokens = self.count_tokens(block)
+            if used + tokens > token_budget:
+                continue
+            selected.append((hit["repo_url"], hit["path"], hit["section"], block))
+            used += tokens
+        # Present sections in repository order so neighbouring parts of a file read naturally.
+        parts.extend(block for *_, block in sorted(selected, key=lambda s: s[:3]))
+        logger.info(f"[RepoIndexService] Retrieved {len(selected)} sections ({used} tokens, top score {hits[0]['score']:.2f})")
+        return "".join(parts)
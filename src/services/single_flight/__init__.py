@@ -0,0 +1,240 @@
+"""
+ORBIT single-flight calls.
+
+``SingleFlight.do(key, fn)`` makes concurrent calls with the same key share
+one execution of ``fn``: the first caller (the leader) runs it, everyone who
+arrives while it is running gets the leader's result. This holds across
+threads of a process and across the actor processes of the Thespian system:
+callers in different processes serialize on a per-key lock file, and the
+leader leaves its result in a file that callers which were already waiting
+pick up instead of running ``fn`` again. A caller that arrives after the
+leader finished runs ``fn`` itself, so nothing is served beyond the call it
+overlapped with; caching is left to the caches.
+
+Where ``fcntl`` is unavailable (Windows) only threads of one process share
+calls.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Awaitable, Callable, TypeVar
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_LOCK_DIR = Path(__file__).parent.parent.parent.parent / "temp" / "single_flight"
+CLEANUP_EVERY = 100
+
+T = TypeVar("T")
+
+
+class SingleFlight(metaclass=Singleton):
+    def __init__(self):
+        load_dotenv()
+        self.enabled = (os.getenv("SINGLE_FLIGHT_ENABLED") or "true").lower() != "false"
+        self.lock_dir = Path(os.getenv("SINGLE_FLIGHT_DIR") or DEFAULT_LOCK_DIR)
+        # Lock and result files untouched for this long are removed.
+        self.file_ttl = float(os.getenv("SINGLE_FLIGHT_FILE_TTL") or 600)
+        self.poll_interval = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL") or 0.05)
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self._calls = {}
+        self._lock = Lock()
+        self._leader_calls = 0
+        self._stats = {"leader": 0, "shared_in_process": 0, "shared_across_processes": 0}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    # ------------------------------------------------------------------
+    # Blocking callers
+    # ------------------------------------------------------------------
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run ``fn``, or wait for and return the result of an identical call already running."""
+        if not self.enabled:
+            return fn()
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = concurrent.futures.Future()
+        if not leader:
+            self._count("shared_in_process")
+            return future.result()
+        try:
+            result = self._run_locked(key, fn)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def _run_locked(self, key: str, fn: Callable[[], T]) -> T:
+        if fcntl is None:
+            self._count("leader")
+            return fn()
+        started = time.time()
+        with open(self._lock_path(key), "a+b") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                return self._lead_or_share(key, started, fn)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # asyncio callers
+    # ------------------------------------------------------------------
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async ``do``: ``fn`` is a coroutine function, awaited by the leader only."""
+        if not self.enabled:
+            return await fn()
+        loop = asyncio.get_running_loop()
+        call_key = ("async", id(loop), key)
+        with self._lock:
+            future = self._calls.get(call_key)
+            leader = future is None
+            if leader:
+                future = self._calls[call_key] = loop.create_future()
+        if not leader:
+            self._count("shared_in_process")
+            return await asyncio.shield(future)
+        try:
+            result = await self._arun_locked(key, fn)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody may be waiting on the shared future; don't let asyncio complain about it.
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(call_key, None)
+
+    async def _arun_locked(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        if fcntl is None:
+            self._count("leader")
+            return await fn()
+        started = time.time()
+        with open(self._lock_path(key), "a+b") as lock_file:
+            # Poll rather than block a worker thread, so a cancelled caller never ends up holding the lock.
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(self.poll_interval)
+            try:
+                shared = await asyncio.to_thread(self._read_result, key, started)
+                if shared is not None:
+                    self._count("shared_across_processes")
+                    return shared[0]
+                self._count("leader")
+                result = await fn()
+                await asyncio.to_thread(self._write_result, key, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Lock and result files
+    # ------------------------------------------------------------------
+
+    def _lock_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.lock"
+
+    def _result_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.result"
+
+    def _lead_or_share(self, key: str, started: float, fn: Callable[[], T]) -> T:
+        shared = self._read_result(key, started)
+        if shared is not None:
+            self._count("shared_across_processes")
+            return shared[0]
+        self._count("leader")
+        result = fn()
+        self._write_result(key, result)
+        return result
+
+    def _read_result(self, key: str, started: float):
+        """``(result,)`` if a leader finished while we were waiting, else None."""
+        try:
+            with open(self._result_path(key), "rb") as f:
+                finished_at, result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return (result,) if finished_at >= started else None
+
+    def _write_result(self, key: str, result) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.lock_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((time.time(), result), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._result_path(key))
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            # Waiting callers will run the call themselves; nothing is lost but the sharing.
+            logger.warning(f"[SingleFlight] Could not share result for {key[:12]}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._leader_calls += 1
+            cleanup = self._leader_calls % CLEANUP_EVERY == 0
+        if cleanup:
+            self.cleanup()
+
+    def cleanup(self) -> int:
+        """Remove lock/result files nobody has used for ``file_ttl`` seconds."""
+        if fcntl is None:
+            return 0
+        cutoff = time.time() - self.file_ttl
+        removed = 0
+        for result_path in self.lock_dir.glob("*.result"):
+            try:
+                if result_path.stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            lock_path = result_path.with_suffix(".lock")
+            try:
+                with open(lock_path, "a+b") as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    result_path.unlink(missing_ok=True)
+                    lock_path.unlink(missing_ok=True)
+                    removed += 1
+            except (BlockingIOError, OSError):
+                continue
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        return stats
@@ -0,0 +1,114 @@
+"""
+Streaming answers out of an actor.
+
+Thespian's TCP transport only transmits an actor's queued messages between
+``receiveMessage`` calls, so an agent cannot forward tokens while it is
+blocked reading the model. Instead ``ResponseStream`` reads the model's
+``stream_generate`` iterator on a background thread, and
+``StreamingActorMixin`` polls it on a short ``wakeupAfter`` tick, sending
+whatever text arrived since the last tick as a ``StreamChunk``. The complete
+answer is sent as the usual ``LLMMessage`` at the end, so callers that do not
+stream see no difference.
+"""
+
+import os
+import queue
+import threading
+from datetime import timedelta
+from typing import Iterator, Optional
+from loguru import logger
+from src.messages.llm_message import LLMMessage
+from src.messages.stream_chunk import StreamChunk, StreamTick
+
+_END = object()
+
+
+class ResponseStream:
+    def __init__(self, pieces: Iterator[str], request_id: str, reply_to, metadata: dict = None):
+        self.request_id = request_id
+        self.reply_to = reply_to
+        self.metadata = metadata
+        self.index = 0
+        self.error = None
+        self.done = False
+        self._pieces = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._produce, args=(pieces,),
+                                        name=f"response-stream-{request_id[:8]}", daemon=True)
+        self._thread.start()
+
+    def _produce(self, pieces: Iterator[str]) -> None:
+        try:
+            for piece in pieces:
+                self._queue.put(piece)
+        except Exception as e:
+            self._queue.put(e)
+        finally:
+            self._queue.put(_END)
+
+    def drain(self) -> Optional[str]:
+        """Text produced since the last call (None if nothing new); sets ``done``/``error`` at the end."""
+        new = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                self.done = True
+                break
+            if isinstance(item, Exception):
+                self.error = item
+                continue
+            new.append(item)
+        self._pieces.extend(new)
+        return "".join(new) or None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._pieces)
+
+
+class StreamingActorMixin:
+    """
+    Mixin for agents that stream answers; call ``stream_response`` instead of
+    ``model.generate`` and route ``WakeupMessage`` to ``on_stream_tick``.
+    """
+
+    @property
+    def streams(self) -> dict:
+        if "_streams" not in self.__dict__:
+            self._streams = {}
+        return self._streams
+
+    @property
+    def stream_tick(self) -> timedelta:
+        # How often new text is forwarded; one message per tick instead of one per token.
+        return timedelta(seconds=float(os.getenv("STREAM_FLUSH_INTERVAL") or 0.05))
+
+    def stream_response(self, model, prompt: str, instruction: str, request_id: str, reply_to, metadata: dict = None) -> None:
+        """Stream the answer to ``reply_to``; ``metadata`` is attached to the final ``LLMMessage``."""
+        self.streams[request_id] = ResponseStream(model.stream_generate(prompt, instruction), request_id, reply_to, metadata)
+        self.wakeupAfter(self.stream_tick, payload=StreamTick(request_id))
+
+    def on_stream_tick(self, message) -> bool:
+        """Forward new text of the stream named by a wakeup; False if the wakeup is not ours."""
+        if not isinstance(message.payload, StreamTick):
+            return False
+        stream = self.streams.get(message.payload.request_id)
+        if stream is None:
+            return True
+        text = stream.drain()
+        if text:
+            self.send(stream.reply_to, StreamChunk(stream.request_id, text, stream.index))
+            stream.index += 1
+        if not stream.done:
+            self.wakeupAfter(self.stream_tick, payload=message.payload)
+            return True
+        del self.streams[stream.request_id]
+        if stream.error is not None:
+            logger.error(f"[{type(self).__name__}] Streaming failed for {stream.request_id}: {stream.error}")
+            self.send(stream.reply_to, LLMMessage(f"Error processing query: {stream.error}", stream.request_id, stream.metadata))
+        else:
+            self.send(stream.reply_to, LLMMessage(stream.text, stream.request_id, stream.metadata))
+        return True
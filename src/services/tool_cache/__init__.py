@@ -0,0 +1,156 @@
+"""
+ORBIT MCP tool result cache.
+
+``MCPClientService.call_tool`` answers repeated calls from ``ToolResultCache``
+while the earlier result is fresh. Entries are keyed by server, tool and the
+canonical JSON of the arguments, so argument order does not matter. Every
+tool has a ``ToolCachePolicy``: tools that change something (``create_issue``,
+``write_file``, ...) are never cached, known read-only tools get their own
+TTL, and other tools are cached only if the server marks them read-only
+(``readOnlyHint``). The cache is bounded by entry count and total size, and
+drops the least recently used entries first.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from loguru import logger
+from src.services.singleton import Singleton
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    cacheable: bool
+    ttl: float = 0
+
+
+NEVER = ToolCachePolicy(cacheable=False)
+
+# Keyed by "server.tool" or by bare tool name (any server).
+DEFAULT_POLICIES: Dict[str, ToolCachePolicy] = {
+    "fetch": ToolCachePolicy(True, 900),
+    "search_repositories": ToolCachePolicy(True, 600),
+    "search_code": ToolCachePolicy(True, 600),
+    "get_file_contents": ToolCachePolicy(True, 600),
+    "list_issues": ToolCachePolicy(True, 120),
+    "get_pull_request": ToolCachePolicy(True, 120),
+    "read_file": ToolCachePolicy(True, 60),
+    "list_directory": ToolCachePolicy(True, 60),
+    "search_files": ToolCachePolicy(True, 60),
+    "read_graph": ToolCachePolicy(True, 30),
+    "search_nodes": ToolCachePolicy(True, 30),
+    "create_issue": NEVER,
+    "create_pull_request": NEVER,
+    "create_or_update_file": NEVER,
+    "push_files": NEVER,
+    "write_file": NEVER,
+    "edit_file": NEVER,
+    "move_file": NEVER,
+    "create_directory": NEVER,
+    "create_entities": NEVER,
+    "create_relations": NEVER,
+    "add_observations": NEVER,
+    "delete_entities": NEVER,
+}
+
+
+class ToolResultCache(metaclass=Singleton):
+    def __init__(self):
+        load_dotenv()
+        self.enabled = (os.getenv("MCP_TOOL_CACHE_ENABLED") or "true").lower() != "false"
+        self.max_entries = int(os.getenv("MCP_TOOL_CACHE_MAX_ENTRIES") or 512)
+        self.max_bytes = int(os.getenv("MCP_TOOL_CACHE_MAX_BYTES") or 32 * 1024 * 1024)  # 32 MB
+        # TTL for tools without a policy of their own that the server marks read-only.
+        self.read_only_ttl = float(os.getenv("MCP_TOOL_CACHE_READ_ONLY_TTL") or 300)
+        # "server.tool=seconds" or "tool=seconds", comma-separated; 0 disables caching of that tool.
+        self.policies = dict(DEFAULT_POLICIES)
+        for item in (os.getenv("MCP_TOOL_CACHE_TTLS") or "").split(","):
+            name, _, ttl = item.partition("=")
+            if name.strip() and ttl.strip():
+                self.policies[name.strip()] = ToolCachePolicy(float(ttl) > 0, float(ttl))
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0, "uncacheable": 0}
+
+    def policy(self, server: str, tool: str, annotations: Optional[dict] = None) -> ToolCachePolicy:
+        """Caching policy of ``server.tool``; ``annotations`` are the tool's MCP hints, if known."""
+        policy = self.policies.get(f"{server}.{tool}") or self.policies.get(tool)
+        if policy is not None:
+            return policy
+        annotations = annotations or {}
+        if annotations.get("readOnlyHint") and not annotations.get("destructiveHint"):
+            return ToolCachePolicy(True, self.read_only_ttl)
+        return NEVER
+
+    @staticmethod
+    def make_key(server: str, tool: str, arguments: Optional[dict]) -> str:
+        canonical = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(f"{server}\0{tool}\0{canonical}".encode("utf-8", "surrogatepass")).hexdigest()
+
+    def get(self, server: str, tool: str, arguments: Optional[dict], policy: ToolCachePolicy) -> Optional[str]:
+        if not self.enabled or not policy.cacheable:
+            if self.enabled:
+                self._count("uncacheable")
+            return None
+        key = self.make_key(server, tool, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            stored_at, ttl, result = entry
+            if time.monotonic() - stored_at > ttl:
+                self._remove(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        logger.info(f"[ToolResultCache] Cache hit for {server}.{tool}")
+        return result
+
+    def put(self, server: str, tool: str, arguments: Optional[dict], policy: ToolCachePolicy, result: str) -> None:
+        if not self.enabled or not policy.cacheable or not isinstance(result, str):
+            return
+        size = len(result.encode("utf-8", "surrogatepass"))
+        if size > self.max_bytes:
+            return
+        key = self.make_key(server, tool, arguments)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic(), policy.ttl, result)
+            self._bytes += size
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[2].encode("utf-8", "surrogatepass"))
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -1,6 +1,6 @@
 
 from pathlib import Path
-from src.actor_system import start_actor_system
+from src.actor_system import OrbitRuntime
 from src.services.file import FileService
 import json
 import click
@@ -19,8 +19,22 @@ if __name__ == "__main__":
     click.clear()
     artl4 = text2art("Question?", font='bubble')
     print(f"{Fore.RED}{artl4}")
-    query = click.prompt('What is your Query?', type=str, default='How can I use ORBIT framework ?', show_default=True, err=False, prompt_suffix='\n>> ')
-    print(f"{Fore.GREEN}\nGreat! You asked: {query}\n")
-    print(f"{Fore.YELLOW}Processing your query, please wait...\n")
-    response = start_actor_system(query)
-    print(f"{Fore.BLUE}Response from ORBIT:\n{response}\n")
\ No newline at end of file
+    runtime = OrbitRuntime().start()
+    try:
+        while True:
+            query = click.prompt('What is your Query? (type "exit" to quit)', type=str, default='How can I use ORBIT framework ?', show_default=True, err=False, prompt_suffix='\n>> ')
+            if query.strip().lower() in ("exit", "quit"):
+                break
+            print(f"{Fore.GREEN}\nGreat! You asked: {query}\n")
+            print(f"{Fore.YELLOW}Processing your query, please wait...\n")
+            print(f"{Fore.BLUE}Response from ORBIT:")
+            # Print the answer as the agent generates it instead of waiting for all of it.
+            for chunk in runtime.stream(query):
+                print(chunk, end="", flush=True)
+            print("\n")
+    finally:
+        # Leave a runtime we reattached to running for its other clients.
+        if runtime.attached:
+            runtime.detach()
+        else:
+            runtime.shutdown()
@@ -11,11 +11,11 @@ Or via uvicorn for HTTP transport:
     uvicorn mcp_server:app --host 0.0.0.0 --port 8000
 """
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from pathlib import Path
 from typing import Optional
 from loguru import logger
-from src.actor_system import start_actor_system
+from src.actor_system import AsyncOrbitClient
 
 
 # Initialize FastMCP server
@@ -23,6 +23,10 @@ mcp = FastMCP(
     "ORBIT Server"
 )
 
+# Shared bridge into the long-lived ORBIT runtime; many tool calls can be in
+# flight at once (bounded by ORBIT_MAX_CONCURRENT_QUERIES).
+orbit_client = AsyncOrbitClient()
+
 
 # ============================================================================
 # MCP Tools - These expose ORBIT's capabilities to MCP clients
@@ -31,7 +35,8 @@ mcp = FastMCP(
 @mcp.tool()
 async def query_orbit_agent(
     query: str,
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    ctx: Context = None
 ) -> str:
     """
     Send a query to ORBIT's intelligent agent system.
@@ -41,6 +46,8 @@ async def query_orbit_agent(
     Args:
         query: The user's question or request
         context: Optional additional context (e.g., repository URLs, code snippets)
+        ctx: Injected by FastMCP; the answer is streamed to the client as
+             progress notifications while it is generated
     Returns:
         The agent's response to the query
     """
@@ -50,8 +57,19 @@ async def query_orbit_agent(
     if context:
         complete_query = f"{query}\n\nAdditional Context:\n{context}"
     try:
-        response = start_actor_system(complete_query)
-        return response
+        meta = ctx.request_context.meta if ctx is not None else None
+        if meta is None or meta.progressToken is None:
+            # The client did not ask for progress, so there is nobody to stream to.
+            return await orbit_client.query(complete_query)
+        received = 0
+
+        async def report_chunk(text: str):
+            nonlocal received
+            received += len(text)
+            # Progress is the number of characters generated so far; the total is unknown.
+            await ctx.report_progress(received, message=text)
+
+        return await orbit_client.query(complete_query, on_chunk=report_chunk)
     except Exception as e:
         logger.error(f"Error in query_orbit_agent: {e}")
         return f"Error processing query: {str(e)}"
@@ -0,0 +1,42 @@
+from src.services.chunking import TokenChunker
+
+RULER = "=" * 48
+
+
+class FixedWidthEncoding:
+    """Five characters per token, so tokens straddle the file rulers."""
+
+    width = 5
+
+    def encode(self, text, **kwargs):
+        return list(range(0, len(text), self.width))
+
+    def decode_with_offsets(self, tokens):
+        return "", list(tokens)
+
+
+def repository(files: int = 12) -> str:
+    # Odd-length bodies put every ruler at a different offset within its token.
+    return "".join(f"{RULER}\nFILE: f{index}.py\n{RULER}\n" + "x = 1\n" * (3 + index % 4) + "y\n"
+                   for index in range(files))
+
+
+def test_chunks_after_the_first_start_at_a_file_ruler():
+    content = repository()
+    chunks = TokenChunker(FixedWidthEncoding()).chunk(content, 60)
+    assert len(chunks) > 2
+    assert "".join(chunks) == content
+    for chunk in chunks[1:]:
+        assert chunk.startswith(f"{RULER}\nFILE: ")
+
+
+def test_chunks_stay_within_the_budget():
+    content = repository()
+    chunker = TokenChunker(FixedWidthEncoding())
+    position = 0
+    for chunk in chunker.chunk(content, 60):
+        # Tokens overlapping the chunk, including one it shares with its neighbour at a ruler.
+        first = position // FixedWidthEncoding.width
+        last = (position + len(chunk) - 1) // FixedWidthEncoding.width
+        assert last - first + 1 <= 60
+        position += len(chunk)
@@ -0,0 +1,68 @@
+from src.services.context_compaction import ContextCompactor
+
+
+def strip(path: str, body: str) -> str:
+    return ContextCompactor().strip(path, body)
+
+
+def test_js_template_literal_keeps_its_lines():
+    body = (
+        "const sql = `\n"
+        "// not a comment\n"
+        "/* nor this */\n"
+        "${table}`;\n"
+        "// a comment\n"
+        "run(sql);\n"
+    )
+    assert strip("query.js", body) == (
+        "const sql = `\n"
+        "// not a comment\n"
+        "/* nor this */\n"
+        "${table}`;\n"
+        "run(sql);\n"
+    )
+
+
+def test_js_template_substitution_with_nested_template():
+    body = "const a = `x ${b ? `\n// inner\n` : {c: 1}.c}\n// still text\n`;\n// gone\n"
+    assert strip("a.ts", body) == "const a = `x ${b ? `\n// inner\n` : {c: 1}.c}\n// still text\n`;\n"
+
+
+def test_js_regex_with_backtick_does_not_open_a_template():
+    body = "const re = /`/;\nconst t = `\n// kept\n`;\n// gone\n"
+    assert strip("a.js", body) == "const re = /`/;\nconst t = `\n// kept\n`;\n"
+
+
+def test_rust_raw_string_keeps_its_lines():
+    body = 'let s = r#"\n// not a comment\n"quoted"\n"#;\n// a comment\nprintln!("{}", s);\n'
+    assert strip("main.rs", body) == 'let s = r#"\n// not a comment\n"quoted"\n"#;\nprintln!("{}", s);\n'
+
+
+def test_go_raw_string_keeps_its_lines():
+    body = "var q = `\n// not a comment\n`\n// a comment\nfunc f() {}\n"
+    assert strip("q.go", body) == "var q = `\n// not a comment\n`\nfunc f() {}\n"
+
+
+def test_java_text_block_keeps_its_lines():
+    body = 'String s = """\n    // not a comment\n    """;\n/* a comment */\nint x = 1;\n'
+    assert strip("A.java", body) == 'String s = """\n    // not a comment\n    """;\nint x = 1;\n'
+
+
+def test_code_after_mid_line_block_end_keeps_its_line():
+    assert strip("a.c", "/* a\n b */ x = 1;\n") == "x = 1;\n"
+    assert strip("a.c", "  /* a */ y = 2; /* trailing */\n") == "  y = 2; /* trailing */\n"
+
+
+def test_trailing_comments_and_pragmas_stay():
+    body = "//go:build linux\n// drop me\nx := 1 // keep me\n"
+    assert strip("a.go", body) == "//go:build linux\nx := 1 // keep me\n"
+
+
+def test_unterminated_literal_keeps_every_line():
+    body = "const t = `\n// text\n"
+    assert strip("a.js", body) == body
+
+
+def test_php_and_groovy_keep_comments():
+    assert strip("a.php", "<?php\n// kept\n") == "<?php\n// kept\n"
+    assert strip("a.groovy", "// kept\ndef x = 1\n") == "// kept\ndef x = 1\n"
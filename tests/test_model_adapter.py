@@ -0,0 +1,41 @@
+import threading
+import time
+from src.model.model_adapter import ModelAdapter
+from src.model.model_interface import ModelInterface
+from src.services.response_cache import ResponseCache
+
+
+class SlowModel(ModelInterface):
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, instruction: str) -> str:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return prompt
+
+    def chat(self, prompt: str, instruction: str) -> str:
+        raise NotImplementedError
+
+
+def generate_together(queries: list, monkeypatch, tmp_path) -> int:
+    monkeypatch.setenv("SINGLE_FLIGHT_DIR", str(tmp_path))
+    model = SlowModel()
+    adapter = ModelAdapter(model, cache=ResponseCache())
+    threads = [threading.Thread(target=adapter.generate, args=("same prompt", "instruction", query))
+               for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return model.calls
+
+
+def test_identical_calls_share_one_flight(monkeypatch, tmp_path):
+    assert generate_together(["what?", "what?"], monkeypatch, tmp_path) == 1
+
+
+def test_calls_with_different_queries_do_not_share_a_flight(monkeypatch, tmp_path):
+    assert generate_together(["what?", "why?"], monkeypatch, tmp_path) == 2
@@ -0,0 +1,9 @@
+from src.services.retrieval import MAX_TEXT_BYTES, RepoIndexService
+
+
+def test_clip_bounds_utf8_bytes_not_characters():
+    text = "漢" * 30000 + "😀" * 5000
+    clipped = RepoIndexService._clip(text, MAX_TEXT_BYTES)
+    assert len(clipped.encode("utf-8")) <= MAX_TEXT_BYTES
+    assert text.startswith(clipped)
+    assert RepoIndexService._clip("short", MAX_TEXT_BYTES) == "short"